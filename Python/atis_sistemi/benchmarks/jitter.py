@@ -0,0 +1,146 @@
+"""
+Frame'den atışa gecikme ve titreşim (jitter) ölçümü: kamera döngüsü, kamera hızında beslenen sentetik
+atışlarla önce varsayılan zamanlamayla, sonra çekirdek ataması / öncelik / OpenCV thread ayarıyla
+(modules.common.scheduling) çalıştırılır. Gecikme, atışın göründüğü frame'in okunmasından atışın
+yayınlanmasına kadar geçen süredir; p50/p95/p99 ve en kötü değer raporlanır.
+
+--load ile çekirdekleri meşgul eden ayrı süreçler başlatılır (GUI, kayıt, diğer programlar).
+
+Kullanım (atis_sistemi dizininden):
+    python -m benchmarks.jitter --seconds 20 --load 2
+    python -m benchmarks.jitter --width 1280 --height 720 --fps 60 --json jitter.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import threading
+import time
+
+import numpy as np
+
+from modules.common import scheduling
+from modules.common.camera_loop import CameraLoop
+from modules.common.capture import SyntheticCapture
+from modules.common.constants import SyntheticConstants
+from modules.common.synthetic import SyntheticShots
+
+PERCENTILES = (50, 95, 99)
+
+
+class PacedShots:
+    """
+    SyntheticShots'u kamera gibi frame aralığında verir ve her frame'in okunma anını kaydeder.
+    """
+
+    def __init__(self, shots):
+        self.shots = shots
+        self.read_times = dict()
+        self.__interval = 1.0 / shots.fps
+        self.__next = None
+
+    def __call__(self, frame_number):
+        now = time.perf_counter()
+        if self.__next is None:
+            self.__next = now
+        elif now < self.__next:
+            time.sleep(self.__next - now)
+        self.__next += self.__interval
+
+        frame = self.shots(frame_number)
+        self.read_times[frame_number] = time.perf_counter()
+        return frame
+
+
+class LatencyLoop(CameraLoop):
+    def __init__(self, generator, fps, width, height):
+        super().__init__(SyntheticCapture(fps, width, height, generator), fps, width, height)
+        self.detected_times = list()
+        self.isDetectionRunning = True
+
+    def _on_detected(self, bundle):
+        self.detected_times.append(time.perf_counter())
+
+
+def latencies(generator, detected_times):
+    """
+    Her tespiti, okunma anı tespitten önce olan ve henüz eşleşmemiş en son atışla eşleştirir.
+    """
+    shots = [(generator.read_times[shot['frame']], shot) for shot in generator.shots.shots
+             if shot['frame'] in generator.read_times]
+    result = list()
+    used = set()
+    for detected in detected_times:
+        candidates = [(read, shot['frame']) for read, shot in shots if read <= detected and shot['frame'] not in used]
+        if len(candidates) > 0:
+            read, frame = max(candidates)
+            used.add(frame)
+            result.append(detected - read)
+    return result, len(shots)
+
+
+def _burn():
+    while True:
+        pass
+
+
+def run(enabled, args):
+    scheduling.configure(enabled)
+
+    shots = SyntheticShots(args.width, args.height, args.fps, args.background, args.rate, args.noise,
+                           seed=args.seed)
+    generator = PacedShots(shots)
+    loop = LatencyLoop(generator, args.fps, args.width, args.height)
+
+    # Zamanlama ayarları çağıran thread'e uygulanır; ölçülen döngü ayrı bir thread'de çalışır
+    thread = threading.Thread(target=loop.run, name='JitterLoop')
+    thread.start()
+    time.sleep(args.seconds)
+    loop.isWorkerAlive = False
+    thread.join()
+
+    samples, total = latencies(generator, loop.detected_times)
+    samples = 1000 * np.array(samples) if len(samples) > 0 else np.zeros(1)
+    result = {'shots': total, 'detected': len(loop.detected_times), 'max_ms': float(samples.max())}
+    result.update({'p{}_ms'.format(p): float(np.percentile(samples, p)) for p in PERCENTILES})
+    result['plan'] = {key: value for key, value in scheduling.plan().items()}
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Measure frame-to-shot latency with and without thread scheduling.')
+    parser.add_argument('--width', type=int, default=640)
+    parser.add_argument('--height', type=int, default=480)
+    parser.add_argument('--fps', type=int, default=60)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--rate', type=float, default=2.0, help='shots per second')
+    parser.add_argument('--noise', type=float, default=SyntheticConstants.NOISE_SIGMA)
+    parser.add_argument('--background', default=SyntheticConstants.BACKGROUND_PATH)
+    parser.add_argument('--seed', type=int, default=SyntheticConstants.SEED)
+    parser.add_argument('--load', type=int, default=0, help='number of busy processes competing for the CPU')
+    parser.add_argument('--json', default=None, help='write the results to this file')
+    args = parser.parse_args()
+
+    burners = [multiprocessing.Process(target=_burn, daemon=True) for _ in range(args.load)]
+    for burner in burners:
+        burner.start()
+
+    results = dict()
+    try:
+        for name, enabled in (('default', False), ('scheduled', True)):
+            results[name] = run(enabled, args)
+    finally:
+        for burner in burners:
+            burner.terminate()
+
+    print('{}x{} @ {} fps, {} s per run, {} busy processes'.format(args.width, args.height, args.fps,
+                                                                   args.seconds, args.load))
+    print('{:<10} {:>8} {:>8} {:>8} {:>8} {:>12}'.format('', 'p50 ms', 'p95 ms', 'p99 ms', 'max ms', 'detected'))
+    for name, result in results.items():
+        print('{:<10} {:>8.2f} {:>8.2f} {:>8.2f} {:>8.2f} {:>6} / {:<5}'.format(
+            name, result['p50_ms'], result['p95_ms'], result['p99_ms'], result['max_ms'],
+            result['detected'], result['shots']))
+
+    if args.json is not None:
+        with open(args.json, 'w') as outfile:
+            json.dump(results, outfile, indent=2)
@@ -0,0 +1,231 @@
+"""
+Sıcak yol (hot path) performans regresyon takımı: Detection, Perspective, order_points, Feat,
+Statics.cv2qt ve Filer birkaç çözünürlük ve atış yoğunluğunda ölçülür.
+
+Her aşamanın medyan süresi JSON olarak kaydedilir; --compare ile önceki ölçümle karşılaştırılır ve
+herhangi bir aşama --threshold oranından fazla yavaşladıysa çıkış kodu 1 olur. Qt gerektiren aşamalar
+PyQt5 yoksa atlanır.
+
+Kullanım (atis_sistemi dizininden):
+    python -m benchmarks.pipeline --save baseline.json
+    python -m benchmarks.pipeline --compare baseline.json --threshold 0.2
+    python -m benchmarks.pipeline --filter detect/ --compare baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from modules.common.detection import Detection
+from modules.common.filer import Filer
+from modules.feat.feat import Feat
+from modules.perspective.perspective import Perspective, order_points
+
+RESOLUTIONS = [(640, 480), (1280, 720), (1920, 1080)]
+SHOT_DENSITIES = [0, 1, 10]
+LOOKUP_DENSITIES = [1, 100, 10000]
+FILE_DENSITIES = [10, 1000]
+
+# Her aşama en az MIN_ROUNDS kez ve en az MIN_TIME_S boyunca çalıştırılır
+MIN_ROUNDS = 5
+MIN_TIME_S = 0.2
+
+
+def measure(function):
+    """
+    Returns:
+        Bir çağrının medyan süresi (ms)
+    """
+    function()
+    samples = list()
+    deadline = time.perf_counter() + MIN_TIME_S
+    while len(samples) < MIN_ROUNDS or time.perf_counter() < deadline:
+        begin = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - begin)
+    return 1000 * statistics.median(samples)
+
+
+def target_frame(width, height, shots=0, seed=0):
+    frame = np.full((height, width, 3), 200, dtype=np.uint8)
+    cv2.circle(frame, (width // 2, height // 2), min(width, height) // 3, (30, 30, 30), 3)
+
+    random = np.random.default_rng(seed)
+    for _ in range(shots):
+        center = (int(random.integers(20, width - 20)), int(random.integers(20, height - 20)))
+        cv2.circle(frame, center, 5, (60, 60, 255), -1)
+    return frame
+
+
+def quad(width, height):
+    return np.float32([[width * 0.1, height * 0.05], [width * 0.92, height * 0.1],
+                       [width * 0.95, height * 0.9], [width * 0.05, height * 0.95]])
+
+
+def detection_stages(width, height):
+    background = target_frame(width, height)
+    for shots in SHOT_DENSITIES:
+        frames = [background, target_frame(width, height, shots)]
+        detection = Detection()
+        state = {'index': 0}
+
+        def detect():
+            # Boş ve atışlı frame'ler dönüşümlü verilir: her çağrı bir fark görüntüsü işler
+            state['index'] ^= 1
+            detection.detect(frames[state['index']])
+
+        yield 'detect/{}x{}/{}shots'.format(width, height, shots), detect
+
+
+def perspective_stages(width, height):
+    frame = target_frame(width, height, 1)
+    points = quad(width, height)
+
+    perspective = Perspective(width, height)
+    perspective.set_matrix(points)
+    yield 'get_wrap/{}x{}'.format(width, height), lambda: perspective.get_wrap(frame)
+
+    # Lens düzeltmesi açıkken tek remap yolu
+    lens = Perspective(width, height)
+    lens.set_intrinsics(np.float64([[width, 0, width / 2], [0, width, height / 2], [0, 0, 1]]),
+                        np.float64([-0.1, 0.01, 0, 0, 0]))
+    lens.set_matrix(points)
+    yield 'get_wrap_remap/{}x{}'.format(width, height), lambda: lens.get_wrap(frame)
+    yield 'set_matrix_remap/{}x{}'.format(width, height), lambda: lens.set_matrix(points)
+
+
+def common_stages():
+    points = quad(640, 480)
+    yield 'order_points', lambda: order_points(points)
+    yield 'set_matrix/640x480', lambda: Perspective(640, 480).set_matrix(points)
+
+    feat = Feat(1920, 1080)
+    feat.set_feat(quad(1920, 1080))
+    for count in LOOKUP_DENSITIES:
+        random = np.random.default_rng(count)
+        shots = list(zip(random.integers(0, 1920, count).tolist(), random.integers(0, 1080, count).tolist()))
+        yield 'feat_is_in/{}shots'.format(count), lambda shots=shots: [feat.is_in(x, y) for x, y in shots]
+
+
+def filer_stages(directory):
+    filer = Filer()
+    for count in FILE_DENSITIES:
+        data = {
+            'camera': {'width': 1280, 'height': 720},
+            'shots': [{'x': index % 1280, 'y': index % 720, 'time': '12:00:00'} for index in range(count)],
+        }
+        path = '{}/shots{}.json'.format(directory, count)
+        with open(path, 'w') as outfile:
+            json.dump(data, outfile, indent=2)
+        yield 'filer_read/{}shots'.format(count), lambda path=path: filer.read_from_file(path)
+
+
+def qt_stages(directory):
+    try:
+        from PyQt5 import QtWidgets
+        from PyQt5.QtGui import QImage
+    except ImportError:
+        return
+
+    from modules.common.statics import Statics
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(['pipeline', '-platform', 'offscreen'])
+    label = QtWidgets.QLabel()
+    label.resize(960, 540)
+    for width, height in RESOLUTIONS:
+        frame = target_frame(width, height, 1)
+        yield 'cv2qt/{}x{}'.format(width, height), lambda frame=frame: Statics.cv2qt(frame, label)
+
+    # write_to_file saniye bazlı klasör açar; her çağrı ayrı bir data klasörüne yazar
+    filer = Filer()
+    image = QImage(960, 540, QImage.Format_RGB32)
+    data = {'shots': [{'x': index, 'y': index, 'time': '12:00:00'} for index in range(100)]}
+    state = {'index': 0}
+
+    def write():
+        state['index'] += 1
+        filer.data_path = '{}/data{}'.format(directory, state['index'])
+        filer.write_to_file(image, data)
+
+    yield 'filer_write/100shots', write
+    app.processEvents()
+
+
+def stages(directory):
+    yield from common_stages()
+    for width, height in RESOLUTIONS:
+        yield from detection_stages(width, height)
+        yield from perspective_stages(width, height)
+    yield from filer_stages(directory)
+    yield from qt_stages(directory)
+
+
+def run(name_filter=None):
+    results = dict()
+    with tempfile.TemporaryDirectory() as directory:
+        for name, function in stages(directory):
+            if name_filter is None or name_filter in name:
+                results[name] = measure(function)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Returns:
+        Eşiği aşan aşamaların [(ad, baseline ms, şimdiki ms), ...] listesi
+    """
+    regressions = list()
+    for name, value in results.items():
+        previous = baseline.get(name)
+        if previous is not None and value > previous * (1 + threshold):
+            regressions.append((name, previous, value))
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark the detection pipeline stages.')
+    parser.add_argument('--save', default=None, help='write the results as a JSON baseline')
+    parser.add_argument('--compare', default=None, help='compare against this JSON baseline')
+    parser.add_argument('--threshold', type=float, default=0.2, help='allowed slowdown ratio per stage')
+    parser.add_argument('--filter', default=None, help='only run stages whose name contains this text')
+    args = parser.parse_args()
+
+    results = run(args.filter)
+
+    baseline = dict()
+    if args.compare is not None:
+        with open(args.compare) as json_file:
+            baseline = json.load(json_file)['stages']
+
+    for name, value in results.items():
+        line = '{:<32} {:>10.3f} ms'.format(name, value)
+        if name in baseline:
+            line += '  {:+7.1%}'.format(value / baseline[name] - 1)
+        print(line)
+
+    if args.save is not None:
+        with open(args.save, 'w') as outfile:
+            json.dump({
+                'machine': {
+                    'python': platform.python_version(),
+                    'opencv': cv2.__version__,
+                    'platform': platform.platform(),
+                    'processor': platform.processor() or platform.machine(),
+                    'cpu_count': os.cpu_count(),
+                },
+                'stages': results,
+            }, outfile, indent=2)
+
+    if args.compare is not None:
+        regressions = compare(results, baseline, args.threshold)
+        for name, previous, value in regressions:
+            print('REGRESSION {}: {:.3f} ms -> {:.3f} ms'.format(name, previous, value))
+        sys.exit(1 if len(regressions) > 0 else 0)
@@ -0,0 +1,82 @@
+"""
+Açılış süresi ölçümü: yorumlayıcı başlangıcı, import süresi, pencerenin görünmesi ve ilk kamera
+görüntüsüne kadar geçen süre. Her tekrar soğuk başlangıç için ayrı bir süreçte çalışır.
+
+Kullanım (atis_sistemi dizininden):
+    python -m benchmarks.startup --runs 5
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.startup --json startup.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+CHILD = '''
+import json, os, sys, time
+begin = time.time()
+
+from PyQt5 import QtWidgets
+from PyQt5.QtCore import QTimer
+from modules.main.main_ui import MainUI
+
+imported = time.time()
+app = QtWidgets.QApplication(sys.argv)
+ui = MainUI()
+shown = time.time()
+
+
+def report(first_frame):
+    print(json.dumps({'begin': begin, 'imported': imported, 'shown': shown, 'first_frame': first_frame}))
+    sys.stdout.flush()
+    os._exit(0)
+
+
+ui.first_frame_signal.connect(lambda: report(time.time()))
+QTimer.singleShot(int(sys.argv[1]), lambda: report(None))
+app.exec_()
+'''
+
+
+def measure(timeout_ms):
+    spawned = time.time()
+    output = subprocess.run([sys.executable, '-c', CHILD, str(timeout_ms)],
+                            capture_output=True, text=True, cwd=os.getcwd()).stdout
+    stamps = json.loads(output.strip().splitlines()[-1])
+
+    result = {
+        'interpreter': stamps['begin'] - spawned,
+        'imports': stamps['imported'] - stamps['begin'],
+        'window_shown': stamps['shown'] - spawned,
+        'first_frame': None,
+    }
+    if stamps['first_frame'] is not None:
+        result['first_frame'] = stamps['first_frame'] - spawned
+    return result
+
+
+def summarize(runs):
+    summary = dict()
+    for key in runs[0]:
+        values = [run[key] for run in runs if run[key] is not None]
+        summary[key] = statistics.median(values) if len(values) > 0 else None
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Measure cold start time of the GUI.')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--timeout', type=int, default=10000, help='first frame timeout in ms')
+    parser.add_argument('--json', default=None, help='write the median results to this file')
+    args = parser.parse_args()
+
+    summary = summarize([measure(args.timeout) for _ in range(args.runs)])
+    for name, value in summary.items():
+        print('{:<14} {}'.format(name, 'n/a' if value is None else '{:.3f} s'.format(value)))
+
+    if args.json is not None:
+        with open(args.json, 'w') as outfile:
+            json.dump(summary, outfile, indent=2)
@@ -0,0 +1,67 @@
+"""
+Sentetik atışlarla tespit hızı ve doğruluğu: kamera gerekmez. Frame üretim süresi ölçüme katılmaz.
+
+Kullanım (atis_sistemi dizininden):
+    python -m benchmarks.synthetic --width 3840 --height 2160 --fps 120 --seconds 5
+    python -m benchmarks.synthetic --noise 4 --flicker 0.05 --blur 8 --json synthetic.json
+"""
+
+import argparse
+import json
+import time
+
+from modules.common.constants import SyntheticConstants
+from modules.common.detection import Detection
+from modules.common.synthetic import SyntheticShots, evaluate
+
+
+def run(generator, frame_count):
+    detection = Detection()
+    detected = list()
+    elapsed = 0.0
+
+    for number in range(frame_count):
+        frame = generator(number)
+        begin = time.perf_counter()
+        detected.append(detection.detect(frame)[0])
+        elapsed += time.perf_counter() - begin
+
+    result = evaluate(detected, generator.shots)
+    result.update({
+        'frames': frame_count,
+        'shots': len(generator.shots),
+        'detect_ms': 1000 * elapsed / frame_count,
+        'detect_fps': frame_count / elapsed,
+    })
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Measure detection throughput, recall and precision on synthetic shots.')
+    parser.add_argument('--width', type=int, default=640)
+    parser.add_argument('--height', type=int, default=480)
+    parser.add_argument('--fps', type=int, default=60)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--background', default=SyntheticConstants.BACKGROUND_PATH)
+    parser.add_argument('--rate', type=float, default=SyntheticConstants.SHOT_RATE)
+    parser.add_argument('--noise', type=float, default=SyntheticConstants.NOISE_SIGMA)
+    parser.add_argument('--flicker', type=float, default=SyntheticConstants.FLICKER)
+    parser.add_argument('--blur', type=int, default=SyntheticConstants.MOTION_BLUR)
+    parser.add_argument('--seed', type=int, default=SyntheticConstants.SEED)
+    parser.add_argument('--json', default=None, help='write the results to this file')
+    args = parser.parse_args()
+
+    shots = SyntheticShots(args.width, args.height, args.fps, args.background, args.rate, args.noise,
+                           args.flicker, args.blur, args.seed)
+    result = run(shots, int(args.seconds * args.fps))
+
+    print('{}x{} @ {} fps, {} frames, {} shots'.format(args.width, args.height, args.fps,
+                                                       result['frames'], result['shots']))
+    print('detect      {:.3f} ms/frame ({:.1f} fps{})'.format(
+        result['detect_ms'], result['detect_fps'], '' if result['detect_fps'] >= args.fps else ', below camera rate'))
+    print('recall      {:.3f} ({} / {})'.format(result['recall'], result['found'], result['shots']))
+    print('precision   {:.3f} ({} false positives)'.format(result['precision'], result['false_positives']))
+
+    if args.json is not None:
+        with open(args.json, 'w') as outfile:
+            json.dump(result, outfile, indent=2)
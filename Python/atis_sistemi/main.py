@@ -11,6 +11,7 @@ isabetliliği değerlendiren ve kayıt altına alan bir görüntü işleme uygul
 - Hedef bölgesi tanımlama
 - Kamera perspektif düzeltme
 - Çift ekran desteği (kontrol + hedef penceresi)
+- Arayüzsüz (headless) servis modu: atışlar yerel soket üzerinden yayınlanır
 
 Kullanılan Teknolojiler:
 - PyQt5: GUI framework
@@ -18,19 +19,39 @@ Kullanılan Teknolojiler:
 - NumPy: Sayısal hesaplamalar
 """
 
-# PyQt5 widget modülü - GUI bileşenleri için
-from PyQt5 import QtWidgets
+import argparse
 
-# Ana kullanıcı arayüzü sınıfı
-from modules.main.main_ui import MainUI
+from modules.common.constants import CameraConstants, ServiceConstants
+
+
+def camera_source(value):
+    # Sayısal değerler kamera indeksi, diğerleri video dosyası yolu olarak kullanılır
+    return int(value) if value.isdigit() else value
 
-# Program buradan başlar
-if __name__ == "__main__":
-    # Sistem argümanları için (command line parametreleri)
-    import sys
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description='Laser shot detection system')
+    parser.add_argument('--headless', action='store_true',
+                        help='run detection without GUI and publish shots over a local socket')
+    parser.add_argument('--camera', type=camera_source, default=CameraConstants.CAMERA_ID,
+                        help='camera index or video file')
+    parser.add_argument('--host', default=ServiceConstants.HOST)
+    parser.add_argument('--port', type=int, default=ServiceConstants.PORT)
+    parser.add_argument('--unix', default=ServiceConstants.UNIX_SOCKET_PATH, help='unix socket path')
+    # Qt kendi argümanlarını (örn. -platform) işleyebilsin diye bilinmeyenler atlanır
+    args, _ = parser.parse_known_args(argv[1:])
+    return args
+
+
+def run_gui(argv):
+    # PyQt5 widget modülü - GUI bileşenleri için
+    from PyQt5 import QtWidgets
+
+    # Ana kullanıcı arayüzü sınıfı
+    from modules.main.main_ui import MainUI
 
     # PyQt5 uygulaması oluştur (sys.argv ile komut satırı argümanlarını geç)
-    app = QtWidgets.QApplication(sys.argv)
+    app = QtWidgets.QApplication(argv)
     
     # Ana pencereyi oluştur ve göster
     # MainUI constructor içinde otomatik olarak show() çağrılıyor
@@ -38,4 +59,26 @@ if __name__ == "__main__":
     
     # Uygulama event loop'unu başlat ve çıkış kodunu döndür
     # Kullanıcı pencereyi kapattığında program düzgün şekilde sonlanır
-    sys.exit(app.exec_())
+    return app.exec_()
+
+
+# Program buradan başlar
+if __name__ == "__main__":
+    # PyInstaller ile paketlenmiş Windows sürümünde kayıt süreci (multiprocessing) ana programı
+    # yeniden çalıştırmasın diye ilk iş olarak çağrılmalıdır
+    import multiprocessing
+
+    multiprocessing.freeze_support()
+
+    # Sistem argümanları için (command line parametreleri)
+    import sys
+
+    arguments = parse_args(sys.argv)
+
+    if arguments.headless:
+        # Arayüzsüz mod: QApplication oluşturulmaz
+        from modules.service.headless import run_headless
+
+        run_headless(arguments.camera, arguments.host, arguments.port, arguments.unix)
+    else:
+        sys.exit(run_gui(sys.argv))
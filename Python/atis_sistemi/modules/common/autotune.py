@@ -0,0 +1,120 @@
+"""
+Tespit parametrelerinin kayıtlı bir klip üzerinden otomatik ayarlanması.
+
+Bilinen atışları içeren kısa bir klip, parametre uzayındaki her aday için Detection'dan geçirilir
+(adaylar tüm çekirdeklere dağıtılır). Bütün atışları bulan ve en az yanlış tespit veren adaylar
+arasından en ucuzu (en düşük CPU süresi, küçük kernel, Canny'siz) seçilip kamera profiline yazılır.
+
+Atış listesi JSON formatı (koordinatlar tespitin gördüğü, perspektifi düzeltilmiş frame'e göre):
+    [{"frame": 12, "x": 320, "y": 240}, ...]
+
+Kullanım (atis_sistemi dizininden):
+    python -m modules.common.autotune clip.avi shots.json --camera 0
+"""
+
+import argparse
+import itertools
+import json
+import multiprocessing
+import time
+
+import cv2
+
+from modules.common.detection import Detection
+from modules.common.profiles import ProfileStore, camera_key, detection_constants
+from modules.common.synthetic import evaluate
+
+SEARCH_SPACE = {
+    'KERNEL_SIZE': [(1, 1), (3, 3), (5, 5), (7, 7), (9, 9)],
+    'USE_CANNY': [False, True],
+    'MIN_ADAPTIVE': [10, 15, 20, 30, 40],
+    'MIN_CONTOUR_AREA': [2, 5, 10, 20],
+}
+
+_frames = None
+
+
+def load_clip(path):
+    capture = cv2.VideoCapture(path)
+    frames = list()
+    while True:
+        ret, frame = capture.read()
+        if not ret:
+            break
+        frames.append(frame)
+    capture.release()
+    return frames
+
+
+def _init_worker(path):
+    global _frames
+    _frames = load_clip(path)
+
+
+def _score(args):
+    candidate, shots = args
+
+    detection = Detection(detection_constants(candidate))
+    begin = time.process_time()
+    detected = [detection.detect(frame)[0] for frame in _frames]
+    cost = time.process_time() - begin
+
+    result = evaluate(detected, shots)
+
+    return {
+        'candidate': candidate,
+        'found': result['found'],
+        'false_positives': result['false_positives'],
+        'cost': cost / max(len(_frames), 1),
+    }
+
+
+def candidates():
+    names = list(SEARCH_SPACE)
+    for values in itertools.product(*(SEARCH_SPACE[name] for name in names)):
+        yield dict(zip(names, values))
+
+
+def choose(results, shot_count):
+    """
+    Bütün atışları bulan adaylardan en az yanlış tespitli olanlar arasında en ucuzunu seçer.
+    """
+    complete = [result for result in results if result['found'] == shot_count]
+    if len(complete) == 0:
+        return None
+
+    fewest = min(result['false_positives'] for result in complete)
+    return min((result for result in complete if result['false_positives'] == fewest),
+               key=lambda result: (round(result['cost'], 4),
+                                   result['candidate']['KERNEL_SIZE'][0],
+                                   result['candidate']['USE_CANNY']))
+
+
+def tune(clip_path, shots, processes=None):
+    with multiprocessing.Pool(processes=processes, initializer=_init_worker, initargs=(clip_path,)) as pool:
+        results = pool.map(_score, [(candidate, shots) for candidate in candidates()])
+    return choose(results, len(shots)), results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Tune detection parameters on a clip with known shots.')
+    parser.add_argument('clip')
+    parser.add_argument('shots', help='JSON list of {"frame", "x", "y"} ground truth shots')
+    parser.add_argument('--camera', default='0', help='camera index or file the profile belongs to')
+    parser.add_argument('--processes', type=int, default=None)
+    args = parser.parse_args()
+
+    with open(args.shots) as json_file:
+        ground_truth = json.load(json_file)
+
+    best, _ = tune(args.clip, ground_truth, args.processes)
+    if best is None:
+        raise SystemExit('No parameter set found all {} shots.'.format(len(ground_truth)))
+
+    camera = int(args.camera) if args.camera.isdigit() else args.camera
+    values = dict(best['candidate'])
+    values['KERNEL_SIZE'] = list(values['KERNEL_SIZE'])
+    ProfileStore().save(camera_key(camera), 'detection', values)
+
+    print('Selected {} ({:.3f} ms/frame, {} false positives)'.format(
+        best['candidate'], 1000 * best['cost'], best['false_positives']))
@@ -0,0 +1,380 @@
+import time
+from collections import deque
+from functools import partial
+from datetime import datetime
+from multiprocessing.pool import ThreadPool
+
+import cv2
+import numpy as np
+
+from modules.common.capture import open_capture
+from modules.common.clip_buffer import ClipBuffer
+from modules.common.constants import CameraConstants
+from modules.common.detection import Detection
+from modules.common.exposure import ExposureController
+from modules.common.fps import FPS
+from modules.common.governor import QualityGovernor
+from modules.common import scheduling
+from modules.common.profiles import ProfileStore, camera_key, detection_constants
+from modules.common.recorder import SessionRecorder
+from modules.feat.feat import Feat
+from modules.perspective.auto_calibration import AutoCalibration
+from modules.perspective.lens_calibration import LensCalibration
+from modules.perspective.perspective import Perspective
+
+
+class CameraLoop:
+    """
+    Kamera okuma + perspektif düzeltme + tespit döngüsü (Qt bağımsız).
+
+    Sonuçlar _on_* metotları üzerinden yayınlanır; CameraWork bunları Qt sinyallerine,
+    HeadlessWork ise soket servisine bağlar.
+    """
+
+    def __init__(self, camera_id=CameraConstants.CAMERA_ID, camera_fps=CameraConstants.CAMERA_FPS,
+                 camera_width=CameraConstants.CAMERA_WIDTH, camera_height=CameraConstants.CAMERA_HEIGHT):
+        self.__camera_fps = camera_fps
+        self.__capture = open_capture(camera_id, camera_fps, camera_width, camera_height)
+
+        # Sürücünün gerçekte verdiği mod (backend, FOURCC, çözünürlük, FPS)
+        self.capture_mode = self.__capture.mode()
+        self.available_width = self.capture_mode['width']
+        self.available_height = self.capture_mode['height']
+
+        self.feat = Feat(self.available_width, self.available_height)
+        self.perspective = Perspective(self.available_width, self.available_height)
+
+        # Kamera için kaydedilmiş profil: kalibrasyon, hedef bölgesi, tespit değerleri, arka plan
+        self.profile_key = camera_key(camera_id)
+        self.__profiles = ProfileStore()
+        self.profile = self.__profiles.load(self.profile_key)
+        self.__restore_profile()
+
+        self.__fps = FPS()
+        self.__detection_constants = detection_constants(self.profile.get('detection', dict()))
+        self.__detection = Detection(self.__detection_constants)
+        # Yük altında tespit kalitesini kademeli düşüren / geri yükselten denetleyici
+        self.governor = QualityGovernor(1.0 / camera_fps)
+        # Arka planı karanlık tutmak için pozlama/kazanç denetimi (video dosyalarında devre dışı)
+        self.exposure = ExposureController(self.__capture)
+        # Governor seviyesi başına tespit sabitleri; döngü başlarken kurulur
+        self.__quality_levels = [self.__detection_constants]
+        self.__constants = self.__detection_constants
+        self.__scale = 1.0
+        self.__preview_every = 1
+        self.__auto_calibration = None
+        self.__lens_calibration = None
+        self.recorder = None
+        self.clip_buffer = None
+
+        self.isWorkerAlive = True
+        self.isCameraRunning = True
+        self.isDetectionRunning = False
+
+    @property
+    def camera_connected(self):
+        """
+        Kamera takılıp arka planda yeniden açılıyorsa False (WatchedCapture).
+        """
+        return getattr(self.__capture, 'connected', True)
+
+    def __matches_camera(self, section):
+        return section is not None and section.get('size') == [self.available_width, self.available_height]
+
+    def __restore_profile(self):
+        """
+        Kayıtlı profili hesaplama yapmadan yükler: remap tabloları ve hedef bölgesi maskesi .npy
+        dosyalarından bellek eşlemeli okunur. Çözünürlüğü farklı bölümler yok sayılır.
+        """
+        lens = self.profile.get('lens')
+        perspective = self.profile.get('perspective')
+        feat = self.profile.get('feat')
+
+        if not self.__matches_camera(lens):
+            lens = None
+        if self.__matches_camera(perspective) or lens is not None:
+            matrix = perspective['matrix'] if self.__matches_camera(perspective) else self.perspective.matrix
+            maps = None
+            if lens is not None and self.__matches_camera(perspective) and perspective.get('maps'):
+                map1 = self.__profiles.load_array(self.profile_key, 'remap1')
+                map2 = self.__profiles.load_array(self.profile_key, 'remap2')
+                maps = (map1, map2) if map1 is not None and map2 is not None else None
+            self.perspective.restore(matrix,
+                                     lens['camera_matrix'] if lens is not None else None,
+                                     lens['distortion'] if lens is not None else None,
+                                     maps)
+
+        if self.__matches_camera(feat):
+            self.feat.set_feat(feat['points'], self.__profiles.load_array(self.profile_key, 'feat_mask'))
+
+    def __save_section(self, section, data):
+        self.profile[section] = data
+        self.__profiles.save(self.profile_key, section, data)
+
+    def __save_perspective(self, points):
+        maps = self.perspective.maps
+        self.__save_section('perspective', {
+            'size': [self.available_width, self.available_height],
+            'points': None if points is None else np.float32(points).tolist(),
+            'matrix': self.perspective.matrix.tolist(),
+            'maps': maps is not None,
+        })
+        if maps is not None:
+            self.__profiles.save_array(self.profile_key, 'remap1', maps[0])
+            self.__profiles.save_array(self.profile_key, 'remap2', maps[1])
+        else:
+            self.__profiles.remove_array(self.profile_key, 'remap1')
+            self.__profiles.remove_array(self.profile_key, 'remap2')
+
+    def set_perspective(self, points=None):
+        """
+        Homografiyi 4 köşeden hesaplar (None ise sıfırlar) ve kamera profiline kaydeder.
+        """
+        self.perspective.set_matrix(points)
+        self.__save_perspective(points)
+
+    def set_feat(self, points):
+        """
+        Hedef bölgesini (x, y) köşe listesiyle ayarlar ve maskesiyle birlikte profile kaydeder.
+        """
+        self.feat.set_feat(points)
+        self.__save_section('feat', {
+            'size': [self.available_width, self.available_height],
+            'points': [list(point) for point in self.feat.points],
+        })
+        self.__profiles.save_array(self.profile_key, 'feat_mask', self.feat.mask)
+
+    def set_background(self, path):
+        """
+        Hedef arka plan görüntüsünü profil klasörüne kopyalar; sonraki açılışta otomatik yüklenir.
+        """
+        self.__save_section('background', self.__profiles.save_file(self.profile_key, 'background', path))
+
+    def _on_init(self, size):
+        pass
+
+    def _on_detected(self, bundle):
+        pass
+
+    def _on_fps(self, fps):
+        pass
+
+    def _on_frame(self, frame):
+        pass
+
+    def _on_finished(self):
+        pass
+
+    def _on_calibrated(self, points):
+        pass
+
+    def _on_lens_calibrated(self, result):
+        pass
+
+    def _on_calibration_result(self, apply, result):
+        """
+        Kalibrasyon işçisinin thread'inden çağrılır. Arayüzsüz modda sonuç hemen uygulanır; CameraWork
+        sonucu GUI thread'ine taşır (perspektif ve profil elle ayarlamayla aynı thread'de değişir).
+        """
+        apply(result)
+
+    def start_auto_calibration(self):
+        """
+        Hedef köşelerini canlı frame'lerden otomatik bulmaya başlar; görüntü akışı durmaz.
+        """
+        if self.__auto_calibration is not None:
+            self.__auto_calibration.cancel()
+        self.__auto_calibration = AutoCalibration(partial(self._on_calibration_result,
+                                                          self.__apply_auto_calibration))
+
+    def __apply_auto_calibration(self, points):
+        if points is not None:
+            # Köşeler ham frame'de bulunur, homografi distorsiyonsuz koordinatlarda tanımlıdır
+            points = self.perspective.undistort_points(points)
+            self.set_perspective(points)
+        self._on_calibrated(points)
+
+    def start_lens_calibration(self):
+        """
+        Satranç tahtası görüntülerinden lens kalibrasyonunu başlatır; sonuç kamera profiline yazılır.
+        """
+        if self.__lens_calibration is not None:
+            self.__lens_calibration.cancel()
+        self.__lens_calibration = LensCalibration(partial(self._on_calibration_result,
+                                                          self.__apply_lens_calibration))
+
+    def __apply_lens_calibration(self, result):
+        if result is not None:
+            self.perspective.set_intrinsics(result['camera_matrix'], result['distortion'])
+            self.__save_section('lens', {
+                'camera_matrix': result['camera_matrix'].tolist(),
+                'distortion': result['distortion'].tolist(),
+                'rms': result['rms'],
+                'size': [self.available_width, self.available_height],
+            })
+            # Remap tabloları yeni lens modeliyle yeniden oluştu
+            self.__save_perspective(self.profile.get('perspective', dict()).get('points'))
+        self._on_lens_calibrated(result)
+
+    def start_recording(self, path):
+        """
+        Perspektifi düzeltilmiş frame'leri ayrı bir süreçte <path>.avi olarak kaydetmeye başlar.
+        """
+        self.stop_recording()
+        self.recorder = SessionRecorder(path, self.available_width, self.available_height, self.__camera_fps)
+
+    def stop_recording(self):
+        recorder, self.recorder = self.recorder, None
+        if recorder is not None:
+            recorder.close()
+        return recorder
+
+    def start_clips(self, path):
+        """
+        Her atış için kısa bir öncesi/sonrası klibini <path>/clips altına yazmaya başlar.
+        """
+        self.stop_clips()
+        self.clip_buffer = ClipBuffer(path + '/clips', self.available_width, self.available_height,
+                                      self.__camera_fps)
+
+    def stop_clips(self):
+        clip_buffer, self.clip_buffer = self.clip_buffer, None
+        if clip_buffer is not None:
+            clip_buffer.close()
+        return clip_buffer
+
+    def __build_quality_levels(self):
+        """
+        Returns:
+            Governor'ın her seviyesi için profildeki sabitlerden türetilmiş bir DetectionConstants alt sınıfı
+        """
+        base = self.__detection_constants
+        levels = list()
+        for level in range(self.governor.max_level + 1):
+            settings = self.governor.settings_at(level)
+            overrides = {name: value for name, value in settings.items() if hasattr(base, name)}
+            if 'KERNEL_SIZE' in overrides and overrides['KERNEL_SIZE'][0] >= base.KERNEL_SIZE[0]:
+                del overrides['KERNEL_SIZE']
+            # Küçültülmüş frame'de lazer noktasının alanı da ölçeğin karesiyle küçülür
+            overrides['MIN_CONTOUR_AREA'] = base.MIN_CONTOUR_AREA * settings['SCALE'] ** 2
+            levels.append(type('DetectionQuality{}'.format(level), (base,), overrides))
+        return levels
+
+    def __apply_quality(self):
+        """
+        Governor seviyesini uygular: tespit ölçeği, blur kernel'i, Canny ve önizleme sıklığı. Sabitler
+        paylaşılan Detection nesnesinde değiştirilmez; seviyenin sınıfı her tespit işine ayrıca verilir.
+        """
+        settings = self.governor.settings
+        self.__constants = self.__quality_levels[self.governor.level]
+        self.__scale = settings['SCALE']
+        self.__preview_every = settings['PREVIEW_EVERY']
+
+    def __detect(self, frame, scale, constants):
+        """
+        Returns:
+            (noktalar, atıcı numaraları, arka plan parlaklığı, lazer kontrastı, tespit süresi) - istatistikler
+            pozlama denetimi, süre governor için. Süre işçinin içinde ölçülür; döngünün sonucu toplamayı
+            beklediği süre ve GIL çekişmesi yüke eklenmez
+        """
+        begin = time.perf_counter()
+        if scale == 1.0:
+            points, shooters, stats = self.__detection.detect(frame, constants)
+        else:
+            points, shooters, stats = self.__detection.detect(cv2.resize(frame, None, fx=scale, fy=scale,
+                                                                         interpolation=cv2.INTER_AREA), constants)
+            points = [(int(x / scale), int(y / scale)) for x, y in points]
+        return points, shooters, stats['background'], stats['contrast'], time.perf_counter() - begin
+
+    def run(self):
+        self._on_init({
+            'width': int(self.available_width),
+            'height': int(self.available_height),
+            'background': self.profile.get('background')
+        })
+
+        self.__quality_levels = self.__build_quality_levels()
+        self.__apply_quality()
+
+        # Döngü yakalama çekirdeğine, tespit işçileri kendi çekirdeklerine atanır
+        schedule = scheduling.plan()
+        scheduling.configure_opencv(schedule)
+        scheduling.pin_current_thread(scheduling.ROLE_CAPTURE)
+        cpu_count = schedule['workers']
+        pool = ThreadPool(processes=cpu_count, initializer=scheduling.pin_current_thread,
+                          initargs=(scheduling.ROLE_DETECTION,))
+        pending_task = deque()
+
+        # Atıcı başına son atış zamanı: iki atıcı birbirinin bekleme süresini engellemez
+        begin = time.time()
+        last_shots = dict()
+        delay = CameraConstants.DETECTION_DELAY_MS
+        frame_number = 0
+
+        while self.isWorkerAlive:
+            while len(pending_task) > 0 and pending_task[0][1].ready():
+                source_frame, task = pending_task.popleft()
+                points, shooters, background, contrast, elapsed = task.get()
+                if self.governor.observe(elapsed, cpu_count):
+                    self.__apply_quality()
+                self.exposure.observe(background, contrast)
+                # Pozlama değişirken oluşan parlaklık sıçraması atış sayılmaz
+                if self.exposure.settling:
+                    continue
+                for point, shooter in zip(points, shooters):
+                    # Her atıcının frame'deki ilk noktası
+                    if time.time() - last_shots.get(shooter, begin) <= delay:
+                        continue
+                    last_shots[shooter] = time.time()
+                    bundle = [point, datetime.now().strftime("%H:%M:%S"), shooter]
+                    recorder = self.recorder
+                    if recorder is not None:
+                        recorder.mark_shot(source_frame, bundle[0], bundle[1], shooter)
+                    clip_buffer = self.clip_buffer
+                    if clip_buffer is not None:
+                        clip_buffer.mark_shot(source_frame, bundle[1])
+                    self._on_detected(bundle)
+
+            if self.isCameraRunning:
+                if len(pending_task) < cpu_count:
+                    ret, frame = self.__capture.read()
+                    captured = time.perf_counter()
+                    self._on_fps(self.__fps.calc_fps())
+
+                    if not ret:
+                        # raise Exception('Frame could not be loaded!')
+                        self.__capture.rewind()
+                        continue
+
+                    for calibration in (self.__auto_calibration, self.__lens_calibration):
+                        if calibration is not None and calibration.isRunning:
+                            calibration.submit(frame)
+
+                    wrapped = self.perspective.get_wrap(frame)
+                    frame_number += 1
+
+                    recorder = self.recorder
+                    if recorder is not None:
+                        recorder.write(wrapped, frame_number)
+                    clip_buffer = self.clip_buffer
+                    if clip_buffer is not None:
+                        clip_buffer.write(wrapped, frame_number)
+
+                    if self.isDetectionRunning:
+                        task = pool.apply_async(self.__detect, (wrapped, self.__scale, self.__constants))
+                        pending_task.append((frame_number, task))
+                    else:
+                        if frame_number % self.__preview_every == 0:
+                            self._on_frame(wrapped)
+                        if self.governor.observe(time.perf_counter() - captured):
+                            self.__apply_quality()
+        pool.terminate()
+        # ThreadPool.terminate() çalışan tespiti beklemez; yorumlayıcı kapanırken OpenCV içinde kalmasın
+        pool.join()
+        self.stop_recording()
+        self.stop_clips()
+        for calibration in (self.__auto_calibration, self.__lens_calibration):
+            if calibration is not None:
+                calibration.cancel()
+        self.__capture.release()
+        self._on_finished()
@@ -0,0 +1,387 @@
+import logging
+import sys
+import threading
+import time
+
+import cv2
+
+from modules.common import scheduling
+from modules.common.constants import CaptureConstants, SyntheticConstants, WatchdogConstants
+from modules.common.synthetic import SyntheticShots
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = {
+    'any': cv2.CAP_ANY,
+    'v4l2': cv2.CAP_V4L2,
+    'ffmpeg': cv2.CAP_FFMPEG,
+    'dshow': cv2.CAP_DSHOW,
+    'msmf': cv2.CAP_MSMF,
+}
+
+
+def decode_fourcc(value):
+    value = int(value)
+    return ''.join(chr((value >> 8 * i) & 0xFF) for i in range(4))
+
+
+class Capture:
+    """
+    Kamera döngüsünün kullandığı frame kaynağı arayüzü.
+    """
+
+    def read(self):
+        """
+        Returns:
+            (ret, frame) - cv2.VideoCapture.read() ile aynı
+        """
+        raise NotImplementedError
+
+    def rewind(self):
+        """
+        Kaynak biterse başa döner; canlı kameralarda etkisizdir.
+        """
+        raise NotImplementedError
+
+    def release(self):
+        pass
+
+    def mode(self):
+        """
+        Gerçekte elde edilen mod: {'backend', 'fourcc', 'width', 'height', 'fps'}
+        """
+        raise NotImplementedError
+
+    def set_exposure(self, value):
+        return False
+
+    def set_gain(self, value):
+        return False
+
+
+class OpenCVCapture(Capture):
+    """
+    cv2.VideoCapture üzerinden kamera. Backend açıkça seçilir, FOURCC / tampon boyutu / pozlama
+    çözünürlükten önce ayarlanır (V4L2 formatı çözünürlük ayarlanırken seçer) ve elde edilen mod
+    istenenden farklıysa uyarı yazılır.
+    """
+
+    def __init__(self, camera_id, fps, width, height, backend=CaptureConstants.BACKEND,
+                 fourcc=CaptureConstants.FOURCC, buffer_size=CaptureConstants.BUFFER_SIZE,
+                 exposure=CaptureConstants.EXPOSURE):
+        if backend == 'auto':
+            backend = 'v4l2' if sys.platform.startswith('linux') else 'any'
+        self.__capture = cv2.VideoCapture(camera_id, BACKENDS[backend])
+
+        if not self.__capture.isOpened() and backend != 'any':
+            logger.warning('Camera %s could not be opened with %s, falling back to default backend',
+                           camera_id, backend)
+            self.__capture = cv2.VideoCapture(camera_id)
+
+        if not self.__capture.isOpened():
+            raise Exception('Camera could not be opened!')
+
+        if fourcc is not None:
+            self.__capture.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+        if buffer_size is not None:
+            self.__capture.set(cv2.CAP_PROP_BUFFERSIZE, buffer_size)
+        self.__capture.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        self.__capture.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        self.__capture.set(cv2.CAP_PROP_FPS, fps)
+        if exposure is not None:
+            self.set_exposure(exposure)
+
+        mode = self.mode()
+        logger.info('Camera %s opened: %s', camera_id, mode)
+        if (fourcc is not None and mode['fourcc'] != fourcc) or mode['fps'] < fps:
+            logger.warning('Camera %s negotiated %s %.1f fps instead of %s %d fps',
+                           camera_id, mode['fourcc'], mode['fps'], fourcc, fps)
+
+    def read(self):
+        return self.__capture.read()
+
+    def rewind(self):
+        pass
+
+    def release(self):
+        self.__capture.release()
+
+    def mode(self):
+        return {
+            'backend': self.__capture.getBackendName(),
+            'fourcc': decode_fourcc(self.__capture.get(cv2.CAP_PROP_FOURCC)),
+            'width': int(self.__capture.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            'height': int(self.__capture.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            'fps': self.__capture.get(cv2.CAP_PROP_FPS),
+        }
+
+    def set_exposure(self, value):
+        """
+        value None ise otomatik pozlamaya döner. Manuel/otomatik değerleri backend'e göre AUTO_EXPOSURE'dan
+        gelir (örn. V4L2'de 1 = manuel, 3 = otomatik); bilinmeyen backend'lerde ayar yapılmaz.
+        """
+        backend = self.__capture.getBackendName()
+        if backend not in CaptureConstants.AUTO_EXPOSURE:
+            logger.warning('Exposure control is not supported with the %s backend', backend)
+            return False
+        manual, automatic = CaptureConstants.AUTO_EXPOSURE[backend]
+        if value is None:
+            return self.__capture.set(cv2.CAP_PROP_AUTO_EXPOSURE, automatic)
+        self.__capture.set(cv2.CAP_PROP_AUTO_EXPOSURE, manual)
+        return self.__capture.set(cv2.CAP_PROP_EXPOSURE, value)
+
+    def set_gain(self, value):
+        return self.__capture.set(cv2.CAP_PROP_GAIN, value)
+
+
+class FileCapture(Capture):
+    """
+    Video dosyasından frame okur; dosya bitince rewind() ile başa döner.
+    """
+
+    def __init__(self, path, backend=CaptureConstants.BACKEND):
+        backend = 'ffmpeg' if backend in ('auto', 'v4l2') else backend
+        self.__capture = cv2.VideoCapture(path, BACKENDS[backend])
+
+        if not self.__capture.isOpened():
+            raise Exception('Camera could not be opened!')
+
+    def read(self):
+        return self.__capture.read()
+
+    def rewind(self):
+        self.__capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+
+    def release(self):
+        self.__capture.release()
+
+    def mode(self):
+        return {
+            'backend': self.__capture.getBackendName(),
+            'fourcc': decode_fourcc(self.__capture.get(cv2.CAP_PROP_FOURCC)),
+            'width': int(self.__capture.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            'height': int(self.__capture.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            'fps': self.__capture.get(cv2.CAP_PROP_FPS),
+        }
+
+
+class SyntheticCapture(Capture):
+    """
+    Kamera olmadan test için frame üretir. generator(frame_number) bir BGR frame döndürür;
+    verilmezse hedef üzerinde rastgele lazer atışları üreten SyntheticShots kullanılır.
+
+    Pozlama ve kazanç, generator'ın brightness özelliği varsa arka plan parlaklığına yansıtılır.
+    """
+
+    def __init__(self, fps, width, height, generator=None):
+        self.__fps = fps
+        self.__width = width
+        self.__height = height
+        self.__frame_number = 0
+        self.__exposure = None
+        self.__gain = 0
+
+        self.generator = generator if generator is not None else SyntheticShots(width, height, fps)
+
+    def read(self):
+        frame = self.generator(self.__frame_number)
+        self.__frame_number += 1
+        return frame is not None, frame
+
+    def rewind(self):
+        self.__frame_number = 0
+
+    def mode(self):
+        return {
+            'backend': 'SYNTHETIC',
+            'fourcc': 'BGR3',
+            'width': self.__width,
+            'height': self.__height,
+            'fps': float(self.__fps),
+        }
+
+    def __apply_brightness(self):
+        if not hasattr(self.generator, 'brightness'):
+            return False
+        exposure = 1.0 if self.__exposure is None else self.__exposure / SyntheticConstants.EXPOSURE_REFERENCE
+        self.generator.brightness = exposure * (1 + self.__gain / SyntheticConstants.GAIN_REFERENCE)
+        return True
+
+    def set_exposure(self, value):
+        self.__exposure = value
+        return self.__apply_brightness()
+
+    def set_gain(self, value):
+        self.__gain = value
+        return self.__apply_brightness()
+
+
+class WatchedCapture(Capture):
+    """
+    Canlı kamerayı ayrı bir okuma thread'inde okuyan ve takılmaları kendiliğinden onaran sarmalayıcı.
+
+    read() en fazla DEADLINE_S kadar yeni frame bekler. Bu sürede frame gelmezse (sürücü read()
+    içinde takıldıysa) veya MAX_FAILURES ardışık okuma başarısız olduysa cihaz arka planda kapatılıp
+    BACKOFF_S aralıklarıyla yeniden açılır. Bu sırada read() (False, None) döner; kamera döngüsü,
+    kalibrasyon ve oturum durumu olduğu gibi kalır, yeni cihaz açılınca okuma kaldığı yerden sürer.
+    Son pozlama ve kazanç ayarları yeni cihaza yeniden uygulanır.
+
+    Okuma thread'i yalnızca en son frame'i tutar; döngü yetişemezse eski frame'ler düşer.
+    """
+
+    def __init__(self, open_function, deadline=WatchdogConstants.DEADLINE_S):
+        self.__open = open_function
+        self.__deadline = deadline
+        self.__capture = open_function()
+
+        self.__condition = threading.Condition()
+        self.__stopped = threading.Event()
+        self.__generation = 0
+        self.__frame = None
+        self.__sequence = 0
+        self.__consumed = 0
+        self.__failed = False
+        self.__reconnecting = False
+        # Frame alınamadan art arda yapılan yeniden açma denemeleri (bekleme süresini belirler)
+        self.__attempts = 0
+        self.__settings = dict()
+
+        self.connected = True
+        self.reconnects = 0
+
+        self.__start_reader()
+        self.__connected_at = time.perf_counter()
+
+    def __start_reader(self):
+        threading.Thread(target=self.__read_frames, args=(self.__capture, self.__generation),
+                         name='CaptureReader', daemon=True).start()
+
+    def __read_frames(self, capture, generation):
+        scheduling.pin_current_thread(scheduling.ROLE_CAPTURE)
+        failures = 0
+        while not self.__stopped.is_set():
+            ret, frame = capture.read()
+            with self.__condition:
+                # Yeniden bağlanma sonrası eski cihazın okuyucusu sessizce çıkar
+                if generation != self.__generation:
+                    return
+                if ret:
+                    failures = 0
+                    self.__attempts = 0
+                    self.__frame = frame
+                    self.__sequence += 1
+                    self.__condition.notify_all()
+                    continue
+
+                failures += 1
+                if failures >= WatchdogConstants.MAX_FAILURES:
+                    self.__failed = True
+                    self.__condition.notify_all()
+                    return
+            self.__stopped.wait(WatchdogConstants.FAILURE_DELAY_S)
+
+    def read(self):
+        with self.__condition:
+            ready = self.__condition.wait_for(
+                lambda: self.__sequence > self.__consumed or self.__failed or self.__stopped.is_set(),
+                timeout=self.__deadline)
+            if ready and self.__sequence > self.__consumed:
+                self.__consumed = self.__sequence
+                return True, self.__frame
+            # Yeniden açma sürüyor veya yeni açılan cihaza ilk frame için tam süre tanınır
+            if self.__reconnecting or \
+                    (not self.__failed and time.perf_counter() - self.__connected_at < self.__deadline):
+                return False, None
+            generation = self.__generation
+            reason = 'read failed' if self.__failed else 'no frame in {:.2f} s'.format(self.__deadline)
+
+        self.__reconnect(generation, reason)
+        return False, None
+
+    def rewind(self):
+        # Okuma hatası yeniden bağlanmayla onarılır; canlı kamerada başa dönülecek bir yer yok
+        pass
+
+    def __reconnect(self, generation, reason):
+        with self.__condition:
+            # Bu arada başka bir yeniden bağlanma başlamış veya bitmiş olabilir
+            if self.__reconnecting or generation != self.__generation or self.__stopped.is_set():
+                return
+            self.__reconnecting = True
+            self.__generation += 1
+            self.__failed = False
+            self.connected = False
+            previous = self.__capture
+
+        logger.warning('Camera stalled (%s), reconnecting', reason)
+        threading.Thread(target=self.__reopen, args=(previous, time.perf_counter()),
+                         name='CaptureReconnect', daemon=True).start()
+
+    def __reopen(self, previous, began):
+        # Takılmış bir read() release()'i de bekletebilir; yeniden açma süresiz beklemez
+        releaser = threading.Thread(target=previous.release, daemon=True)
+        releaser.start()
+        releaser.join(WatchdogConstants.RELEASE_TIMEOUT_S)
+
+        # İlk deneme hemen yapılır; cihaz açılıp yine frame vermezse denemeler giderek seyrekleşir
+        while not self.__stopped.is_set():
+            if self.__attempts > 0:
+                backoff = WatchdogConstants.BACKOFF_S
+                self.__stopped.wait(backoff[min(self.__attempts, len(backoff)) - 1])
+            self.__attempts += 1
+            try:
+                capture = self.__open()
+                break
+            except Exception as error:
+                logger.warning('Camera reconnect attempt %d failed: %s', self.__attempts, error)
+        else:
+            return
+
+        if 'exposure' in self.__settings:
+            capture.set_exposure(self.__settings['exposure'])
+        if 'gain' in self.__settings:
+            capture.set_gain(self.__settings['gain'])
+
+        with self.__condition:
+            self.__capture = capture
+            self.__reconnecting = False
+            self.connected = True
+            self.reconnects += 1
+            self.__start_reader()
+            self.__connected_at = time.perf_counter()
+        logger.info('Camera reconnected in %.2f s', time.perf_counter() - began)
+
+    def release(self):
+        self.__stopped.set()
+        with self.__condition:
+            self.__generation += 1
+            self.__condition.notify_all()
+            capture = self.__capture
+        capture.release()
+
+    def mode(self):
+        return self.__capture.mode()
+
+    def set_exposure(self, value):
+        self.__settings['exposure'] = value
+        return self.__capture.set_exposure(value)
+
+    def set_gain(self, value):
+        self.__settings['gain'] = value
+        return self.__capture.set_gain(value)
+
+
+def open_capture(source, fps, width, height, backend=CaptureConstants.BACKEND):
+    """
+    Kaynağa uygun Capture: kamera indeksi, 'synthetic' veya video dosyası yolu. Kameralar
+    WatchdogConstants.ENABLED ise WatchedCapture ile sarılır.
+    """
+    if isinstance(source, Capture):
+        return source
+    if isinstance(source, int):
+        if WatchdogConstants.ENABLED:
+            return WatchedCapture(lambda: OpenCVCapture(source, fps, width, height, backend))
+        return OpenCVCapture(source, fps, width, height, backend)
+    if source == CaptureConstants.SYNTHETIC_SOURCE:
+        return SyntheticCapture(fps, width, height)
+    return FileCapture(source, backend)
@@ -0,0 +1,146 @@
+import os
+import queue
+import threading
+
+import cv2
+import numpy as np
+
+from modules.common.constants import ClipConstants
+
+
+class ClipBuffer:
+    """
+    Son BUFFER_S saniyenin perspektifi düzeltilmiş frame'lerini sıkıştırılmış bir halkada tutar ve her
+    atış için PRE_S öncesi / POST_S sonrası kısa bir klip çıkarır.
+
+    Kamera döngüsü frame'i yalnızca küçük bir ham ara halkaya (STAGING_FRAMES) kopyalar; JPEG sıkıştırma
+    arka plan thread'inde yapılır ve çözme yalnızca klip dışa aktarılırken gerekir. Böylece bellek
+    1080p60'ta ham halkanın ~1 GB'ı yerine birkaç on MB'dır. Ara halka ilk frame'de ayrılır.
+
+    Frame n her zaman n % boyut yuvasına yazılır. Sıkıştırma thread'i yuvayı okuduktan sonra frame numarası
+    değişmişse (ara halka üzerine yazdıysa) o frame atlanır ve skipped artar. Klip hazır olduğunda JPEG'lerin
+    referansları alınır; dışa aktarma ne kadar sürerse sürsün halka kliple yarışmaz.
+    """
+
+    def __init__(self, path, width, height, fps, seconds=ClipConstants.BUFFER_S):
+        self.__path = path
+        self.__shape = (height, width, 3)
+        self.__fps = fps
+        self.__size = max(1, int(seconds * fps))
+        self.__pre = int(ClipConstants.PRE_S * fps)
+        self.__post = int(ClipConstants.POST_S * fps)
+
+        self.__staging = None
+        self.__staging_numbers = np.full(ClipConstants.STAGING_FRAMES, -1, dtype=np.int64)
+        self.__encoded = [None] * self.__size
+        self.__encoded_numbers = np.full(self.__size, -1, dtype=np.int64)
+        # (son frame numarası, atış frame numarası, dosya adı)
+        self.__pending = list()
+
+        self.__lock = threading.Lock()
+        self.__closed = False
+        self.__frames = queue.Queue()
+        self.__jobs = queue.Queue()
+        self.__compressor = threading.Thread(target=self.__compress, name='ClipCompressor', daemon=True)
+        self.__compressor.start()
+        self.__thread = threading.Thread(target=self.__export, name='ClipBuffer', daemon=True)
+        self.__thread.start()
+
+        self.clips = 0
+        self.skipped = 0
+
+    def write(self, frame, frame_number):
+        with self.__lock:
+            if self.__closed or frame.shape != self.__shape:
+                return
+            if self.__staging is None:
+                self.__staging = np.zeros((ClipConstants.STAGING_FRAMES,) + self.__shape, dtype=np.uint8)
+
+            slot = frame_number % ClipConstants.STAGING_FRAMES
+            self.__staging_numbers[slot] = -1
+            np.copyto(self.__staging[slot], frame)
+            self.__staging_numbers[slot] = frame_number
+        self.__frames.put(frame_number)
+
+    def mark_shot(self, frame_number, label):
+        with self.__lock:
+            if self.__closed:
+                return
+            self.clips += 1
+            name = 'shot-{:03d}-{}'.format(self.clips, label.replace(':', ''))
+            self.__pending.append((frame_number + self.__post, frame_number, name))
+
+    def close(self):
+        with self.__lock:
+            if self.__closed:
+                return
+            self.__closed = True
+
+        self.__frames.put(None)
+        self.__compressor.join()
+        self.__jobs.put(None)
+        self.__thread.join()
+
+    def __compress(self):
+        while True:
+            number = self.__frames.get()
+            if number is None:
+                break
+
+            slot = number % ClipConstants.STAGING_FRAMES
+            if self.__staging_numbers[slot] != number:
+                self.skipped += 1
+                continue
+            _, data = cv2.imencode('.jpg', self.__staging[slot],
+                                   [cv2.IMWRITE_JPEG_QUALITY, ClipConstants.JPEG_QUALITY])
+            # Sıkıştırma sırasında yuva üzerine yazıldıysa görüntü yırtılmış olabilir
+            if self.__staging_numbers[slot] != number:
+                self.skipped += 1
+                continue
+
+            self.__encoded[number % self.__size] = data
+            self.__encoded_numbers[number % self.__size] = number
+
+            with self.__lock:
+                while len(self.__pending) > 0 and self.__pending[0][0] <= number:
+                    self.__jobs.put(self.__clip(*self.__pending.pop(0)))
+
+        # Sonrası henüz gelmemiş klipler eldeki frame'lerle yazılır
+        with self.__lock:
+            for job in self.__pending:
+                self.__jobs.put(self.__clip(*job))
+            self.__pending = list()
+
+    def __clip(self, end, shot, name):
+        """
+        Returns:
+            (dosya adı, klipteki frame'lerin JPEG verileri) - yalnızca sıkıştırma thread'inden çağrılır
+        """
+        frames = list()
+        for number in range(max(0, shot - self.__pre), end + 1):
+            slot = number % self.__size
+            if self.__encoded_numbers[slot] == number:
+                frames.append(self.__encoded[slot])
+        return name, frames
+
+    def __export(self):
+        while True:
+            job = self.__jobs.get()
+            if job is None:
+                return
+
+            name, frames = job
+            os.makedirs(self.__path, exist_ok=True)
+            writer = None
+
+            for data in frames:
+                frame = cv2.imdecode(data, cv2.IMREAD_COLOR)
+
+                if writer is None:
+                    writer = cv2.VideoWriter('{}/{}{}'.format(self.__path, name, ClipConstants.EXTENSION),
+                                             cv2.VideoWriter_fourcc(*ClipConstants.FOURCC), self.__fps,
+                                             (frame.shape[1], frame.shape[0]))
+                writer.write(frame)
+
+            if writer is not None:
+                writer.release()
@@ -16,6 +16,9 @@ class MainUIConstants:
 
     SPACING_GRID_LAYOUT = 6
 
+    # Atış tablosu ve hedef görüntüsü saniyede en fazla bu kadar güncellenir
+    SHOT_REFRESH_HZ = 30
+
 
 class LabelCameraConstants:
     INIT_POINT_LABEL_CAMERA = QPoint(0, 0)
@@ -24,12 +27,40 @@ class LabelCameraConstants:
     SIZE_TARGET_MIN = QSize(480, 270)
     SIZE_TARGET_MAX = QSize(960, 540)
     SIZE_BULLET_HOLE = QSize(18, 18)
+    # Debug modunda atış halkalarının atıcıya göre rengi (RGBA)
+    SHOOTER_COLORS = ((240, 240, 160, 240), (160, 240, 160, 240), (160, 200, 240, 240), (240, 160, 240, 240))
+
+    # Yakınlaştırmada son kullanılan arka plan boyutları ve mip piramidinin en küçük seviyesi
+    BACKGROUND_CACHE_SIZE = 16
+    BACKGROUND_MIP_MIN_SIZE = 256
+    # Piramit kurulumu açılışla yarışmasın diye ertelenir
+    BACKGROUND_BUILD_DELAY_MS = 2000
+
+
+class ShotStoreConstants:
+    # Bellekte tutulan son atış sayısı; dolunca eski yarısı diske taşınır
+    WINDOW = 4096
+    # None ise sistemin geçici dizini
+    SPILL_DIRECTORY = None
+
+
+class HeatmapConstants:
+    # Izgara hücresi (etiket pikseli) ve Gauss çekirdeğinin hücre cinsinden standart sapması
+    CELL = 8
+    SIGMA = 1.5
+    # cv2.COLORMAP_<ad>
+    COLORMAP = 'JET'
+    # Düşük yoğunluklar da görünsün diye saydamlık yoğunluğun bu katı kadar artar
+    ALPHA_GAIN = 3
 
 
 class TableShotsConstants:
     INIT_POINT_TABLE_SHOTS = QPoint(970, 10)
 
-    SIZE_TABLE_SHOTS = QSize(300, 440)
+    SIZE_TABLE_SHOTS = QSize(300, 360)
+
+    INIT_POINT_LABEL_STATISTICS = QPoint(970, 375)
+    SIZE_LABEL_STATISTICS = QSize(300, 80)
 
 
 class CameraConstants:
@@ -40,6 +71,9 @@ class CameraConstants:
 
     DETECTION_DELAY_MS = 0.25
 
+    # GUI'nin boşaltmasını bekleyebilecek en fazla atış sayısı
+    SHOT_QUEUE_SIZE = 1024
+
 
 class DetectionConstants:
     LOWER_LEFT_RED = (0, 20, 20)
@@ -57,5 +91,211 @@ class DetectionConstants:
     MIN_ADAPTIVE = 20
     MIN_CONTOUR_AREA = 10
 
+    USE_CANNY = True
     CANNY_THRESHOLD1 = 30
     CANNY_THRESHOLD2 = 200
+
+    # 'red': sadece kırmızı kanal, 'red_minus_green': beyaz ışık/yansımalara karşı R - G
+    CHROMA_MODE = 'red'
+
+    # 'red': tek atıcı, noktalar kırmızı bantlarla doğrulanır. 'multi': her nokta renk tonuna göre
+    # COLOR_CLASSES'tan birine atanır (atıcı numarası = sınıfın sırası), tespit düzlemi kanalların en parlağıdır
+    COLOR_MODE = 'red'
+    # Her atıcı için HSV ton bantları (OpenCV ton aralığı 0-179): kırmızı, yeşil
+    COLOR_CLASSES = (((0, 10), (160, 179)), ((40, 85),))
+    # Sınıflandırmaya katılan piksellerin en düşük doygunluk ve parlaklığı
+    COLOR_MIN_SATURATION = 20
+    COLOR_MIN_VALUE = 20
+    # 'auto': açılışta ölçülen en hızlı yol, 'numpy': np.ndarray, 'umat': OpenCV T-API (OpenCL)
+    BACKEND = 'auto'
+    BACKEND_BENCHMARK_ROUNDS = 20
+
+    # Kaba-ince tespit: adaylar 2 ** PYRAMID_LEVELS kat küçültülmüş farkta aranır, eşikleme/doğrulama/merkez
+    # yalnızca adayların çevresindeki tam çözünürlüklü pencerelerde yapılır. PYRAMID_MIN_WIDTH'ten dar
+    # frame'lerde (veya PYRAMID_LEVELS = 0 iken) tam çözünürlüklü yol kullanılır
+    PYRAMID_LEVELS = 1
+    PYRAMID_MIN_WIDTH = 1600
+    # Küçültmede sönükleşen noktalar kaçmasın diye aday eşiği tam çözünürlük eşiğinin bu oranıdır
+    PYRAMID_CANDIDATE_RATIO = 0.5
+    # Tam çözünürlüklü pencerenin aday kutusu etrafındaki payı (piksel)
+    PYRAMID_MARGIN = 8
+    # Adaylar küçük frame'in bu oranından fazlasını kaplıyorsa (örn. ışık titremesi) kaba-ince yol
+    # PYRAMID_SUSPEND_FRAMES frame boyunca atlanır ve tam çözünürlüklü yol kullanılır
+    PYRAMID_MAX_CANDIDATE_RATIO = 0.01
+    PYRAMID_SUSPEND_FRAMES = 30
+
+
+class ServiceConstants:
+    HOST = '127.0.0.1'
+    PORT = 5555
+    UNIX_SOCKET_PATH = None
+
+    QUEUE_SIZE = 256
+    BACKLOG = 8
+
+    # GUI'den skor tablolarına yayın: atışlar anında, hedef görüntüsü (JPEG) ara sıra gönderilir
+    SCOREBOARD_PORT = 5556
+    KEYFRAME_INTERVAL_MS = 5000
+    KEYFRAME_SHOTS = 50
+    SNAPSHOT_WIDTH = 960
+    SNAPSHOT_QUALITY = 70
+
+
+class CalibrationConstants:
+    AUTO_FRAMES = 10
+    AUTO_TIMEOUT_S = 5
+
+    # Hedef dörtgeni en az frame alanının bu oranı kadar olmalı
+    MIN_AREA_RATIO = 0.1
+    APPROX_EPSILON = 0.02
+    OUTLIER_DISTANCE = 2.0
+
+    SUBPIX_WINDOW = (5, 5)
+    SUBPIX_ITERATIONS = 30
+    SUBPIX_EPSILON = 0.01
+
+    # Lens kalibrasyonu: iç köşe sayısı (sütun, satır) olan satranç tahtası
+    CHESSBOARD_SIZE = (9, 6)
+    LENS_FRAMES = 15
+    LENS_INTERVAL_S = 0.5
+    LENS_TIMEOUT_S = 120
+
+    # ArUco işaretçileri (varsa) sol üst, sağ üst, sağ alt, sol alt sırasıyla 0-3 ID'li olmalı
+    ARUCO_DICTIONARY = 'DICT_4X4_50'
+
+
+class RecorderConstants:
+    # Paylaşımlı bellekte aynı anda kodlanmayı bekleyebilecek frame sayısı
+    SLOTS = 64
+    FOURCC = 'MJPG'
+    EXTENSION = '.avi'
+
+
+class ClipConstants:
+    # Bellekte tutulan son frame'lerin süresi; PRE_S + POST_S'den uzun olmalı ki dışa aktarım yetişsin
+    BUFFER_S = 3.0
+    PRE_S = 1.0
+    POST_S = 0.5
+    # Sıkıştırma thread'ini bekleyen ham frame sayısı ve halkadaki JPEG kalitesi
+    STAGING_FRAMES = 8
+    JPEG_QUALITY = 90
+    FOURCC = 'MJPG'
+    EXTENSION = '.avi'
+
+
+class CaptureConstants:
+    # 'auto': Linux'ta kameralar için V4L2, video dosyaları için FFmpeg; ayrıca 'v4l2', 'ffmpeg', 'dshow', 'msmf', 'any'
+    BACKEND = 'auto'
+    # YUYV 1080p'de ~10 fps ile sınırlı; MJPG kameradan sıkıştırılmış gelir ve tam FPS'e ulaşır
+    FOURCC = 'MJPG'
+    # Sürücü kuyruğunda bekleyen eski frame'ler gecikme demektir
+    BUFFER_SIZE = 1
+    # None: otomatik pozlama
+    EXPOSURE = None
+    # CAP_PROP_AUTO_EXPOSURE için (manuel, otomatik) değerleri backend'e göre; listede olmayan backend'lerde
+    # pozlama ayarlanmaz
+    AUTO_EXPOSURE = {'V4L2': (1, 3), 'DSHOW': (0.25, 0.75), 'MSMF': (0, 1)}
+
+    SYNTHETIC_SOURCE = 'synthetic'
+
+
+class SchedulingConstants:
+    # Yakalama ve tespit thread'lerini ayrı çekirdeklere ata, OpenCV thread sayısını havuza göre ayarla
+    ENABLED = True
+    # Daha az çekirdekte atama yapılmaz: tespit havuzu en az iki çekirdek alamıyorsa atamasız daha hızlıdır
+    MIN_CORES = 4
+    # Rol başına nice değeri (negatif = daha yüksek öncelik; Linux'ta CAP_SYS_NICE gerekir)
+    NICE = {'capture': -5, 'detection': -2}
+
+
+class WatchdogConstants:
+    # Canlı kameralar takılmaya karşı izlenir ve arka planda yeniden açılır
+    ENABLED = True
+    # Bu süre içinde frame gelmezse kamera takılmış sayılır
+    DEADLINE_S = 0.5
+    # Ardışık bu kadar başarısız okuma da takılma sayılır; denemeler arasında FAILURE_DELAY_S beklenir
+    MAX_FAILURES = 5
+    FAILURE_DELAY_S = 0.01
+    # Takılmış cihazın kapatılması en fazla bu kadar beklenir
+    RELEASE_TIMEOUT_S = 0.5
+    # Yeniden açma denemeleri arasındaki bekleme (son değer tekrarlanır)
+    BACKOFF_S = (0.1, 0.25, 0.5, 1.0, 2.0)
+
+
+class ExposureConstants:
+    # Kapalı döngü pozlama/kazanç denetimi; kapalıysa kamera otomatik pozlamada kalır. Açıkken kamera
+    # manuel pozlamaya alınır; önce kameranın backend'inin UNITS'teki değerleri doğrulanmalıdır
+    ENABLED = False
+
+    # Kırmızı düzlemin hedef ortalama parlaklığı ve tolerans
+    TARGET_BACKGROUND = 60
+    TOLERANCE = 10
+    # Lazer kontrastı (fark görüntüsündeki tepe) bunun altındaysa hedef parlaklık MIN_BACKGROUND'a kadar düşer
+    MIN_CONTRAST = 80
+    MIN_BACKGROUND = 25
+    TARGET_STEP = 0.8
+
+    # Pozlama birimleri backend'e göre (capture.mode()['backend']): V4L2 exposure_time_absolute 100 µs
+    # birimindedir, DirectShow ve Media Foundation log2(saniye). Listede olmayan backend'lerde denetim kapalı kalır
+    UNITS = {
+        'V4L2': {'LOG_SCALE': False, 'INITIAL_EXPOSURE': 100, 'EXPOSURE_RANGE': (1, 1000)},
+        'DSHOW': {'LOG_SCALE': True, 'INITIAL_EXPOSURE': -6, 'EXPOSURE_RANGE': (-13, -1)},
+        'MSMF': {'LOG_SCALE': True, 'INITIAL_EXPOSURE': -6, 'EXPOSURE_RANGE': (-13, -1)},
+        'SYNTHETIC': {'LOG_SCALE': False, 'INITIAL_EXPOSURE': 100, 'EXPOSURE_RANGE': (1, 1000)},
+    }
+    EXPOSURE_STEP = 0.8
+    INITIAL_GAIN = 0
+    GAIN_RANGE = (0, 100)
+    GAIN_STEP = 5
+
+    # Ölçüm ortalaması ve ayar değişikliğinden sonra kameranın oturması için beklenen frame sayısı
+    MEASURE_FRAMES = 10
+    SETTLE_FRAMES = 5
+
+
+class SyntheticConstants:
+    BACKGROUND_PATH = 'images/target.png'
+
+    # Saniyedeki ortalama atış sayısı ve iki atış arasındaki en kısa süre
+    SHOT_RATE = 1.0
+    MIN_GAP_S = 0.3
+    # Lazer darbesinin görünür kaldığı süre
+    PULSE_MS = 30
+    SPOT_RADIUS = 4
+    SPOT_COLOR = (60, 60, 255)
+    # Atışların hedef kenarına en yakın mesafesi (piksel)
+    MARGIN = 20
+
+    # Piksel gürültüsünün standart sapması; gürültü NOISE_FRAMES farklı frame'den döngüyle eklenir
+    NOISE_SIGMA = 2.0
+    NOISE_FRAMES = 3
+    # Şebeke kaynaklı parlaklık dalgalanması: genlik (0.05 = %5) ve frekans
+    FLICKER = 0.0
+    FLICKER_HZ = 100
+    # Darbe süresince el titremesinden oluşan iz uzunluğu (piksel)
+    MOTION_BLUR = 0
+
+    SEED = 0
+
+    # Sentetik kaynakta pozlama/kazanç: parlaklık = pozlama / EXPOSURE_REFERENCE * (1 + kazanç / GAIN_REFERENCE)
+    EXPOSURE_REFERENCE = 100
+    GAIN_REFERENCE = 50
+
+
+class GovernorConstants:
+    # Yük = frame işleme süresi / frame bütçesi (tespit açıkken işçi sayısı kadar frame üst üste işlenebilir)
+    HIGH_LOAD = 0.9
+    LOW_LOAD = 0.5
+    # Seviye düşürmek hızlı, yükseltmek temkinli: art arda bu kadar frame eşiğin ötesinde kalmalı
+    DOWN_FRAMES = 15
+    UP_FRAMES = 180
+    SMOOTHING = 0.1
+
+    # Her seviye bir öncekinin üstüne eklenir; KERNEL_SIZE profildekinden büyükse yok sayılır
+    LEVELS = (
+        {},
+        {'USE_CANNY': False},
+        {'KERNEL_SIZE': (3, 3)},
+        {'SCALE': 0.5},
+        {'PREVIEW_EVERY': 2},
+    )
@@ -1,117 +1,491 @@
+import logging
+import threading
+import time
+
 # OpenCV kütüphanesi - görüntü işleme için
 import cv2
 # NumPy kütüphanesi - sayısal işlemler için
 import numpy as np
 
 # Tespit parametrelerini içeren sabitler sınıfı
-from modules.common.constants import DetectionConstants
+from modules.common.constants import CameraConstants, DetectionConstants
+
+logger = logging.getLogger(__name__)
+
+BACKEND_NUMPY = 'numpy'
+BACKEND_UMAT = 'umat'
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def chroma_plane(image, constants=DetectionConstants):
+    """
+    Tespitte kullanılan tek kanallı düzlemi çıkarır (bulanıklaştırma ve fark sadece bu düzlemde yapılır).
+
+    Args:
+        image: BGR formatında görüntü (np.ndarray veya cv2.UMat)
+        constants: Tespit sabitleri (DetectionConstants veya profilden türetilmiş alt sınıfı)
+
+    Returns:
+        Kırmızı kanal, CHROMA_MODE 'red_minus_green' ise doygun R - G farkı; COLOR_MODE 'multi' ise
+        farklı renkteki lazerler aynı düzlemde görünsün diye kanalların en parlağı
+    """
+    red = cv2.extractChannel(image, 2)
+    if constants.COLOR_MODE == 'multi':
+        return cv2.max(cv2.max(cv2.extractChannel(image, 0), cv2.extractChannel(image, 1)), red)
+    if constants.CHROMA_MODE == 'red_minus_green':
+        return cv2.subtract(red, cv2.extractChannel(image, 1))
+    return red
+
+
+def color_classes(constants=DetectionConstants):
+    """
+    Returns:
+        (sınıf başına ton bantları, en düşük doygunluk, en düşük parlaklık); 'red' modunda tek sınıf
+        (atıcı 0) kırmızı bantlardan oluşur
+    """
+    if constants.COLOR_MODE == 'multi':
+        return constants.COLOR_CLASSES, constants.COLOR_MIN_SATURATION, constants.COLOR_MIN_VALUE
+    bands = ((constants.LOWER_LEFT_RED[0], constants.UPPER_LEFT_RED[0]),
+             (constants.LOWER_RIGHT_RED[0], constants.UPPER_RIGHT_RED[0]))
+    return (bands,), constants.LOWER_LEFT_RED[1], constants.LOWER_LEFT_RED[2]
+
+
+def hue_table(classes):
+    """
+    Returns:
+        256 elemanlı ton -> sınıf tablosu (cv2.LUT için); hiçbir banda girmeyen tonlar len(classes)
+    """
+    table = np.full(256, len(classes), dtype=np.uint8)
+    for index, bands in enumerate(classes):
+        for low, high in bands:
+            table[int(low):int(high) + 1] = index
+    return table
+
+
+def _benchmark(wrap):
+    # Kamera çözünürlüğünde gürültülü iki frame ile çekirdeğin süresini ölç
+    shape = (CameraConstants.CAMERA_HEIGHT, CameraConstants.CAMERA_WIDTH, 3)
+    frames = [wrap(np.random.randint(0, 256, shape, dtype=np.uint8)) for _ in range(2)]
+    previous = cv2.GaussianBlur(chroma_plane(frames[0]), DetectionConstants.KERNEL_SIZE, DetectionConstants.SIGMA_X)
+
+    begin = time.perf_counter()
+    for _ in range(DetectionConstants.BACKEND_BENCHMARK_ROUNDS):
+        blurred = cv2.GaussianBlur(chroma_plane(frames[1]), DetectionConstants.KERNEL_SIZE,
+                                   DetectionConstants.SIGMA_X)
+        diff = cv2.absdiff(blurred, previous)
+        _, mask = cv2.threshold(diff, DetectionConstants.MIN_VALUE, DetectionConstants.MAX_VALUE, cv2.THRESH_OTSU)
+        # UMat kuyruğundaki işlerin bitmesini bekle
+        cv2.countNonZero(mask)
+    return time.perf_counter() - begin
+
+
+def select_backend():
+    """
+    Tespit çekirdeğinin çalışacağı yolu seçer ve sonucu süreç boyunca saklar.
+
+    BACKEND 'auto' ise OpenCL varsa np.ndarray ve UMat yolları kısa bir ölçümle karşılaştırılır.
+
+    Returns:
+        BACKEND_NUMPY veya BACKEND_UMAT
+    """
+    global _backend
+
+    with _backend_lock:
+        if _backend is not None:
+            return _backend
+
+        if DetectionConstants.BACKEND in (BACKEND_NUMPY, BACKEND_UMAT):
+            _backend = DetectionConstants.BACKEND
+        elif not cv2.ocl.haveOpenCL():
+            _backend = BACKEND_NUMPY
+        else:
+            cv2.ocl.setUseOpenCL(True)
+            try:
+                umat_time = _benchmark(cv2.UMat)
+            except cv2.error:
+                umat_time = float('inf')
+            numpy_time = _benchmark(lambda frame: frame)
+            _backend = BACKEND_UMAT if umat_time < numpy_time else BACKEND_NUMPY
+            logger.info('Detection backend benchmark: numpy %.2f ms, umat %.2f ms',
+                        1000 * numpy_time / DetectionConstants.BACKEND_BENCHMARK_ROUNDS,
+                        1000 * umat_time / DetectionConstants.BACKEND_BENCHMARK_ROUNDS)
+
+        logger.info('Detection backend: %s', _backend)
+        return _backend
+
+
+def otsu_thresholds(histograms):
+    """
+    Birden çok histogram için OTSU eşiğini tek seferde (vektörel) hesaplar.
+
+    Args:
+        histograms: (N, 256) boyutunda piksel sayıları
+
+    Returns:
+        (N,) boyutunda eşik değerleri (cv2.THRESH_OTSU ile aynı tanım)
+    """
+    probabilities = histograms / np.maximum(histograms.sum(axis=1, keepdims=True), 1)
+    levels = np.arange(histograms.shape[1], dtype=np.float64)
+
+    omega = np.cumsum(probabilities, axis=1)
+    mu = np.cumsum(probabilities * levels, axis=1)
+    mu_total = mu[:, -1:]
+
+    # Sınıflar arası varyans; tek sınıflı bölmeler (omega 0 veya 1) dışarıda bırakılır
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sigma = (mu_total * omega - mu) ** 2 / (omega * (1 - omega))
+    epsilon = np.finfo(np.float32).eps
+    sigma[(omega < epsilon) | (omega > 1 - epsilon)] = 0
+    return np.argmax(np.nan_to_num(sigma), axis=1)
 
 
 class Detection:
     """
     Lazer atış tespiti için görüntü işleme sınıfı.
-    Frame difference ve renk tespiti yöntemleriyle kırmızı lazer noktalarını algılar.
+    Frame difference ve renk tespiti yöntemleriyle lazer noktalarını algılar; COLOR_MODE 'multi' ise
+    her nokta renk tonuna göre bir atıcıya atanır (bir şeritte birden çok atıcı).
     """
     
-    def __init__(self):
-        # Önceki frame'in bulanık görüntüsünü saklar (hareket tespiti için)
+    def __init__(self, constants=DetectionConstants):
+        # Kamera profilinden yüklenen değerler DetectionConstants alt sınıfı olarak gelir
+        self.constants = constants
+
+        # Önceki frame'in bulanık kırmızı düzlemini saklar (hareket tespiti için)
         self.__blurred_previous_image = None
+        # Kaba-ince yol için önceki frame'in (tam çözünürlüklü, küçültülmüş) düzlemleri. Tespit işçileri
+        # nesneyi paylaştığından çift tek bir tuple olarak tek atamayla değiştirilir; yarısı eski kalamaz
+        self.__previous_pyramid = None
+        # Adaylar frame'in çoğunu kapladığında kaba-ince yolun atlanacağı kalan frame sayısı
+        self.__pyramid_suspended = 0
+        self.__suspend_lock = threading.Lock()
+        self.__use_umat = select_backend() == BACKEND_UMAT
+
+        # Renk sınıfları kalite seviyelerinde değişmez; ton tablosu bir kez kurulur
+        self.__classes, self.__saturation, self.__value = color_classes(constants)
+        self.__hue_table = hue_table(self.__classes)
 
-    @staticmethod
-    def __is_red(image):
+    def __classify(self, image, boxes):
         """
-        Verilen görüntü bölgesinin kırmızı renk içerip içermediğini kontrol eder.
-        
+        Kutuları renk sınıflarına atar. Renk dönüşümü bütün kutuları kapsayan bölgede bir kez yapılır;
+        her kutu ton tablosu (LUT) ve tek bir bincount ile sınıflandığından maliyet sınıf sayısıyla artmaz.
+
         Args:
-            image: BGR formatında görüntü bölgesi
-            
+            image: BGR görüntü (None ise doğrulama atlanır, bütün kutular atıcı 0)
+            boxes: [(x, y, genişlik, yükseklik), ...]
+
         Returns:
-            Kırmızı piksel sayısı (0 ise kırmızı değil)
+            Her kutu için en çok pikseli olan sınıfın numarası, hiçbir sınıfa uymuyorsa None
         """
+        if image is None:
+            return [0] * len(boxes)
+        if len(boxes) == 0:
+            return list()
+
+        classes = self.__classes
+        left = min(x for x, _, _, _ in boxes)
+        top = min(y for _, y, _, _ in boxes)
+        right = max(x + width for x, _, width, _ in boxes)
+        bottom = max(y + height for _, y, _, height in boxes)
+
         # BGR'den HSV renk uzayına dönüştür (renk tespiti için daha uygun)
-        hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
-        
-        # Sol kırmızı maske (0-10 derece arası Hue değerleri)
-        mask_left = cv2.inRange(hsv, DetectionConstants.LOWER_LEFT_RED, DetectionConstants.UPPER_LEFT_RED)
-        
-        # Sağ kırmızı maske (160-180 derece arası Hue değerleri)
-        # Not: HSV'de kırmızı renk 0 ve 180 derecede bulunur
-        mask_right = cv2.inRange(hsv, DetectionConstants.LOWER_RIGHT_RED, DetectionConstants.UPPER_RIGHT_RED)
-        
-        # İki maskeyi birleştir ve kırmızı piksel sayısını döndür
-        return np.count_nonzero((mask_left | mask_right))
+        hsv = cv2.cvtColor(image[top:bottom, left:right], cv2.COLOR_BGR2HSV)
+        labels = cv2.LUT(cv2.extractChannel(hsv, 0), self.__hue_table)
+        # Soluk ve gri pikseller hiçbir sınıfa sayılmaz
+        labels[cv2.inRange(hsv, (0, self.__saturation, self.__value), (255, 255, 255)) == 0] = len(classes)
 
-    def detect(self, image):
+        result = list()
+        for x, y, width, height in boxes:
+            region = labels[y - top:y - top + height, x - left:x - left + width]
+            counts = np.bincount(region.ravel(), minlength=len(classes) + 1)[:len(classes)]
+            result.append(int(np.argmax(counts)) if counts.max() > 0 else None)
+        return result
+
+    def __locate(self, image, boxes):
+        """
+        Returns:
+            (renk doğrulamasını geçen kutuların merkezleri [(x, y), ...], atıcı numaraları)
+        """
+        points = list()
+        shooters = list()
+        for (x, y, width, height), shooter in zip(boxes, self.__classify(image, boxes)):
+            if shooter is not None:
+                # Dikdörtgenin merkez noktasını hesapla ve listeye ekle
+                points.append((x + width // 2, (y + height // 2)))
+                shooters.append(shooter)
+        return points, shooters
+
+    def __find_boxes(self, mask_red, constants):
+        """
+        Eşiklenmiş fark maskesindeki yeterince büyük konturların çevreleyen dikdörtgenlerini bulur.
+
+        Args:
+            mask_red: İkili (0/255) fark maskesi
+            constants: Bu frame'in tespit sabitleri
+
+        Returns:
+            [(x, y, genişlik, yükseklik), ...]
+        """
+        # Canny kenar algılama sonrası contour (şekil) bulma (USE_CANNY kapalıysa doğrudan maskeden)
+        # RETR_EXTERNAL: Sadece dış konturları al
+        # CHAIN_APPROX_SIMPLE: Contour noktalarını sıkıştır (gereksiz noktaları at)
+        if constants.USE_CANNY:
+            mask_red = cv2.Canny(mask_red, constants.CANNY_THRESHOLD1, constants.CANNY_THRESHOLD2)
+        contours, _ = cv2.findContours(mask_red, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+        # Minimum alan kontrolü (gürültü filtreleme - 10 pikselden küçükleri atla)
+        # Contour etrafına dikdörtgen çiz ve koordinatlarını al
+        return [cv2.boundingRect(contour) for contour in contours
+                if cv2.contourArea(contour) > constants.MIN_CONTOUR_AREA]
+
+    def __find_points(self, mask_red, image, constants):
+        """
+        Eşiklenmiş fark maskesindeki konturların merkezlerini bulur.
+
+        Args:
+            mask_red: İkili (0/255) fark maskesi
+            image: Renk doğrulaması için BGR görüntü (None ise doğrulama atlanır)
+            constants: Bu frame'in tespit sabitleri
+
+        Returns:
+            (noktaların merkez koordinatları [(x, y), ...], her nokta için atıcı numarası)
+        """
+        # Dikdörtgen içindeki bölgenin gerçekten lazer renginde olup olmadığını kontrol et
+        # (Yanlış pozitif tespitleri engeller)
+        return self.__locate(image, self.__find_boxes(mask_red, constants))
+
+    def detect(self, image, constants=None):
         """
         Gelen frame'de lazer atış noktalarını tespit eder.
         
         Algoritma:
-        1. Gaussian blur ile gürültü azaltma
+        1. Kırmızı (veya R - G) düzlemini çıkarma ve sadece bu düzlemde Gaussian blur
         2. Önceki frame ile fark alma (hareket tespiti)
         3. Adaptive thresholding (otomatik eşikleme)
         4. Contour detection (şekil tespiti)
-        5. Kırmızı renk doğrulama
+        5. Renk doğrulama ve atıcı sınıflandırması
         6. Merkez nokta hesaplama
         
         Args:
             image: BGR formatında giriş görüntüsü
+            constants: Bu frame için tespit sabitleri (örn. governor seviyesinin sınıfı); verilmezse
+                self.constants. Sabitler çağrıyla gelir, paylaşılan nesne değiştirilmez; böylece bir
+                frame'in tespiti hep tek bir seviyenin değerleriyle yapılır
             
         Returns:
-            Tespit edilen lazer noktalarının merkez koordinatları [(x, y), ...]
+            (noktaların merkez koordinatları [(x, y), ...], her nokta için atıcı numarası, istatistikler).
+            İstatistikler pozlama denetimi içindir: {'background': düzlemin ortalama parlaklığı,
+            'contrast': atış bulunduysa fark görüntüsündeki tepe (lazer kontrastı), yoksa None}.
+            Sonuçlar nesnede saklanmaz; aynı nesneyi paylaşan işçiler birbirinin sonucunu ezmez.
+        """
+        # İki yol ayrı önceki frame tutar; yol değişince (örn. governor ölçeği) diğer yolun önceki
+        # frame'i eskidiği için silinir, aksi halde geri dönüldüğünde eski frame'le fark alınırdı
+        if constants is None:
+            constants = self.constants
+        if not (0 < constants.PYRAMID_LEVELS and constants.PYRAMID_MIN_WIDTH <= image.shape[1]):
+            self.__previous_pyramid = None
+            return self.__detect_plain(image, constants)
+
+        # Sayaç işçiler arasında kilitle azaltılır; her frame tam olarak bir kez sayılır
+        with self.__suspend_lock:
+            suspended = self.__pyramid_suspended
+            if suspended > 0:
+                self.__pyramid_suspended -= 1
+        if suspended > 0:
+            result = self.__detect_plain(image, constants)
+            if suspended == 1:
+                # Kaba-ince yol bir sonraki frame'de önceki frame'i kaybetmeden devam eder
+                self.__previous_pyramid = self.__pyramid_planes(image, constants)
+            return result
+
+        self.__blurred_previous_image = None
+        return self.__detect_pyramid(image, constants)
+
+    def __detect_plain(self, image, constants):
         """
-        # Gaussian blur uygula (5x5 kernel ile gürültü azaltma)
-        blurred_image = cv2.GaussianBlur(image, DetectionConstants.KERNEL_SIZE, DetectionConstants.SIGMA_X)
+        Tam çözünürlüklü yol: bütün frame bulanıklaştırılır ve önceki bulanık frame ile karşılaştırılır.
+        """
+        source = cv2.UMat(image) if self.__use_umat else image
+
+        # Önce tek kanal çıkarılır, Gaussian blur (5x5) üç kanal yerine sadece bu düzleme uygulanır
+        blurred_image = cv2.GaussianBlur(chroma_plane(source, constants), constants.KERNEL_SIZE,
+                                         constants.SIGMA_X)
+        stats = {'background': cv2.mean(blurred_image)[0], 'contrast': None}
 
         try:
-            # Önceki ve şimdiki frame arasındaki farkı al (sadece kırmızı kanal [:, :, 2])
+            # Önceki ve şimdiki kırmızı düzlem arasındaki farkı al
             # Bu sayede hareketi/atışı yakalayabiliriz
-            diff_red = cv2.absdiff(blurred_image, self.__blurred_previous_image)[:, :, 2]
+            diff_red = cv2.absdiff(blurred_image, self.__blurred_previous_image)
             
             # OTSU algoritması ile otomatik eşik değeri hesapla
             # Bu algoritma görüntü histogramına göre optimal eşik bulur
             adaptive, _ = cv2.threshold(diff_red,
-                                        DetectionConstants.MIN_VALUE,
-                                        DetectionConstants.MAX_VALUE,
+                                        constants.MIN_VALUE,
+                                        constants.MAX_VALUE,
                                         cv2.THRESH_OTSU)
             
             # Binary threshold uygula (adaptive ve MIN_ADAPTIVE'den büyük olanı kullan)
             # Eşik değerinden büyük pikseller 255, küçükler 0 olur
             _, mask_red = cv2.threshold(diff_red,
-                                        max(adaptive, DetectionConstants.MIN_ADAPTIVE),
-                                        DetectionConstants.MAX_VALUE,
+                                        max(adaptive, constants.MIN_ADAPTIVE),
+                                        constants.MAX_VALUE,
                                         cv2.THRESH_BINARY)
-            
-            # Canny kenar algılama sonrası contour (şekil) bulma
-            # RETR_EXTERNAL: Sadece dış konturları al
-            # CHAIN_APPROX_SIMPLE: Contour noktalarını sıkıştır (gereksiz noktaları at)
-            contours, _ = cv2.findContours(
-                cv2.Canny(mask_red, DetectionConstants.CANNY_THRESHOLD1, DetectionConstants.CANNY_THRESHOLD2),
-                cv2.RETR_EXTERNAL,
-                cv2.CHAIN_APPROX_SIMPLE)
-
-            # Tespit edilen noktaları saklamak için liste
-            points = list()
-            
-            # Her bir contour için işlem yap
-            for contour in contours:
-                # Minimum alan kontrolü (gürültü filtreleme - 10 pikselden küçükleri atla)
-                if cv2.contourArea(contour) > DetectionConstants.MIN_CONTOUR_AREA:
-                    # Contour etrafına dikdörtgen çiz ve koordinatlarını al
-                    x, y, width, height = cv2.boundingRect(contour)
-
-                    # Dikdörtgen içindeki bölgenin gerçekten kırmızı olup olmadığını kontrol et
-                    # (Yanlış pozitif tespitleri engeller)
-                    if self.__is_red(image[y:y + height, x:x + width]):
-                        # Dikdörtgenin merkez noktasını hesapla ve listeye ekle
-                        points.append((x + width // 2, (y + height // 2)))
-            
-            # Tespit edilen tüm noktaları döndür
-            return points
-            
+
+            points, shooters = self.__find_points(mask_red, image, constants)
+            if len(points) > 0:
+                stats['contrast'] = cv2.minMaxLoc(diff_red)[1]
+            return points, shooters, stats
+
         except cv2.error:
             # İlk frame'de veya hata durumunda boş liste döndür
-            return list()
+            return list(), list(), stats
             
         finally:
             # Bir sonraki tespit için şimdiki frame'i sakla
             self.__blurred_previous_image = blurred_image
+
+    def __pyramid_planes(self, image, constants):
+        plane = chroma_plane(image, constants)
+        # pyrDown küçültmeden önce 5x5 Gaussian uygular; ayrıca blur gerekmez
+        coarse = plane
+        for _ in range(constants.PYRAMID_LEVELS):
+            coarse = cv2.pyrDown(coarse)
+        return plane, coarse
+
+    def __detect_pyramid(self, image, constants):
+        """
+        Kaba-ince tespit: aday noktalar küçültülmüş fark görüntüsünde bulunur, eşikleme, renk
+        doğrulama ve merkez hesabı yalnızca adayların çevresindeki tam çözünürlüklü pencerelerde yapılır.
+        Pencereler bulanıklaştırma kenarından etkilenmeyecek kadar geniş tutulur. Sonuç tam çözünürlüklü
+        yola yakındır ama aynı değildir: OTSU eşiği küçültülmüş farkın histogramından hesaplanır ve
+        küçültmede aday eşiğinin altına düşen sönük noktalar kaçabilir.
+        """
+        plane, coarse = self.__pyramid_planes(image, constants)
+
+        previous = self.__previous_pyramid
+        self.__previous_pyramid = (plane, coarse)
+        stats = {'background': cv2.mean(coarse)[0], 'contrast': None}
+        if previous is None or previous[0].shape != plane.shape:
+            return list(), list(), stats
+        previous_plane, previous_coarse = previous
+
+        diff = cv2.absdiff(coarse, previous_coarse)
+        candidate_threshold = constants.MIN_ADAPTIVE * constants.PYRAMID_CANDIDATE_RATIO
+        # Hareket yoksa (en sık durum) OTSU ve kontur aramaya gerek yok
+        if diff.max() <= candidate_threshold:
+            return list(), list(), stats
+
+        adaptive, _ = cv2.threshold(diff, constants.MIN_VALUE, constants.MAX_VALUE, cv2.THRESH_OTSU)
+        threshold = max(adaptive, constants.MIN_ADAPTIVE)
+        _, candidates = cv2.threshold(diff, threshold * constants.PYRAMID_CANDIDATE_RATIO,
+                                      constants.MAX_VALUE, cv2.THRESH_BINARY)
+
+        factor = 2 ** constants.PYRAMID_LEVELS
+        pad = constants.PYRAMID_MARGIN + max(constants.KERNEL_SIZE)
+        height, width = plane.shape[:2]
+
+        if cv2.countNonZero(candidates) > constants.PYRAMID_MAX_CANDIDATE_RATIO * candidates.size:
+            # Adaylar frame'in çoğunu kaplıyor (örn. ışık titremesi): pencereler bütün frame'e yayılır ve
+            # düz yoldan pahalı olur. Bu frame ve sonraki PYRAMID_SUSPEND_FRAMES frame düz yolla işlenir
+            with self.__suspend_lock:
+                self.__pyramid_suspended = constants.PYRAMID_SUSPEND_FRAMES
+            self.__previous_pyramid = None
+            previous = cv2.GaussianBlur(previous_plane, constants.KERNEL_SIZE, constants.SIGMA_X)
+            self.__blurred_previous_image = cv2.UMat(previous) if self.__use_umat else previous
+            return self.__detect_plain(image, constants)
+
+        contours, _ = cv2.findContours(candidates, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        boxes = list()
+        for contour in contours:
+            x, y, box_width, box_height = cv2.boundingRect(contour)
+            boxes.append((max(x * factor - pad, 0), max(y * factor - pad, 0),
+                          min((x + box_width) * factor + pad, width), min((y + box_height) * factor + pad, height)))
+
+        blobs = list()
+        for left, top, right, bottom in boxes:
+            window = (slice(top, bottom), slice(left, right))
+            diff_window = cv2.absdiff(
+                cv2.GaussianBlur(plane[window], constants.KERNEL_SIZE, constants.SIGMA_X),
+                cv2.GaussianBlur(previous_plane[window], constants.KERNEL_SIZE, constants.SIGMA_X))
+            _, mask_red = cv2.threshold(diff_window, threshold, constants.MAX_VALUE, cv2.THRESH_BINARY)
+
+            for x, y, box_width, box_height in self.__find_boxes(mask_red, constants):
+                blob = (left + x, top + y, box_width, box_height)
+                # Yakın adayların pencereleri örtüşebilir
+                if blob not in blobs:
+                    blobs.append(blob)
+
+        # Renk sınıflandırması bütün pencerelerin kutuları için tek seferde yapılır
+        points, shooters = self.__locate(image, blobs)
+        if len(points) > 0:
+            stats['contrast'] = float(diff.max())
+        return points, shooters, stats
+
+    def detect_batch(self, frames):
+        """
+        Birden çok frame'i tek çağrıda işler (kayıtların yeniden puanlanması ve yüksek FPS için).
+
+        Fark, histogram/OTSU eşiği ve eşikleme tüm frame'ler için vektörel yapılır; kontur
+        aşaması sadece eşiği geçen piksel bulunan frame'lerde çalışır. Önceki frame durumu
+        detect() ile paylaşılır.
+
+        Args:
+            frames: (N, H, W) kırmızı düzlemler veya (N, H, W, 3) BGR frame'ler (ring buffer görünümü olabilir).
+                BGR verilirse renk doğrulaması da yapılır (atıcı numaraları döndürülmez).
+
+        Returns:
+            Her frame için (k, 2) boyutunda int32 nokta dizisi içeren liste
+        """
+        frames = np.asarray(frames)
+        images = frames if frames.ndim == 4 else None
+        if images is not None:
+            planes = chroma_plane(frames.reshape(-1, frames.shape[2], 3), self.constants).reshape(frames.shape[:3])
+        else:
+            planes = frames
+        count, height, width = planes.shape
+
+        blurred = np.empty_like(planes)
+        for index in range(count):
+            cv2.GaussianBlur(planes[index], self.constants.KERNEL_SIZE, self.constants.SIGMA_X,
+                             dst=blurred[index])
+
+        previous = self.__blurred_previous_image
+        if isinstance(previous, cv2.UMat):
+            previous = previous.get()
+        self.__blurred_previous_image = cv2.UMat(blurred[-1]) if self.__use_umat else blurred[-1].copy()
+
+        results = [np.empty((0, 2), dtype=np.int32) for _ in range(count)]
+        if previous is None or previous.shape != (height, width):
+            # İlk frame'in karşılaştırılacağı önceki frame yok
+            first = 1
+            previous = blurred[0]
+        else:
+            first = 0
+        if first >= count:
+            return results
+
+        # Tüm farklar tek çağrıda: frame i, frame i - 1 ile karşılaştırılır
+        shifted = np.concatenate((previous[np.newaxis], blurred[first:-1])) if count - first > 1 else \
+            previous[np.newaxis]
+        diffs = cv2.absdiff(blurred[first:].reshape(-1, width), shifted.reshape(-1, width)) \
+            .reshape(count - first, height, width)
+
+        # Eşik en az MIN_ADAPTIVE olduğundan, en büyük farkı bunu geçmeyen frame'lerde nokta olamaz;
+        # histogram ve kontur aşamaları sadece kalan frame'ler için çalışır
+        active = np.flatnonzero(diffs.reshape(len(diffs), -1).max(axis=1) > self.constants.MIN_ADAPTIVE)
+        if len(active) == 0:
+            return results
+
+        histograms = np.stack([cv2.calcHist([diffs[offset]], [0], None, [256], [0, 256]).ravel()
+                               for offset in active])
+        thresholds = np.maximum(otsu_thresholds(histograms), self.constants.MIN_ADAPTIVE)
+
+        for offset, threshold in zip(active, thresholds):
+            index = first + offset
+            _, mask_red = cv2.threshold(diffs[offset], float(threshold), self.constants.MAX_VALUE,
+                                        cv2.THRESH_BINARY)
+            points, _ = self.__find_points(mask_red, None if images is None else images[index], self.constants)
+            if len(points) > 0:
+                results[index] = np.array(points, dtype=np.int32)
+        return results
@@ -0,0 +1,121 @@
+import logging
+
+from modules.common.constants import ExposureConstants
+
+logger = logging.getLogger(__name__)
+
+
+class ExposureController:
+    """
+    Pozlama ve kazancı, tespitin kırmızı düzlem istatistiklerine göre kapalı döngüde ayarlar.
+
+    Hedef, arka planı karanlık tutup lazer noktasını belirgin bırakmaktır. Arka plan parlaklığı
+    MEASURE_FRAMES boyunca ortalanır; hedef aralığın üstündeyse önce kazanç (gürültü kaynağı), sonra
+    pozlama düşürülür, altındaysa önce pozlama, sonra kazanç artırılır. Atış görülüp lazer kontrastı
+    MIN_CONTRAST altında kalırsa hedef parlaklık MIN_BACKGROUND'a kadar düşürülür. Her değişiklikten
+    sonra kameranın yeni ayara geçmesi için SETTLE_FRAMES beklenir; bu sırada parlaklık sıçraması fark
+    görüntüsünde atış gibi görünebileceğinden tespitler yok sayılmalıdır (settling).
+
+    Pozlama birimleri kaynağın backend'ine göre UNITS'ten alınır. Kaynak pozlama ayarını desteklemiyorsa
+    (video dosyası) veya backend'in birimleri bilinmiyorsa denetleyici devre dışı kalır.
+    """
+
+    def __init__(self, capture, exposure=None, gain=ExposureConstants.INITIAL_GAIN):
+        self.__capture = capture
+        self.__units = ExposureConstants.UNITS.get(capture.mode()['backend'])
+        if exposure is None and self.__units is not None:
+            exposure = self.__units['INITIAL_EXPOSURE']
+        self.exposure = exposure
+        self.gain = gain
+        self.target = ExposureConstants.TARGET_BACKGROUND
+
+        self.enabled = ExposureConstants.ENABLED and self.__units is not None and capture.set_exposure(exposure)
+        if self.enabled:
+            capture.set_gain(gain)
+
+        self.__samples = 0
+        self.__background = 0.0
+        self.__contrast = None
+        self.__settle = ExposureConstants.SETTLE_FRAMES
+
+    @property
+    def settling(self):
+        return self.enabled and self.__settle > 0
+
+    def observe(self, background, contrast=None):
+        """
+        Args:
+            background: Kırmızı düzlemin ortalama parlaklığı (0-255)
+            contrast: Bu frame'de atış varsa lazer noktasının fark görüntüsündeki tepe değeri
+
+        Returns:
+            Pozlama veya kazanç değiştiyse True
+        """
+        if not self.enabled or background is None:
+            return False
+        if self.__settle > 0:
+            self.__settle -= 1
+            return False
+
+        self.__samples += 1
+        self.__background += background
+        if contrast is not None:
+            self.__contrast = contrast if self.__contrast is None else min(self.__contrast, contrast)
+        if self.__samples < ExposureConstants.MEASURE_FRAMES:
+            return False
+
+        background = self.__background / self.__samples
+        self.__update_target(self.__contrast)
+        self.__samples = 0
+        self.__background = 0.0
+        self.__contrast = None
+
+        if background > self.target + ExposureConstants.TOLERANCE:
+            changed = self.__darker()
+        elif background < self.target - ExposureConstants.TOLERANCE:
+            changed = self.__brighter()
+        else:
+            return False
+
+        if changed:
+            logger.debug('Exposure %s gain %s (background %.1f, target %.1f)',
+                         self.exposure, self.gain, background, self.target)
+            self.__settle = ExposureConstants.SETTLE_FRAMES
+        return changed
+
+    def __update_target(self, contrast):
+        if contrast is None:
+            return
+        if contrast < ExposureConstants.MIN_CONTRAST:
+            self.target = max(ExposureConstants.MIN_BACKGROUND, self.target * ExposureConstants.TARGET_STEP)
+        elif contrast > 2 * ExposureConstants.MIN_CONTRAST:
+            self.target = min(ExposureConstants.TARGET_BACKGROUND, self.target / ExposureConstants.TARGET_STEP)
+
+    def __step_exposure(self, direction):
+        # LOG_SCALE: pozlama log2(saniye) birimindedir (DirectShow), aksi halde süreyle orantılıdır (V4L2)
+        if self.__units['LOG_SCALE']:
+            value = self.exposure + direction
+        else:
+            value = self.exposure * ExposureConstants.EXPOSURE_STEP ** -direction
+        low, high = self.__units['EXPOSURE_RANGE']
+        value = min(max(value, low), high)
+        if value == self.exposure:
+            return False
+        self.exposure = value
+        self.__capture.set_exposure(value)
+        return True
+
+    def __step_gain(self, direction):
+        low, high = ExposureConstants.GAIN_RANGE
+        value = min(max(self.gain + direction * ExposureConstants.GAIN_STEP, low), high)
+        if value == self.gain:
+            return False
+        self.gain = value
+        self.__capture.set_gain(value)
+        return True
+
+    def __darker(self):
+        return self.__step_gain(-1) or self.__step_exposure(-1)
+
+    def __brighter(self):
+        return self.__step_exposure(1) or self.__step_gain(1)
@@ -12,6 +12,13 @@ class Filer:
         with open(path) as json_file:
             return json.load(json_file)
 
+    def session_path(self):
+        if not os.path.exists(self.data_path):
+            os.mkdir(self.data_path)
+        path = '{}/{}'.format(self.data_path, datetime.now().strftime("%Y%m%d-%H%M%S"))
+        os.makedirs(path, exist_ok=True)
+        return path
+
     def write_to_file(self, image, data):
         if not os.path.exists(self.data_path):
             os.mkdir(self.data_path)
@@ -0,0 +1,77 @@
+import logging
+
+from modules.common.constants import GovernorConstants
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'SCALE': 1.0,
+    'PREVIEW_EVERY': 1,
+}
+
+
+class QualityGovernor:
+    """
+    Frame işleme süresini frame bütçesiyle karşılaştırıp kalite seviyesini otomatik ayarlar.
+
+    Yük (süre / bütçe) üstel ortalamayla izlenir. DOWN_FRAMES boyunca HIGH_LOAD üstünde kalırsa bir
+    seviye düşülür (daha ucuz tespit), UP_FRAMES boyunca LOW_LOAD altında kalırsa bir seviye çıkılır.
+    Her geçiş loglanır; geçerli seviye level, ayarları settings ile okunur.
+    """
+
+    def __init__(self, frame_budget, levels=GovernorConstants.LEVELS):
+        self.__frame_budget = frame_budget
+        self.__levels = levels
+        self.__load = 0.0
+        self.__over = 0
+        self.__under = 0
+
+        self.level = 0
+        self.settings = self.settings_at(0)
+
+    @property
+    def load(self):
+        return self.__load
+
+    @property
+    def max_level(self):
+        return len(self.__levels) - 1
+
+    def settings_at(self, level):
+        settings = dict(DEFAULTS)
+        for overrides in self.__levels[:level + 1]:
+            settings.update(overrides)
+        return settings
+
+    def observe(self, seconds, depth=1):
+        """
+        Args:
+            seconds: Bir frame'in işlenme süresi (tespit açıkken işçinin ölçtüğü tespit süresi)
+            depth: Aynı anda işlenebilen frame sayısı (tespit işçisi sayısı)
+
+        Returns:
+            Seviye değiştiyse True
+        """
+        load = seconds / (self.__frame_budget * depth)
+        self.__load += GovernorConstants.SMOOTHING * (load - self.__load)
+
+        self.__over = self.__over + 1 if self.__load > GovernorConstants.HIGH_LOAD else 0
+        self.__under = self.__under + 1 if self.__load < GovernorConstants.LOW_LOAD else 0
+
+        if self.__over >= GovernorConstants.DOWN_FRAMES and self.level < self.max_level:
+            self.__change(self.level + 1)
+            logger.warning('Processing load %.2f over budget, quality level %d -> %d %s',
+                           self.__load, self.level - 1, self.level, self.settings)
+            return True
+        if self.__under >= GovernorConstants.UP_FRAMES and self.level > 0:
+            self.__change(self.level - 1)
+            logger.info('Processing load %.2f back under budget, quality level %d -> %d',
+                        self.__load, self.level + 1, self.level)
+            return True
+        return False
+
+    def __change(self, level):
+        self.level = level
+        self.settings = self.settings_at(level)
+        self.__over = 0
+        self.__under = 0
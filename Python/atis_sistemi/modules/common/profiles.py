@@ -0,0 +1,114 @@
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+
+import numpy as np
+
+from modules.common.constants import DetectionConstants
+
+# Profil GUI thread'inden ve kalibrasyon işçilerinden kaydedilir; oku-değiştir-yaz adımları sıralanır
+_save_lock = threading.Lock()
+
+
+def _replace(path, mode, write):
+    """
+    Yarım yazılmış dosya bırakmamak için önce geçici dosyaya yazar, sonra yerine taşır. Her kayıt
+    kendi geçici dosyasını kullanır; eşzamanlı kayıtlar birbirinin dosyasını ezmez.
+    """
+    handle, temporary = tempfile.mkstemp(prefix=os.path.basename(path) + '.', suffix='.tmp',
+                                         dir=os.path.dirname(path))
+    try:
+        with os.fdopen(handle, mode) as outfile:
+            write(outfile)
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+
+def camera_key(camera_id):
+    """
+    Kamera indeksi veya video dosyası yolundan profil klasörü adı üretir.
+    """
+    if isinstance(camera_id, int):
+        return 'camera{}'.format(camera_id)
+    if not isinstance(camera_id, str):
+        # Doğrudan verilen Capture nesneleri (örn. SyntheticCapture) sınıf adıyla anılır
+        return type(camera_id).__name__
+    return re.sub(r'[^A-Za-z0-9_.-]', '_', os.path.basename(str(camera_id)))
+
+
+def detection_constants(values):
+    """
+    Profildeki tespit değerleriyle DetectionConstants'ın alt sınıfını oluşturur.
+    Profilde olmayan değerler DetectionConstants'tan gelir.
+    """
+    overrides = dict()
+    for name, value in values.items():
+        if hasattr(DetectionConstants, name):
+            default = getattr(DetectionConstants, name)
+            # JSON listeleri, OpenCV'nin beklediği tuple'lara geri çevrilir
+            overrides[name] = tuple(value) if isinstance(default, tuple) else value
+    return type('DetectionProfile', (DetectionConstants,), overrides)
+
+
+class ProfileStore:
+    """
+    Kamera başına profil deposu: profiles/<kamera>/profile.json içinde bölümler halinde saklanır.
+    Remap tabloları, maskeler gibi büyük diziler aynı klasörde .npy olarak tutulur ve açılışta
+    bellek eşlemeli (mmap) okunur; böylece yeniden hesaplama gerekmez.
+    """
+
+    def __init__(self):
+        self.profiles_path = os.getcwd() + '/profiles'
+
+    def path(self, key):
+        return '{}/{}'.format(self.profiles_path, key)
+
+    def load(self, key):
+        path = '{}/profile.json'.format(self.path(key))
+        if not os.path.exists(path):
+            return dict()
+        with open(path) as json_file:
+            return json.load(json_file)
+
+    def save(self, key, section, data):
+        os.makedirs(self.path(key), exist_ok=True)
+
+        with _save_lock:
+            profile = self.load(key)
+            profile[section] = data
+            _replace('{}/profile.json'.format(self.path(key)), 'w',
+                     lambda outfile: json.dump(profile, outfile, indent=2))
+
+    def save_array(self, key, name, array):
+        os.makedirs(self.path(key), exist_ok=True)
+
+        array = np.ascontiguousarray(array)
+        _replace('{}/{}.npy'.format(self.path(key), name), 'wb', lambda outfile: np.save(outfile, array))
+
+    def load_array(self, key, name):
+        path = '{}/{}.npy'.format(self.path(key), name)
+        if not os.path.exists(path):
+            return None
+        return np.load(path, mmap_mode='r')
+
+    def remove_array(self, key, name):
+        path = '{}/{}.npy'.format(self.path(key), name)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def save_file(self, key, name, source_path):
+        """
+        Dosyayı (örn. hedef arka planı) profil klasörüne kopyalar ve yeni yolunu döndürür.
+        """
+        os.makedirs(self.path(key), exist_ok=True)
+
+        path = '{}/{}{}'.format(self.path(key), name, os.path.splitext(source_path)[1].lower())
+        if os.path.abspath(source_path) != os.path.abspath(path):
+            shutil.copyfile(source_path, path)
+        return path
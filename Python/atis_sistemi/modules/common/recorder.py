@@ -0,0 +1,129 @@
+import json
+import multiprocessing
+import queue
+import struct
+import threading
+import time
+from collections import deque
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+
+from modules.common.constants import RecorderConstants
+
+TIMESTAMP = struct.Struct('<d')
+
+
+def _encode(shm_name, shape, path, fps, tasks, freed):
+    """
+    Kayıt süreci: paylaşımlı bellekteki frame'leri kodlar, frame zaman damgalarını ve atışları indeksler.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    frames = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+
+    writer = cv2.VideoWriter(path + RecorderConstants.EXTENSION,
+                             cv2.VideoWriter_fourcc(*RecorderConstants.FOURCC), fps, (shape[2], shape[1]))
+    # Video frame'i n'in zaman damgası n * 8. byte'ta: zamana göre arama dosya okumadan hesaplanabilir
+    timestamps = open(path + '.timestamps', 'wb')
+    shots = open(path + '.shots.jsonl', 'w')
+
+    # Yakalama frame numarası -> video frame numarası (düşen frame'ler videoda yer almaz)
+    recorded = deque(maxlen=RecorderConstants.SLOTS * 4)
+    video_frame = 0
+
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+
+        if task[0] == 'frame':
+            _, slot, capture_frame, timestamp = task
+            writer.write(frames[slot])
+            freed.put(slot)
+
+            timestamps.write(TIMESTAMP.pack(timestamp))
+            recorded.append((capture_frame, video_frame))
+            video_frame += 1
+        elif task[0] == 'shot':
+            _, capture_frame, x, y, label, shooter = task
+            # Atışı üreten frame'e (veya ondan önceki son kaydedilen frame'e) bağla
+            linked = max((video for capture, video in recorded if capture <= capture_frame), default=0)
+            shots.write(json.dumps({'frame': linked, 'x': int(x), 'y': int(y), 'time': label,
+                                    'shooter': shooter}) + '\n')
+            shots.flush()
+
+    writer.release()
+    timestamps.close()
+    shots.close()
+    shm.close()
+
+
+class SessionRecorder:
+    """
+    Perspektifi düzeltilmiş frame'leri ayrı bir süreçte video olarak kaydeder.
+
+    Frame'ler önceden ayrılmış paylaşımlı bellek yuvalarına kopyalanır, kodlama süreci yuvayı
+    bitirince geri verir. Boş yuva yoksa frame düşürülür (dropped), kamera döngüsü hiç beklemez.
+    Atışlar video frame numarasıyla <path>.shots.jsonl dosyasına yazılır; doğrudan o frame'e
+    (CAP_PROP_POS_FRAMES) atlanabilir.
+    """
+
+    def __init__(self, path, width, height, fps, slots=RecorderConstants.SLOTS):
+        shape = (slots, height, width, 3)
+        self.__shm = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)))
+        self.__frames = np.ndarray(shape, dtype=np.uint8, buffer=self.__shm.buf)
+        self.__free = deque(range(slots))
+
+        self.__tasks = multiprocessing.Queue()
+        self.__freed = multiprocessing.Queue()
+        self.__process = multiprocessing.Process(target=_encode, name='SessionRecorder', daemon=True,
+                                                 args=(self.__shm.name, shape, path, fps, self.__tasks, self.__freed))
+        self.__process.start()
+
+        # close() başka bir thread'den çağrılabilir; yazma sırasında bellek serbest bırakılmamalı
+        self.__lock = threading.Lock()
+        self.__closed = False
+
+        self.path = path
+        self.frames = 0
+        self.dropped = 0
+
+    def __reclaim(self):
+        while True:
+            try:
+                self.__free.append(self.__freed.get_nowait())
+            except queue.Empty:
+                return
+
+    def write(self, frame, capture_frame):
+        with self.__lock:
+            if self.__closed:
+                return
+            if len(self.__free) == 0:
+                self.__reclaim()
+            if len(self.__free) == 0 or frame.shape != self.__frames.shape[1:]:
+                self.dropped += 1
+                return
+
+            slot = self.__free.popleft()
+            np.copyto(self.__frames[slot], frame)
+            self.__tasks.put(('frame', slot, capture_frame, time.time()))
+            self.frames += 1
+
+    def mark_shot(self, capture_frame, point, label, shooter=0):
+        with self.__lock:
+            if not self.__closed:
+                self.__tasks.put(('shot', capture_frame, point[0], point[1], label, shooter))
+
+    def close(self):
+        with self.__lock:
+            if self.__closed:
+                return
+            self.__closed = True
+
+        self.__tasks.put(None)
+        self.__process.join()
+        self.__frames = None
+        self.__shm.close()
+        self.__shm.unlink()
@@ -0,0 +1,151 @@
+"""
+İş parçacığı zamanlaması: yakalama ve tespit thread'leri için çekirdek ataması ve öncelik.
+
+Kullanılabilir çekirdekler rollere bölünür: ilk çekirdek GUI ve işletim sistemi için boş bırakılır,
+sonraki yakalama döngüsüne, kalanlar tespit havuzuna verilir. Tespit havuzu çekirdek başına bir işçiyle
+kurulur ve OpenCV'nin kendi thread havuzu buna göre küçültülür; böylece işçi sayısı x OpenCV thread'i
+çekirdek sayısını aşmaz. Çekirdek MIN_CORES'tan azsa atama yapılmaz.
+
+Yalnızca yakalama ve tespit için açılan thread'ler atanır. GUI thread'i atanmaz, çünkü ondan açılan
+thread ve süreçler (kayıt, kalibrasyon, sunucu) çekirdek maskesini miras alır.
+
+Öncelik yükseltmek Linux'ta CAP_SYS_NICE gerektirir; izin yoksa bir kez loglanır ve varsayılan
+öncelikle devam edilir. Çekirdek ataması desteklenmeyen sistemlerde (macOS) yalnızca havuz boyutu uygulanır.
+"""
+
+import logging
+import os
+import sys
+import threading
+
+from modules.common.constants import SchedulingConstants
+
+logger = logging.getLogger(__name__)
+
+ROLE_CAPTURE = 'capture'
+ROLE_DETECTION = 'detection'
+
+# nice üst sınırı -> Windows SetThreadPriority değeri (HIGHEST, ABOVE_NORMAL, NORMAL)
+_WINDOWS_PRIORITIES = ((-5, 2), (-1, 1), (19, 0))
+
+_plan = None
+_plan_lock = threading.Lock()
+_warned = set()
+
+
+def available_cores():
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def make_plan(cores, enabled=SchedulingConstants.ENABLED):
+    """
+    Args:
+        cores: Kullanılabilir çekirdek numaraları
+
+    Returns:
+        {'capture', 'detection': çekirdek listeleri (boşsa atama yapılmaz),
+         'workers': tespit havuzu boyutu, 'opencv_threads': cv2.setNumThreads değeri}
+    """
+    if not enabled or len(cores) < SchedulingConstants.MIN_CORES:
+        # Eski davranış: havuz çekirdek sayısından bir eksik, OpenCV varsayılanında
+        return {ROLE_CAPTURE: [], ROLE_DETECTION: [], 'workers': max(1, len(cores) - 1), 'opencv_threads': None}
+
+    # İlk çekirdek GUI ve işletim sistemi için boş kalır
+    capture, detection = cores[1:2], cores[2:]
+    workers = len(detection)
+    return {
+        ROLE_CAPTURE: capture,
+        ROLE_DETECTION: detection,
+        'workers': workers,
+        # Paralellik havuzdan gelir; OpenCV her işçide tek thread kullanır
+        'opencv_threads': 1,
+    }
+
+
+def plan():
+    """
+    Süreç için bir kez hesaplanan zamanlama planı.
+    """
+    with _plan_lock:
+        if _plan is None:
+            _configure(SchedulingConstants.ENABLED)
+        return _plan
+
+
+def configure(enabled):
+    """
+    Planı yeniden hesaplar (örn. zamanlamalı ve zamanlamasız karşılaştırmalı ölçüm için).
+    """
+    with _plan_lock:
+        return _configure(enabled)
+
+
+def _configure(enabled):
+    global _plan
+
+    _plan = make_plan(available_cores(), enabled)
+    logger.info('Thread scheduling plan: %s', _plan)
+    return _plan
+
+
+def configure_opencv(schedule):
+    if schedule['opencv_threads'] is not None:
+        import cv2
+
+        cv2.setNumThreads(schedule['opencv_threads'])
+
+
+def _warn_once(key, message, *args):
+    if key not in _warned:
+        _warned.add(key)
+        logger.warning(message, *args)
+
+
+def _set_affinity(cores):
+    if hasattr(os, 'sched_setaffinity'):
+        # Linux'ta pid 0 yalnızca çağıran thread'i etkiler
+        os.sched_setaffinity(0, cores)
+    elif sys.platform == 'win32':
+        import ctypes
+
+        kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+        mask = sum(1 << core for core in cores)
+        if kernel32.SetThreadAffinityMask(kernel32.GetCurrentThread(), mask) == 0:
+            raise OSError(ctypes.get_last_error(), 'SetThreadAffinityMask failed')
+
+
+def _set_priority(nice):
+    if sys.platform == 'win32':
+        import ctypes
+
+        priority = next(value for limit, value in _WINDOWS_PRIORITIES if nice <= limit)
+        kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+        if not kernel32.SetThreadPriority(kernel32.GetCurrentThread(), priority):
+            raise OSError(ctypes.get_last_error(), 'SetThreadPriority failed')
+    elif hasattr(os, 'setpriority'):
+        # Linux'ta nice değeri thread bazındadır (tid)
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), nice)
+
+
+def pin_current_thread(role):
+    """
+    Çağıran thread'i rolünün çekirdeklerine atar ve önceliğini ayarlar; hata durumunda yalnızca loglar.
+    """
+    schedule = plan()
+    cores = schedule[role]
+    if len(cores) == 0:
+        return
+
+    try:
+        _set_affinity(cores)
+    except OSError as error:
+        _warn_once(('affinity', role), 'Could not pin %s thread to cores %s: %s', role, cores, error)
+
+    nice = SchedulingConstants.NICE[role]
+    if nice != 0:
+        try:
+            _set_priority(nice)
+        except OSError as error:
+            _warn_once(('priority', role), 'Could not set %s thread priority to %d: %s', role, nice, error)
@@ -0,0 +1,45 @@
+class ShotQueue:
+    """
+    Tek üretici (kamera thread'i) / tek tüketici (GUI thread'i) için kilitsiz, sınırlı halka kuyruk.
+
+    Üretici yalnızca tail'i, tüketici yalnızca head'i ilerletir; tamsayı atamaları GIL altında
+    atomik olduğundan kilit gerekmez. Kuyruk doluysa yeni atış düşürülür ve dropped artar.
+    """
+
+    def __init__(self, capacity):
+        # Bir yuva boş bırakılır: head == tail boş, tail + 1 == head dolu demektir
+        self.__slots = [None] * (capacity + 1)
+        self.__head = 0
+        self.__tail = 0
+
+        self.dropped = 0
+
+    def put(self, item):
+        tail = self.__tail
+        following = (tail + 1) % len(self.__slots)
+        if following == self.__head:
+            self.dropped += 1
+            return False
+
+        self.__slots[tail] = item
+        self.__tail = following
+        return True
+
+    def drain(self):
+        """
+        Returns:
+            Kuyruktaki bütün öğeler (eskiden yeniye)
+        """
+        head, tail = self.__head, self.__tail
+        if head <= tail:
+            items = self.__slots[head:tail]
+        else:
+            items = self.__slots[head:] + self.__slots[:tail]
+
+        for index in range(len(items)):
+            self.__slots[(head + index) % len(self.__slots)] = None
+        self.__head = tail
+        return items
+
+    def __len__(self):
+        return (self.__tail - self.__head) % len(self.__slots)
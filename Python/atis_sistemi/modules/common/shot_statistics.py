@@ -0,0 +1,116 @@
+import cv2
+import numpy as np
+
+# Grubbs yaklaşımı: CEP ~= 0.5887 * (sigma_x + sigma_y), dağılımlar birbirine yakınken %3 içinde doğrudur
+CEP_FACTOR = 0.5887
+
+
+class ShotStatistics:
+    """
+    Atış grubu istatistikleri: ortalama isabet noktası (MPI), en uç mesafe (extreme spread),
+    CEP ve isabet yüzdesi.
+
+    Atışlar sıkı numpy dizilerinde tutulur. Toplamlar ve kovaryans için gereken kareler toplamı her
+    atışta güncellenir; dış bükey zarf yalnızca zarf köşeleri ve yeni atıştan yeniden kurulur. Böylece
+    tüm grup için özet, oturum uzunluğundan bağımsız sürede hesaplanır. Seçili satırlar için özet
+    yalnızca o satırlardan hesaplanır.
+
+    store (ShotStore) verilirse atışlar ayrıca tutulmaz; seçili satırlar depodan okunur.
+    """
+
+    def __init__(self, capacity=256, store=None):
+        self.__store = store
+        if store is None:
+            self.__points = np.empty((capacity, 2), dtype=np.float64)
+            self.__hits = np.empty(capacity, dtype=bool)
+        self.clear()
+
+    def clear(self):
+        self.__count = 0
+        self.__hit_count = 0
+        # sum x, sum y, sum x^2, sum y^2, sum xy
+        self.__sums = np.zeros(5, dtype=np.float64)
+        self.__hull = np.empty((0, 2), dtype=np.float64)
+
+    def __len__(self):
+        return self.__count
+
+    def add(self, x, y, hit):
+        if self.__store is None:
+            if self.__count == len(self.__points):
+                self.__points = np.concatenate([self.__points, np.empty_like(self.__points)])
+                self.__hits = np.concatenate([self.__hits, np.empty_like(self.__hits)])
+
+            self.__points[self.__count] = (x, y)
+            self.__hits[self.__count] = hit
+        self.__count += 1
+        self.__hit_count += int(bool(hit))
+        self.__sums += (x, y, x * x, y * y, x * y)
+
+        # Zarfın içindeki atış zarfı değiştirmez
+        if len(self.__hull) < 3 or cv2.pointPolygonTest(np.float32(self.__hull), (float(x), float(y)), False) < 0:
+            self.__hull = self.hull(np.vstack([self.__hull, (x, y)]))
+
+    @staticmethod
+    def hull(points):
+        if len(points) < 3:
+            return np.float64(points).reshape(-1, 2)
+        return np.float64(cv2.convexHull(np.float32(points))).reshape(-1, 2)
+
+    @staticmethod
+    def extreme_spread(hull):
+        """
+        En uzak iki atış arasındaki mesafe; en uzak çift her zaman zarf köşelerindedir.
+        """
+        if len(hull) < 2:
+            return 0.0
+        differences = hull[:, np.newaxis, :] - hull[np.newaxis, :, :]
+        return float(np.sqrt((differences ** 2).sum(axis=2).max()))
+
+    @staticmethod
+    def __summary(count, hit_count, sums, hull):
+        if count == 0:
+            return {'count': 0, 'hit_rate': 0.0, 'mpi': None, 'extreme_spread': 0.0, 'cep': 0.0}
+
+        sum_x, sum_y, sum_xx, sum_yy, _ = sums
+        mean_x, mean_y = sum_x / count, sum_y / count
+        # Örneklem varyansı; tek atışta yayılım yoktur
+        variance_x = max(sum_xx - count * mean_x * mean_x, 0.0) / max(count - 1, 1)
+        variance_y = max(sum_yy - count * mean_y * mean_y, 0.0) / max(count - 1, 1)
+
+        return {
+            'count': count,
+            'hit_rate': hit_count / count,
+            'mpi': (float(mean_x), float(mean_y)),
+            'extreme_spread': ShotStatistics.extreme_spread(hull),
+            'cep': float(CEP_FACTOR * (np.sqrt(variance_x) + np.sqrt(variance_y))),
+        }
+
+    def covariance(self):
+        if self.__count < 2:
+            return np.zeros((2, 2))
+        sum_x, sum_y, sum_xx, sum_yy, sum_xy = self.__sums
+        n = self.__count
+        covariance_xy = sum_xy - sum_x * sum_y / n
+        return np.array([[sum_xx - sum_x * sum_x / n, covariance_xy],
+                         [covariance_xy, sum_yy - sum_y * sum_y / n]]) / (n - 1)
+
+    def summary(self, rows=None):
+        """
+        Args:
+            rows: Yalnızca bu atış sıraları (örn. "Show Selected" satırları); None ise bütün atışlar
+
+        Returns:
+            {'count', 'hit_rate', 'mpi', 'extreme_spread', 'cep'} - uzunluklar piksel cinsinden
+        """
+        if rows is None:
+            return self.__summary(self.__count, self.__hit_count, self.__sums, self.__hull)
+
+        rows = np.asarray([row for row in rows if 0 <= row < self.__count], dtype=np.intp)
+        if self.__store is None:
+            points, hits = self.__points[rows], self.__hits[rows]
+        else:
+            points, hits = self.__store.points(rows), self.__store.hits(rows)
+        x, y = points[:, 0], points[:, 1]
+        sums = np.array([x.sum(), y.sum(), (x * x).sum(), (y * y).sum(), (x * y).sum()])
+        return self.__summary(len(rows), int(hits.sum()), sums, self.hull(points))
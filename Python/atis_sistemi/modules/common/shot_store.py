@@ -0,0 +1,158 @@
+import tempfile
+
+import numpy as np
+
+from modules.common.constants import ShotStoreConstants
+
+# Saat etiketi "%H:%M:%S" biçiminde sabit 8 karakterdir
+SHOT_DTYPE = np.dtype([('x', np.int32), ('y', np.int32), ('time', 'S8'), ('hit', np.bool_), ('shooter', np.uint8)])
+
+
+class ShotStore:
+    """
+    Oturumdaki atışların sınırlı bellekli deposu.
+
+    Son atışlar sabit boyutlu, yapılandırılmış bir numpy penceresinde tutulur. Pencere dolunca eski
+    yarısı geçici bir dosyanın sonuna yazılır ve bellek eşlemeli (memmap) olarak okunur; böylece süreç
+    belleği oturum uzunluğundan bağımsız kalır. Sıra numaraları yayılmadan etkilenmez: store[i] ve
+    points(rows) her iki bölgeyi de şeffaf olarak okur. Çizim, tablo ve istatistikler aynı depoyu okur.
+    """
+
+    def __init__(self, window=ShotStoreConstants.WINDOW, directory=ShotStoreConstants.SPILL_DIRECTORY):
+        self.__window = np.zeros(window, dtype=SHOT_DTYPE)
+        self.__count = 0
+        self.__directory = directory
+
+        self.__file = None
+        self.__spilled = 0
+        self.__memmap = None
+
+    def __len__(self):
+        return self.__spilled + self.__count
+
+    @property
+    def spilled(self):
+        """
+        Diske yazılmış (pencere dışındaki) atış sayısı.
+        """
+        return self.__spilled
+
+    def append(self, x, y, label, hit=False, shooter=0):
+        if self.__count == len(self.__window):
+            self.__spill()
+
+        self.__window[self.__count] = (x, y, label.encode()[:8], hit, shooter)
+        self.__count += 1
+
+    def extend(self, bundles, hits=None):
+        """
+        Args:
+            bundles: [[(x, y), saat, atıcı], ...] - kamera döngüsünün ve kayıt dosyalarının biçimi; atıcı
+                numarası olmayan (eski) kayıtlar atıcı 0 sayılır
+            hits: Her atış için hedef bölgesi içinde mi (None ise False)
+        """
+        for index, bundle in enumerate(bundles):
+            self.append(bundle[0][0], bundle[0][1], str(bundle[1]), False if hits is None else hits[index],
+                        bundle[2] if len(bundle) > 2 else 0)
+
+    def __spill(self):
+        if self.__file is None:
+            self.__file = tempfile.NamedTemporaryFile(prefix='shots-', suffix='.bin', dir=self.__directory)
+
+        half = len(self.__window) // 2
+        self.__file.write(self.__window[:half].tobytes())
+        self.__file.flush()
+
+        self.__window[:self.__count - half] = self.__window[half:self.__count]
+        self.__count -= half
+        self.__spilled += half
+        # Dosya büyüdü; eşleme bir sonraki okumada yeniden kurulur
+        self.__memmap = None
+
+    def __disk(self):
+        if self.__memmap is None:
+            self.__memmap = np.memmap(self.__file, dtype=SHOT_DTYPE, mode='r', shape=(self.__spilled,))
+        return self.__memmap
+
+    def __index(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('shot index out of range')
+        return index
+
+    def __record(self, index):
+        index = self.__index(index)
+        if index < self.__spilled:
+            return self.__disk()[index]
+        return self.__window[index - self.__spilled]
+
+    def __records(self, rows):
+        rows = np.asarray(rows, dtype=np.intp)
+        records = np.empty(len(rows), dtype=SHOT_DTYPE)
+
+        on_disk = rows < self.__spilled
+        if on_disk.any():
+            records[on_disk] = self.__disk()[rows[on_disk]]
+        records[~on_disk] = self.__window[rows[~on_disk] - self.__spilled]
+        return records
+
+    def __chunks(self, size=ShotStoreConstants.WINDOW):
+        for start in range(0, self.__spilled, size):
+            yield self.__disk()[start:start + size]
+        yield self.__window[:self.__count]
+
+    @staticmethod
+    def __bundle(record):
+        return [(int(record['x']), int(record['y'])), record['time'].decode(), int(record['shooter'])]
+
+    def __getitem__(self, index):
+        """
+        Returns:
+            [(x, y), saat, atıcı] - kamera döngüsünün ürettiği biçimle aynı
+        """
+        return self.__bundle(self.__record(index))
+
+    def __iter__(self):
+        # Diskteki atışlar pencere boyutunda parçalar halinde okunur
+        for chunk in self.__chunks():
+            for record in chunk:
+                yield self.__bundle(record)
+
+    def hit(self, index):
+        return bool(self.__record(index)['hit'])
+
+    def shooter(self, index):
+        return int(self.__record(index)['shooter'])
+
+    def points(self, rows=None):
+        """
+        Returns:
+            (n, 2) float64 koordinatlar; rows None ise bütün atışlar
+        """
+        if rows is None:
+            records = np.concatenate(list(self.__chunks()))
+        else:
+            records = self.__records(rows)
+        return np.stack([records['x'], records['y']], axis=1).astype(np.float64)
+
+    def hits(self, rows=None):
+        if rows is None:
+            return np.concatenate([chunk['hit'] for chunk in self.__chunks()])
+        return self.__records(rows)['hit']
+
+    def shooters(self, rows=None):
+        if rows is None:
+            return np.concatenate([chunk['shooter'] for chunk in self.__chunks()])
+        return self.__records(rows)['shooter']
+
+    def clear(self):
+        self.__count = 0
+        self.close()
+
+    def close(self):
+        self.__memmap = None
+        self.__spilled = 0
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
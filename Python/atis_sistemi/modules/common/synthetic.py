@@ -0,0 +1,214 @@
+"""
+Kamera olmadan yük ve doğruluk testi için sentetik lazer atışı üreteci.
+
+Hedef arka planı (images/target.png, verilen bir dosya veya dizi; yoksa çizilmiş bir hedef)
+üzerine rastgele konumlarda kırmızı lazer darbeleri bindirilir. Gürültü, parlaklık dalgalanması,
+hareket izi, çözünürlük ve FPS ayarlanabilir. Atışların gerçek konumları shots listesinde tutulur
+(autotune ile aynı {"frame", "x", "y"} biçimi).
+
+Kullanım (atis_sistemi dizininden) - autotune için klip ve atış listesi üretir:
+    python -m modules.common.synthetic clip.avi shots.json --seconds 10 --noise 3 --blur 6
+"""
+
+import argparse
+import json
+import math
+import os
+
+import cv2
+import numpy as np
+
+from modules.common.constants import SyntheticConstants
+
+# Tespit, lazerin göründüğü frame'den birkaç frame sonra da gelebilir
+MATCH_FRAMES = 2
+MATCH_DISTANCE = 8
+
+
+def draw_target(width, height):
+    """
+    Arka plan dosyası yoksa kullanılan basit hedef: açık zemin üzerinde koyu halkalar.
+    """
+    target = np.full((height, width, 3), 220, dtype=np.uint8)
+    center = (width // 2, height // 2)
+    radius = min(width, height) // 2
+    for ring in range(10, 0, -1):
+        cv2.circle(target, center, radius * ring // 10, (30, 30, 30), max(1, radius // 120), cv2.LINE_AA)
+    cv2.circle(target, center, radius // 10, (30, 30, 30), -1, cv2.LINE_AA)
+    return target
+
+
+def load_background(background, width, height):
+    if isinstance(background, np.ndarray):
+        image = background
+    elif background is not None and os.path.exists(background):
+        image = cv2.imread(background)
+    else:
+        image = None
+
+    if image is None:
+        return draw_target(width, height)
+    if image.ndim == 2:
+        image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+    return cv2.resize(image[:, :, :3], (width, height), interpolation=cv2.INTER_AREA)
+
+
+def evaluate(detected, shots, frames=MATCH_FRAMES, distance=MATCH_DISTANCE):
+    """
+    Frame başına tespit listelerini gerçek atışlarla eşleştirir.
+
+    Args:
+        detected: Her frame için [(x, y), ...] listesi
+        shots: [{"frame", "x", "y"}, ...]
+
+    Returns:
+        {'found', 'false_positives', 'recall', 'precision'}
+    """
+    found = 0
+    matched = set()
+    for shot in shots:
+        for index in range(shot['frame'], min(shot['frame'] + frames + 1, len(detected))):
+            hits = [tuple(point) for point in detected[index]
+                    if np.hypot(point[0] - shot['x'], point[1] - shot['y']) <= distance]
+            if len(hits) > 0:
+                found += 1
+                matched.update((index, hit) for hit in hits)
+                break
+
+    total = sum(len(points) for points in detected)
+    return {
+        'found': found,
+        'false_positives': total - len(matched),
+        'recall': found / len(shots) if len(shots) > 0 else 1.0,
+        'precision': len(matched) / total if total > 0 else 1.0,
+    }
+
+
+class SyntheticShots:
+    """
+    frame_number -> BGR frame üreteci; SyntheticCapture'a generator olarak verilir.
+
+    Atış takvimi frame numarasından belirlenir (aynı seed aynı atışları üretir), böylece
+    frame'ler sırayla istendiği sürece gerçek konumlar shots listesinde birikir.
+    """
+
+    def __init__(self, width, height, fps, background=SyntheticConstants.BACKGROUND_PATH,
+                 shot_rate=SyntheticConstants.SHOT_RATE, noise=SyntheticConstants.NOISE_SIGMA,
+                 flicker=SyntheticConstants.FLICKER, blur=SyntheticConstants.MOTION_BLUR,
+                 seed=SyntheticConstants.SEED):
+        self.width = width
+        self.height = height
+        self.fps = fps
+
+        self.__background = load_background(background, width, height)
+        self.__random = np.random.default_rng(seed)
+        self.__flicker = flicker
+        self.__blur = blur
+        self.__shot_rate = shot_rate
+        self.__pulse_frames = max(1, round(SyntheticConstants.PULSE_MS * fps / 1000))
+        self.__min_gap = max(self.__pulse_frames + MATCH_FRAMES + 1, int(SyntheticConstants.MIN_GAP_S * fps))
+
+        # Gürültü her frame'de üretilmez: önceden üretilen pozitif/negatif kısımlar döngüyle eklenir
+        self.__noise = list()
+        if noise > 0:
+            for _ in range(SyntheticConstants.NOISE_FRAMES):
+                sample = self.__random.normal(0, noise, (height, width, 1)).astype(np.int16)
+                sample = np.repeat(sample, 3, axis=2)
+                self.__noise.append((np.clip(sample, 0, 255).astype(np.uint8),
+                                     np.clip(-sample, 0, 255).astype(np.uint8)))
+
+        self.__next_shot = self.__schedule(0)
+        self.__active = None
+        self.shots = list()
+        # Pozlama/kazançla ölçeklenen arka plan parlaklığı; lazer her durumda doygun kalır
+        self.brightness = 1.0
+
+    def __schedule(self, after):
+        if self.__shot_rate <= 0:
+            return math.inf
+        gap = self.__random.exponential(self.fps / self.__shot_rate)
+        return after + self.__min_gap + int(gap)
+
+    def __start_shot(self, frame_number):
+        margin = SyntheticConstants.MARGIN + self.__blur
+        x = int(self.__random.integers(margin, self.width - margin))
+        y = int(self.__random.integers(margin, self.height - margin))
+        angle = self.__random.uniform(0, 2 * np.pi)
+        dx, dy = self.__blur / 2 * np.cos(angle), self.__blur / 2 * np.sin(angle)
+
+        self.__active = (frame_number, (x - dx, y - dy), (x + dx, y + dy))
+        self.shots.append({'frame': frame_number, 'x': x, 'y': y})
+        self.__next_shot = self.__schedule(frame_number)
+
+    def __draw_spot(self, frame, start, end):
+        """
+        Darbe, başlangıç-bitiş arasında yumuşak kenarlı bir iz olarak yalnızca küçük bir bölgeye çizilir.
+        """
+        radius = SyntheticConstants.SPOT_RADIUS
+        pad = 2 * radius + 2
+        left = max(int(min(start[0], end[0])) - pad, 0)
+        top = max(int(min(start[1], end[1])) - pad, 0)
+        right = min(int(max(start[0], end[0])) + pad + 1, self.width)
+        bottom = min(int(max(start[1], end[1])) + pad + 1, self.height)
+
+        alpha = np.zeros((bottom - top, right - left), dtype=np.float32)
+        shift = 4
+        cv2.line(alpha,
+                 (int((start[0] - left) * (1 << shift)), int((start[1] - top) * (1 << shift))),
+                 (int((end[0] - left) * (1 << shift)), int((end[1] - top) * (1 << shift))),
+                 1.0, 2 * radius, cv2.LINE_AA, shift)
+        alpha = cv2.GaussianBlur(alpha, (0, 0), radius / 2)[:, :, np.newaxis]
+
+        roi = frame[top:bottom, left:right]
+        roi[:] = roi * (1 - alpha) + np.float32(SyntheticConstants.SPOT_COLOR) * alpha
+
+    def __call__(self, frame_number):
+        gain = self.brightness
+        if self.__flicker > 0:
+            gain *= 1 + self.__flicker * math.sin(2 * math.pi * SyntheticConstants.FLICKER_HZ *
+                                                  frame_number / self.fps)
+        frame = cv2.convertScaleAbs(self.__background, alpha=gain) if gain != 1.0 else self.__background.copy()
+
+        if len(self.__noise) > 0:
+            positive, negative = self.__noise[frame_number % len(self.__noise)]
+            cv2.add(frame, positive, dst=frame)
+            cv2.subtract(frame, negative, dst=frame)
+
+        if frame_number >= self.__next_shot:
+            self.__start_shot(frame_number)
+        if self.__active is not None:
+            begin, start, end = self.__active
+            if frame_number - begin < self.__pulse_frames:
+                self.__draw_spot(frame, start, end)
+            else:
+                self.__active = None
+
+        return frame
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Render a synthetic laser clip with ground truth shots.')
+    parser.add_argument('clip')
+    parser.add_argument('shots', help='output JSON list of {"frame", "x", "y"}')
+    parser.add_argument('--width', type=int, default=640)
+    parser.add_argument('--height', type=int, default=480)
+    parser.add_argument('--fps', type=int, default=60)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--background', default=SyntheticConstants.BACKGROUND_PATH)
+    parser.add_argument('--rate', type=float, default=SyntheticConstants.SHOT_RATE)
+    parser.add_argument('--noise', type=float, default=SyntheticConstants.NOISE_SIGMA)
+    parser.add_argument('--flicker', type=float, default=SyntheticConstants.FLICKER)
+    parser.add_argument('--blur', type=int, default=SyntheticConstants.MOTION_BLUR)
+    parser.add_argument('--seed', type=int, default=SyntheticConstants.SEED)
+    args = parser.parse_args()
+
+    generator = SyntheticShots(args.width, args.height, args.fps, args.background, args.rate, args.noise,
+                               args.flicker, args.blur, args.seed)
+    writer = cv2.VideoWriter(args.clip, cv2.VideoWriter_fourcc(*'MJPG'), args.fps, (args.width, args.height))
+    for number in range(int(args.seconds * args.fps)):
+        writer.write(generator(number))
+    writer.release()
+
+    with open(args.shots, 'w') as outfile:
+        json.dump(generator.shots, outfile, indent=2)
+    print('{} shots written'.format(len(generator.shots)))
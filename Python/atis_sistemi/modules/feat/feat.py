@@ -1,6 +1,5 @@
-import PyQt5
-from PyQt5 import Qt
-from PyQt5.QtCore import QPoint, Qt
+import cv2
+import numpy as np
 
 
 class Feat:
@@ -8,13 +7,29 @@ class Feat:
         self.__width = width
         self.__height = height
 
-        self.__static_points = PyQt5.Qt.QPolygon([QPoint(0, 0),
-                                                  QPoint(width - 1, 0),
-                                                  QPoint(width - 1, height - 1),
-                                                  QPoint(0, height - 1)])
+        self.__static_points = [(0, 0), (width - 1, 0), (width - 1, height - 1), (0, height - 1)]
+        # Hedef bölgesi maskesi: her atış için tek piksel okuması yeterli olur
+        self.__mask = np.ones((height, width), dtype=np.uint8)
 
-    def set_feat(self, points):
-        self.__static_points = PyQt5.Qt.QPolygon(points)
+    @property
+    def points(self):
+        return self.__static_points
 
-    def is_in(self, point):
-        return self.__static_points.containsPoint(point, Qt.OddEvenFill)
+    @property
+    def mask(self):
+        return self.__mask
+
+    def set_feat(self, points, mask=None):
+        """
+        Hedef bölgesini (x, y) köşe listesiyle tanımlar; önceden hesaplanmış maske verilirse yeniden çizilmez.
+        """
+        points = [(int(x), int(y)) for x, y in points]
+        if mask is None:
+            mask = np.zeros((self.__height, self.__width), dtype=np.uint8)
+            cv2.fillPoly(mask, [np.int32(points)], 1)
+        self.__static_points, self.__mask = points, mask
+
+    def is_in(self, x, y):
+        if 0 <= x < self.__width and 0 <= y < self.__height:
+            return bool(self.__mask[int(y), int(x)])
+        return False
@@ -1,34 +1,41 @@
 import functools
-import time
 
-import numpy as np
 from PyQt5 import QtCore, QtGui, QtWidgets
-from PyQt5.QtCore import Qt, QThread, pyqtSlot, QPoint
+from PyQt5.QtCore import Qt, QThread, pyqtSlot, pyqtSignal, QTimer
 from PyQt5.QtGui import QPixmap
-from PyQt5.QtWidgets import QTableWidgetItem, QMessageBox, QFileDialog
+from PyQt5.QtWidgets import QMessageBox, QFileDialog
 
-from modules.common.camera import CameraWork
-from modules.common.constants import MainUIConstants
+from modules.common.constants import MainUIConstants, RecorderConstants, TableShotsConstants
 from modules.common.filer import Filer
-from modules.common.statics import Statics
-from modules.feat.ui.feat_ui import FeatUI
 from modules.main.modules.label_controller import LabelController
 from modules.main.modules.table_shots import TableShots
-from modules.perspective.ui.perspective_ui import PerspectiveUI
 from modules.target.target import TargetUI
 
 
 class MainUI(QtWidgets.QMainWindow):
+    first_frame_signal = pyqtSignal()
+
     def __init__(self):
         super().__init__()
 
-        self.__devices = []
+        self.__devices = None
         self.__filer = Filer()
         self.__thread = QThread()
-
-        self.__feat_ui = FeatUI()
+        self.__thread.finished.connect(self.__thread_finished)
+        self.__worker = None
+        self.__pending_camera = None
+        self.__camera_size = None
+        self.__statistics = None
+        self.__scoreboard = None
+
+        self.__shot_timer = QTimer(self)
+        self.__shot_timer.setInterval(1000 // MainUIConstants.SHOT_REFRESH_HZ)
+        self.__shot_timer.timeout.connect(self.__drain_shots)
+
+        # Kalibrasyon pencereleri (ve OpenCV/NumPy importları) ilk kullanımda oluşturulur
+        self.__feat_ui = None
+        self.__perspective_ui = None
         self.__target_ui = TargetUI()
-        self.__perspective_ui = PerspectiveUI()
 
         self.__setup_ui()
         self.__re_translate_ui()
@@ -37,12 +44,71 @@ class MainUI(QtWidgets.QMainWindow):
         self.__target_ui.show()
         self.__target_ui.label_target.update()
 
-        if len(self.__devices) > 0:
+        # Kamera pencere çizildikten sonra açılır, böylece ilk görüntü beklenmez
+        QTimer.singleShot(0, self.__start_camera)
+
+    def __start_camera(self):
+        if len(self.__available_devices()) > 0:
             # self.__init_camera(self.__devices[0])
             self.__init_camera('test.mp4')
         else:
             QMessageBox.about(self, 'Warning', 'Camera device not found!')
 
+    def __available_devices(self):
+        if self.__devices is None:
+            from modules.common.statics import Statics
+
+            self.__devices = Statics.available_devices()
+        return self.__devices
+
+    def __populate_camera_devices(self):
+        if len(self.menu_camera_devices.actions()) > 0:
+            return
+        for index in self.__available_devices():
+            self.menu_camera_devices.addAction('Camera {}'.format(index),
+                                               functools.partial(self.__change_camera, index))
+
+    @property
+    def __shot_statistics(self):
+        if self.__statistics is None:
+            from modules.common.shot_statistics import ShotStatistics
+
+            # Seçili satırlar hedefin atış deposundan okunur
+            self.__statistics = ShotStatistics(store=self.__target_ui.label_target.all_points)
+        return self.__statistics
+
+    @property
+    def __feat(self):
+        if self.__feat_ui is None:
+            from modules.feat.ui.feat_ui import FeatUI
+
+            self.__feat_ui = FeatUI()
+            self.__feat_ui.feat_change_signal.connect(self.update_feat)
+            self.__connect_dialog(self.__feat_ui)
+        return self.__feat_ui
+
+    @property
+    def __perspective(self):
+        if self.__perspective_ui is None:
+            from modules.perspective.ui.perspective_ui import PerspectiveUI
+
+            self.__perspective_ui = PerspectiveUI()
+            self.__perspective_ui.perspective_change_signal.connect(self.update_perspective)
+            self.__perspective_ui.auto_calibration_signal.connect(self.auto_calibration)
+            self.__connect_dialog(self.__perspective_ui)
+        return self.__perspective_ui
+
+    def __connect_dialog(self, dialog):
+        if self.__worker is None:
+            return
+        if self.__camera_size is not None:
+            dialog.init(self.__camera_size)
+        self.__worker.init_signal.connect(dialog.init)
+        self.__worker.pixmap_change_signal.connect(dialog.update_label)
+
+    def __created_dialogs(self):
+        return [dialog for dialog in (self.__feat_ui, self.__perspective_ui) if dialog is not None]
+
     def __setup_ui(self):
         font = QtGui.QFont()
         font.setPointSize(MainUIConstants.FONT_SIZE_DEFAULT)
@@ -57,6 +123,12 @@ class MainUI(QtWidgets.QMainWindow):
         self.__target_ui.label_target.pixmap_change_signal.connect(self.label_camera.setPixmap)
         # Table Shots
         self.table_shots = TableShots(self.central_widget)
+        # Grup istatistikleri
+        self.label_statistics = QtWidgets.QLabel(self.central_widget)
+        self.label_statistics.setGeometry(QtCore.QRect(TableShotsConstants.INIT_POINT_LABEL_STATISTICS,
+                                                       TableShotsConstants.SIZE_LABEL_STATISTICS))
+        self.label_statistics.setFont(font)
+        self.label_statistics.setAlignment(QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter)
 
         # Buttons
         self.gridLayoutWidget = QtWidgets.QWidget(self.central_widget)
@@ -100,15 +172,21 @@ class MainUI(QtWidgets.QMainWindow):
         self.menu_camera_devices = QtWidgets.QMenu(self.menu_operations)
         self.setMenuBar(self.menubar)
 
-        self.__devices = Statics.available_devices()
-        for index in self.__devices:
-            self.menu_camera_devices.addAction('Camera {}'.format(index),
-                                               functools.partial(self.__change_camera, index))
+        # Cihaz taraması yavaş olduğundan menü ilk açıldığında yapılır
+        self.menu_camera_devices.aboutToShow.connect(self.__populate_camera_devices)
 
         self.action_camera_calibration = QtWidgets.QAction(self)
+        self.action_lens_calibration = QtWidgets.QAction(self)
         self.action_target_area = QtWidgets.QAction(self)
         self.action_change_background = QtWidgets.QAction(self)
         self.action_debug = QtWidgets.QAction(self)
+        self.action_heatmap = QtWidgets.QAction(self)
+        self.action_record = QtWidgets.QAction(self)
+        self.action_record.setCheckable(True)
+        self.action_shot_clips = QtWidgets.QAction(self)
+        self.action_shot_clips.setCheckable(True)
+        self.action_scoreboard = QtWidgets.QAction(self)
+        self.action_scoreboard.setCheckable(True)
         self.action_save = QtWidgets.QAction(self)
         self.action_load = QtWidgets.QAction(self)
         self.action_exit = QtWidgets.QAction(self)
@@ -119,9 +197,14 @@ class MainUI(QtWidgets.QMainWindow):
         self.menu_file.addAction(self.action_exit)
 
         self.menu_operations.addAction(self.action_camera_calibration)
+        self.menu_operations.addAction(self.action_lens_calibration)
         self.menu_operations.addAction(self.menu_camera_devices.menuAction())
         self.menu_operations.addAction(self.action_change_background)
         self.menu_operations.addAction(self.action_debug)
+        self.menu_operations.addAction(self.action_heatmap)
+        self.menu_operations.addAction(self.action_record)
+        self.menu_operations.addAction(self.action_shot_clips)
+        self.menu_operations.addAction(self.action_scoreboard)
         self.menu_operations.addAction(self.action_target_area)
 
         self.menubar.addAction(self.menu_file.menuAction())
@@ -139,9 +222,14 @@ class MainUI(QtWidgets.QMainWindow):
 
         # Action Connections
         self.action_camera_calibration.triggered.connect(self.camera_calibration)
+        self.action_lens_calibration.triggered.connect(self.lens_calibration)
         self.action_target_area.triggered.connect(self.target_area)
         self.action_change_background.triggered.connect(self.change_background)
         self.action_debug.triggered.connect(self.debug)
+        self.action_heatmap.triggered.connect(self.heatmap)
+        self.action_record.triggered.connect(self.record)
+        self.action_shot_clips.triggered.connect(self.shot_clips)
+        self.action_scoreboard.triggered.connect(self.scoreboard)
         self.action_save.triggered.connect(self.save)
         self.action_load.triggered.connect(self.load)
         self.action_exit.triggered.connect(self.close)
@@ -157,9 +245,14 @@ class MainUI(QtWidgets.QMainWindow):
         self.menu_file.setTitle(_translate("MainWindow", "File"))
         self.menu_operations.setTitle(_translate("MainWindow", "Operations"))
         self.action_camera_calibration.setText(_translate("MainWindow", "Camera Calibration"))
+        self.action_lens_calibration.setText(_translate("MainWindow", "Lens Calibration"))
         self.action_change_background.setText(_translate("MainWindow", "Change Background"))
         self.action_target_area.setText(_translate("MainWindow", "Target Area"))
         self.action_debug.setText(_translate("MainWindow", "Debug"))
+        self.action_heatmap.setText(_translate("MainWindow", "Heatmap"))
+        self.action_record.setText(_translate("MainWindow", "Record Session"))
+        self.action_shot_clips.setText(_translate("MainWindow", "Shot Clips"))
+        self.action_scoreboard.setText(_translate("MainWindow", "Scoreboard Stream"))
         self.menu_camera_devices.setTitle(_translate("MainWindow", "Camera Devices"))
         self.action_save.setText(_translate("MainWindow", "Save"))
         self.action_load.setText(_translate("MainWindow", "Load"))
@@ -170,140 +263,264 @@ class MainUI(QtWidgets.QMainWindow):
             self.close()
 
     def closeEvent(self, event: QtGui.QCloseEvent) -> None:
-        self.__feat_ui.close()
+        for dialog in self.__created_dialogs():
+            dialog.close()
         self.__target_ui.close()
-        self.__perspective_ui.close()
 
-        self.__worker.isWorkerAlive = False
-        self.__worker.isCameraRunning = False
-        self.__worker.isDetectionRunning = False
+        if self.__scoreboard is not None:
+            self.__scoreboard.stop()
+
+        if self.__worker is not None:
+            self.__worker.isWorkerAlive = False
+            self.__worker.isCameraRunning = False
+            self.__worker.isDetectionRunning = False
 
     def __change_camera(self, camera_id):
         if self.__thread.isRunning():
+            # Eski döngü bitince (__thread_finished) yeni kamera açılır; GUI thread'i beklemez
+            self.__pending_camera = camera_id
             self.__worker.isWorkerAlive = False
             self.__thread.quit()
-
-            while self.__thread.isRunning():
-                time.sleep(0.1)
+            return
 
         self.__init_camera(camera_id)
 
+    def __thread_finished(self):
+        if self.__pending_camera is not None:
+            camera_id, self.__pending_camera = self.__pending_camera, None
+            self.__init_camera(camera_id)
+
     def __init_camera(self, camera_id):
+        from modules.common.camera import CameraWork
+
         self.__worker = CameraWork(camera_id)
         self.__worker.moveToThread(self.__thread)
 
         self.__worker.finished.connect(self.__worker.deleteLater)
 
         self.__worker.init_signal.connect(self.__target_ui.label_target.init)
-        self.__worker.init_signal.connect(self.__feat_ui.init)
-        self.__worker.init_signal.connect(self.__perspective_ui.init)
+        self.__worker.init_signal.connect(self.__camera_initialized)
+        for dialog in self.__created_dialogs():
+            self.__connect_dialog(dialog)
 
-        self.__worker.pixmap_change_signal.connect(self.__feat_ui.update_label)
-        self.__worker.pixmap_change_signal.connect(self.__perspective_ui.update_label)
+        self.__worker.pixmap_change_signal.connect(self.__first_frame)
 
-        self.__worker.detected_signal.connect(self.bundler)
+        self.__worker.calibration_result_signal.connect(self.__apply_calibration)
+        self.__worker.calibrated_signal.connect(self.calibrated)
+        self.__worker.lens_calibrated_signal.connect(self.lens_calibrated)
         self.__worker.fps_change_signal.connect(self.get_statusbar_message)
 
-        self.__feat_ui.feat_change_signal.connect(self.update_feat)
-        self.__perspective_ui.perspective_change_signal.connect(self.update_perspective)
-
         self.__thread.started.connect(self.__worker.run)
         self.__thread.start()
+        self.__shot_timer.start()
+
+    @pyqtSlot(dict)
+    def __camera_initialized(self, size):
+        self.__camera_size = size
+        if self.__scoreboard is not None:
+            self.__scoreboard.init(size)
+
+        # Yeni kamera döngüsü kayıt yapmıyor; klipler açıksa yeni kamerada da sürer
+        self.action_record.setChecked(False)
+        if self.action_shot_clips.isChecked():
+            self.__worker.start_clips(self.__filer.session_path())
+
+        # Kamera profilinde kayıtlı hedef arka planı
+        if size.get('background') is not None:
+            self.__target_ui.label_target.set_background(QPixmap(size['background']))
+            self.__target_ui.label_target.update()
 
-    @pyqtSlot(list)
-    def bundler(self, bundle):
-        self.__target_ui.label_target.all_points.append(bundle)
-        order = len(self.__target_ui.label_target.all_points)
-        self.table_shots.setRowCount(order)
-
-        x = QTableWidgetItem(str(bundle[0][0]))
-        x.setTextAlignment(Qt.AlignCenter)
+    @pyqtSlot(object)
+    def __first_frame(self, frame):
+        self.__worker.pixmap_change_signal.disconnect(self.__first_frame)
+        self.first_frame_signal.emit()
 
-        y = QTableWidgetItem(str(bundle[0][1]))
-        y.setTextAlignment(Qt.AlignCenter)
+    def __drain_shots(self):
+        bundles = self.__worker.shots.drain()
+        if len(bundles) > 0:
+            self.bundler(bundles)
 
-        date = QTableWidgetItem(str(bundle[1]))
-        date.setTextAlignment(Qt.AlignCenter)
+    def bundler(self, bundles):
+        """
+        Yeni atışları tek seferde ekler: tablo bir kez büyütülür, bir kez kaydırılır ve hedef bir kez çizilir.
+        """
+        label_target = self.__target_ui.label_target
 
-        success = QTableWidgetItem()
-        success.setTextAlignment(Qt.AlignCenter)
-        success.setBackground(Qt.green if self.__worker.feat.is_in(QPoint(bundle[0][0], bundle[0][1])) else Qt.red)
+        hits = [self.__worker.feat.is_in(bundle[0][0], bundle[0][1]) for bundle in bundles]
+        for bundle, hit in zip(bundles, hits):
+            self.__shot_statistics.add(bundle[0][0], bundle[0][1], hit)
 
-        # self.table_shots.setItem(order - 1, 0, x)
-        # self.table_shots.setItem(order - 1, 1, y)
-        self.table_shots.setItem(order - 1, 0, date)
-        self.table_shots.setItem(order - 1, 1, success)
+        label_target.add_shots(bundles, hits)
+        self.table_shots.refresh(label_target.all_points)
         self.table_shots.scrollToBottom()
 
-        self.__target_ui.label_target.update()
+        label_target.update()
+        self.__show_statistics()
+
+        if self.__scoreboard is not None:
+            self.__scoreboard.publish_shots(bundles)
+
+    def __show_statistics(self):
+        label_target = self.__target_ui.label_target
+        summary = self.__shot_statistics.summary(None if label_target.all_mode else label_target.selected_rows)
+
+        if summary['count'] == 0:
+            self.label_statistics.setText('')
+            return
+        self.label_statistics.setText('{} {} shots - Hit {:.1f}%\nMPI: ({:.1f}, {:.1f})\n'
+                                      'Extreme spread: {:.1f} px - CEP: {:.1f} px'.format(
+                                          'All' if label_target.all_mode else 'Selected', summary['count'],
+                                          100 * summary['hit_rate'], *summary['mpi'],
+                                          summary['extreme_spread'], summary['cep']))
 
     @pyqtSlot(list)
     def update_feat(self, points):
-        self.__worker.feat.set_feat(points)
+        self.__worker.set_feat([(point.x(), point.y()) for point in points])
 
-    @pyqtSlot(np.ndarray)
+    @pyqtSlot(object)
     def update_perspective(self, points):
-        self.__worker.perspective.set_matrix(None if len(points) == 0 else points)
+        self.__worker.set_perspective(None if len(points) == 0 else points)
+
+    def auto_calibration(self):
+        self.__worker.start_auto_calibration()
+
+    @pyqtSlot(object, object)
+    def __apply_calibration(self, apply, result):
+        # Kalibrasyon işçisinin sonucu perspektife ve profile GUI thread'inde uygulanır
+        apply(result)
+
+    @pyqtSlot(object)
+    def calibrated(self, points):
+        self.__perspective.show_calibrated(points)
+
+    @pyqtSlot(object)
+    def lens_calibrated(self, result):
+        self.action_lens_calibration.setEnabled(True)
+        if result is None:
+            QMessageBox.about(self, 'Warning', 'Chessboard could not be found in enough frames.')
+        else:
+            QMessageBox.about(self, 'Lens Calibration',
+                              'Lens calibrated (RMS error {:.3f} px). Camera calibration must be repeated.'
+                              .format(result['rms']))
 
     @pyqtSlot(float)
     def get_statusbar_message(self, fps):
-        self.statusbar.showMessage('FPS: {:.3f} {} {} {} {}'.format(
+        recorder = self.__worker.recorder
+        self.statusbar.showMessage('FPS: {:.3f} - Quality {} {} {} {} {} {} {}'.format(
             fps,
+            self.__worker.governor.level,
+            '- Camera Reconnecting' if not self.__worker.camera_connected else
             '- Camera Running' if self.__worker.isCameraRunning else '- Camera Not Running',
             '- Detection Running' if self.__worker.isDetectionRunning else '- Detection Not Running',
             '- Show All' if self.__target_ui.label_target.all_mode else ' - Show Selected',
-            '- Debug' if self.__target_ui.label_target.debug_mode else ''))
+            '- Debug' if self.__target_ui.label_target.debug_mode else '',
+            '- Heatmap' if self.__target_ui.label_target.heatmap_mode else '',
+            '- Recording {} ({} dropped)'.format(recorder.frames, recorder.dropped) if recorder is not None else ''))
 
     def show_selected(self):
         self.__target_ui.label_target.selected_rows = [index.row() for index in
                                                        self.table_shots.selectionModel().selectedRows()]
         self.__target_ui.label_target.all_mode = False
         self.__target_ui.label_target.update()
+        self.__show_statistics()
 
     def show_all(self):
         self.__target_ui.label_target.all_mode = True
         self.__target_ui.label_target.update()
+        self.__show_statistics()
 
     def clear(self):
-        self.__target_ui.label_target.all_points.clear()
-        self.__target_ui.label_target.selected_rows.clear()
+        self.__target_ui.label_target.clear_shots()
         self.__target_ui.label_target.update()
         self.table_shots.clear()
+        self.__shot_statistics.clear()
+        self.__show_statistics()
+
+        if self.__scoreboard is not None:
+            self.__scoreboard.reset()
 
     def start(self):
         if self.__worker.isDetectionRunning:
             self.button_start.setText('Start')
             self.__worker.isDetectionRunning = False
             self.action_camera_calibration.setEnabled(True)
+            self.action_lens_calibration.setEnabled(True)
             self.menu_camera_devices.setEnabled(True)
             self.action_target_area.setEnabled(True)
         else:
             self.button_start.setText('Stop')
             self.__worker.isDetectionRunning = True
             self.action_camera_calibration.setEnabled(False)
+            self.action_lens_calibration.setEnabled(False)
             self.menu_camera_devices.setEnabled(False)
             self.action_target_area.setEnabled(False)
 
-            self.__feat_ui.close()
-            self.__perspective_ui.close()
+            for dialog in self.__created_dialogs():
+                dialog.close()
 
     def camera_calibration(self):
-        self.__perspective_ui.show()
+        self.__perspective.show()
+
+    def lens_calibration(self):
+        self.action_lens_calibration.setEnabled(False)
+        self.__worker.start_lens_calibration()
+        QMessageBox.about(self, 'Lens Calibration',
+                          'Show the chessboard to the camera from different angles and distances.')
 
     def target_area(self):
-        self.__feat_ui.show()
+        self.__feat.show()
 
     def debug(self):
         self.__target_ui.label_target.debug_mode = not self.__target_ui.label_target.debug_mode
         self.__target_ui.label_target.update()
 
+    def heatmap(self):
+        self.__target_ui.label_target.heatmap_mode = not self.__target_ui.label_target.heatmap_mode
+        self.__target_ui.label_target.update()
+
+    def record(self, checked):
+        if self.__worker is None:
+            self.action_record.setChecked(False)
+        elif checked:
+            self.__worker.start_recording('{}/session'.format(self.__filer.session_path()))
+        else:
+            recorder = self.__worker.stop_recording()
+            if recorder is not None:
+                QMessageBox.about(self, 'Recorded', 'Session saved to {}{} ({} frames, {} dropped)'.format(
+                    recorder.path, RecorderConstants.EXTENSION, recorder.frames, recorder.dropped))
+
+    def shot_clips(self, checked):
+        if self.__worker is None:
+            self.action_shot_clips.setChecked(False)
+        elif checked:
+            self.__worker.start_clips(self.__filer.session_path())
+        else:
+            self.__worker.stop_clips()
+
+    def scoreboard(self, checked):
+        if checked:
+            from modules.main.modules.scoreboard_stream import ScoreboardStream
+
+            try:
+                self.__scoreboard = ScoreboardStream(self.__target_ui.label_target)
+            except OSError as error:
+                self.action_scoreboard.setChecked(False)
+                QMessageBox.about(self, 'Warning', 'Scoreboard stream could not be started: {}'.format(error))
+                return
+            if self.__camera_size is not None:
+                self.__scoreboard.init(self.__camera_size)
+            self.statusbar.showMessage('Scoreboard stream on {}:{}'.format(*self.__scoreboard.address))
+        elif self.__scoreboard is not None:
+            self.__scoreboard.stop()
+            self.__scoreboard = None
+
     def save(self):
         data = {
             'camera': {
                 'width': self.__worker.available_width,
                 'height': self.__worker.available_height
             },
-            'shots': self.label_camera.all_points
+            'shots': list(self.__target_ui.label_target.all_points)
         }
 
         self.__filer.write_to_file(self.label_camera.grab(), data)
@@ -312,13 +529,15 @@ class MainUI(QtWidgets.QMainWindow):
     def load(self):
         file_path = QFileDialog.getOpenFileName(self, 'Open file', '{}'.format(self.__filer.data_path), '(*.json)')
         if len(file_path[0]) > 0:
-            self.label_camera.all_points.clear()
+            self.__target_ui.label_target.clear_shots()
             self.table_shots.clear()
+            self.__shot_statistics.clear()
+            if self.__scoreboard is not None:
+                self.__scoreboard.reset()
 
             data = self.__filer.read_from_file(file_path[0])
             # self.init(data['camera'])
-            for shot in data['shots']:
-                self.bundler(shot)
+            self.bundler(data['shots'])
 
     def change_background(self):
         file_name, _ = QFileDialog.getOpenFileName(parent=self,
@@ -328,3 +547,7 @@ class MainUI(QtWidgets.QMainWindow):
         if file_name:
             self.__target_ui.label_target.set_background(QPixmap(file_name))
             self.__target_ui.label_target.update()
+            if self.__scoreboard is not None:
+                self.__scoreboard.keyframe()
+            if self.__worker is not None:
+                self.__worker.set_background(file_name)
@@ -0,0 +1,120 @@
+import threading
+from collections import OrderedDict
+
+from PyQt5.QtCore import Qt, QSize
+from PyQt5.QtGui import QImageReader, QPixmap
+
+from modules.common.constants import LabelCameraConstants
+
+
+class BackgroundCache:
+    """
+    Hedef arka planı için mip piramidi ve boyut bazlı LRU önbellek.
+
+    Kaynak her değiştiğinde piramit (tam boyut, 1/2, 1/4, ...) arka plan thread'inde bir kez kurulur.
+    İstenen boyut, ondan büyük en küçük seviyeden tek bir ucuz ölçeklemeyle üretilir; son kullanılan
+    boyutlar LRU'da QPixmap olarak tutulur. QImage thread'ler arasında güvenle kullanılabilir, QPixmap'e
+    dönüşüm yalnızca GUI thread'inde (get) yapılır.
+
+    get piramidi beklemez: kurulum sürerken eldeki en yakın seviyeden (o da yoksa verilen yer tutucudan)
+    hızlı bir ölçekleme döner ve önbelleğe alınmaz. Piramit bitince on_ready kurulum thread'inden çağrılır;
+    çağıran istediği boyutu yeniden alıp çizer.
+    """
+
+    def __init__(self, on_ready=None, capacity=LabelCameraConstants.BACKGROUND_CACHE_SIZE):
+        self.__on_ready = on_ready
+        self.__capacity = capacity
+        self.__pixmaps = OrderedDict()
+        self.__levels = list()
+        self.__size = QSize()
+        self.__built = threading.Event()
+        self.__generation = 0
+
+    @property
+    def size(self):
+        """
+        Tam çözünürlüklü görüntünün boyutu (piramit kurulmadan da bilinir).
+        """
+        return self.__size
+
+    def set_source(self, source):
+        """
+        Args:
+            source: Görüntü dosyası yolu, QPixmap veya QImage
+        """
+        self.__generation += 1
+        self.__pixmaps.clear()
+        self.__levels = list()
+        self.__built = threading.Event()
+
+        if isinstance(source, str):
+            # Dosya yalnızca başlığı okunarak boyutlandırılır; çözme işi thread'e kalır
+            self.__size = QImageReader(source).size()
+        else:
+            source = source.toImage() if isinstance(source, QPixmap) else source
+            self.__size = source.size()
+            self.__levels.append(source)
+
+        thread = threading.Thread(target=self.__build, args=(source, self.__generation, self.__levels, self.__built),
+                                  name='BackgroundCache', daemon=True)
+        thread.start()
+
+    def __build(self, source, generation, levels, built):
+        if isinstance(source, str):
+            levels.append(QImageReader(source).read())
+        image = levels[0]
+
+        while min(image.width(), image.height()) // 2 >= LabelCameraConstants.BACKGROUND_MIP_MIN_SIZE:
+            # Kaynak değiştiyse eski piramidi kurmaya devam etme
+            if generation != self.__generation:
+                return
+            image = image.scaled(image.width() // 2, image.height() // 2, Qt.IgnoreAspectRatio,
+                                 Qt.SmoothTransformation)
+            levels.append(image)
+
+        built.set()
+        if generation == self.__generation and self.__on_ready is not None:
+            self.__on_ready()
+
+    def put(self, size, pixmap):
+        self.__pixmaps[(size.width(), size.height())] = pixmap
+        self.__pixmaps.move_to_end((size.width(), size.height()))
+        while len(self.__pixmaps) > self.__capacity:
+            self.__pixmaps.popitem(last=False)
+
+    def get(self, size, placeholder=None):
+        """
+        Args:
+            size: İstenen boyut
+            placeholder: Kaynak henüz çözülmediyse ölçeklenerek döndürülecek QPixmap (örn. o an çizilen)
+
+        Returns:
+            size içine en-boy oranı korunarak sığdırılmış QPixmap; kaynak çözülmediyse ve placeholder
+            verilmediyse None
+        """
+        key = (size.width(), size.height())
+        if key in self.__pixmaps:
+            self.__pixmaps.move_to_end(key)
+            return self.__pixmaps[key]
+
+        built = self.__built.is_set()
+        levels = list(self.__levels)
+        fitted = self.__size.scaled(size, Qt.KeepAspectRatio)
+        if len(levels) == 0:
+            if placeholder is None:
+                return None
+            return placeholder.scaled(fitted, Qt.IgnoreAspectRatio, Qt.FastTransformation)
+
+        # İstenen boyuttan büyük (veya eşit) en küçük seviye; o seviyeden ölçekleme kaliteyi korur
+        level = levels[0]
+        for candidate in levels[1:]:
+            if candidate.width() >= fitted.width() and candidate.height() >= fitted.height():
+                level = candidate
+
+        if not built:
+            # Daha uygun seviye henüz kurulmamış olabilir; piramit bitince yeniden istenir
+            return QPixmap.fromImage(level.scaled(fitted, Qt.IgnoreAspectRatio, Qt.FastTransformation))
+
+        pixmap = QPixmap.fromImage(level.scaled(fitted, Qt.IgnoreAspectRatio, Qt.SmoothTransformation))
+        self.put(size, pixmap)
+        return pixmap
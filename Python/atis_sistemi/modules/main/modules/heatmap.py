@@ -0,0 +1,74 @@
+import cv2
+import numpy as np
+from PyQt5.QtGui import QImage, QPixmap
+
+from modules.common.constants import HeatmapConstants
+
+
+class Heatmap:
+    """
+    Atış yoğunluğu katmanı.
+
+    Atışlar sabit boyutlu bir biriktirme ızgarasına önceden hesaplanmış Gauss çekirdeği eklenerek
+    işlenir (atış başına O(1)). Renk haritası yalnızca ızgara değiştiyse ve çizim istendiğinde
+    üretilir; çizim maliyeti atış sayısından bağımsızdır.
+    """
+
+    def __init__(self, width, height, cell=HeatmapConstants.CELL, sigma=HeatmapConstants.SIGMA):
+        self.__cell = cell
+        self.__grid = np.zeros((max(1, height // cell), max(1, width // cell)), dtype=np.float32)
+        self.__peak = 0.0
+
+        radius = int(np.ceil(3 * sigma))
+        axis = np.arange(-radius, radius + 1, dtype=np.float32)
+        kernel = np.exp(-axis ** 2 / (2 * sigma ** 2))
+        self.__kernel = np.outer(kernel, kernel)
+        self.__radius = radius
+
+        self.__pixmap = None
+
+    def add(self, x, y):
+        """
+        Args:
+            x, y: Etiket koordinatlarında atış konumu
+        """
+        rows, columns = self.__grid.shape
+        column, row = int(x) // self.__cell, int(y) // self.__cell
+
+        top, bottom = max(0, row - self.__radius), min(rows, row + self.__radius + 1)
+        left, right = max(0, column - self.__radius), min(columns, column + self.__radius + 1)
+        if top >= bottom or left >= right:
+            return
+
+        window = self.__grid[top:bottom, left:right]
+        window += self.__kernel[top - row + self.__radius:bottom - row + self.__radius,
+                                left - column + self.__radius:right - column + self.__radius]
+        # Tepe değeri yalnızca değişen pencereden güncellenir
+        self.__peak = max(self.__peak, float(window.max()))
+        self.__pixmap = None
+
+    def clear(self):
+        self.__grid[:] = 0
+        self.__peak = 0.0
+        self.__pixmap = None
+
+    @property
+    def pixmap(self):
+        """
+        Returns:
+            Izgara boyutunda, saydamlığı yoğunlukla artan renkli QPixmap (çizimde ölçeklenir)
+        """
+        if self.__pixmap is None:
+            density = self.__grid / self.__peak if self.__peak > 0 else self.__grid
+            levels = (255 * density).astype(np.uint8)
+
+            colored = cv2.applyColorMap(levels, getattr(cv2, 'COLORMAP_' + HeatmapConstants.COLORMAP))
+            rgba = np.dstack((cv2.cvtColor(colored, cv2.COLOR_BGR2RGB),
+                              np.minimum(255, levels.astype(np.uint16) * HeatmapConstants.ALPHA_GAIN)
+                              .astype(np.uint8)))
+
+            rows, columns = levels.shape
+            # QImage veriyi kopyalamaz; QPixmap'e dönüştürülene kadar rgba yaşamalı
+            image = QImage(rgba.data, columns, rows, 4 * columns, QImage.Format_RGBA8888)
+            self.__pixmap = QPixmap.fromImage(image)
+        return self.__pixmap
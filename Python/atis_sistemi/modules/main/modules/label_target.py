@@ -1,25 +1,37 @@
 from PyQt5 import QtCore, QtGui
-from PyQt5.QtCore import Qt, QPoint, QRect, pyqtSlot, pyqtSignal, QSize
-from PyQt5.QtGui import QPixmap, QPainter, QPen, QFont
+from PyQt5.QtCore import Qt, QPoint, QRect, pyqtSlot, pyqtSignal, QSize, QTimer
+from PyQt5.QtGui import QPixmap, QPainter, QPen, QFont, QImageReader
 from PyQt5.QtWidgets import QLabel
 
 from modules.common.constants import LabelCameraConstants
+from modules.main.modules.background_cache import BackgroundCache
 
 
 class LabelTarget(QLabel):
     pixmap_change_signal = pyqtSignal(QPixmap)
+    # Arka plan piramidi kurulum thread'inde bitince GUI thread'ine iletilir
+    background_ready_signal = pyqtSignal()
 
     def __init__(self, parent, width=1920, height=1080):
         super().__init__(parent=parent)
 
-        self.all_points = []
+        # Atış deposu (ve NumPy importu) ilk atışta oluşturulur
+        self.__shots = None
         self.selected_rows = []
 
         self.__size = QSize(width, height)
         self.__center = QPoint(width // 2, height // 2)
-        self.__target = QPixmap('images/target.png')
+        # Açılışta hedef ekran boyutunda okunur; yakınlaştırma için mip piramidi açılış bittikten
+        # sonra (veya ilk yakınlaştırmada) arka planda kurulur
+        self.__target_path = 'images/target.png'
+        self.__background = BackgroundCache(self.background_ready_signal.emit)
+        self.__background_pending = True
+        self.background_ready_signal.connect(self.__refresh_background)
         self.__bullet = QPixmap('images/bullet.png')
-        self.__temporary = self.__target.scaled(width, height, Qt.KeepAspectRatio)
+        self.__temporary = self.__read_scaled(self.__target_path, self.__size)
+        # Çizilen arka planın istenen boyutu (piramit bitince bu boyut yeniden alınır)
+        self.__background_size = self.__size
+        QTimer.singleShot(LabelCameraConstants.BACKGROUND_BUILD_DELAY_MS, self.__build_background)
 
         self.__scale_width = 1
         self.__scale_height = 1
@@ -28,12 +40,69 @@ class LabelTarget(QLabel):
 
         self.all_mode = True
         self.debug_mode = True
+        self.heatmap_mode = False
+        # Isı haritası (ve cv2/NumPy importu) ilk açıldığında mevcut atışlardan kurulur
+        self.__heatmap = None
+
+    @staticmethod
+    def __read_scaled(path, size):
+        reader = QImageReader(path)
+        if reader.size().isValid():
+            reader.setScaledSize(reader.size().scaled(size, Qt.KeepAspectRatio))
+        return QPixmap.fromImage(reader.read())
+
+    def __build_background(self):
+        if self.__background_pending:
+            self.__background_pending = False
+            self.__background.set_source(self.__target_path)
+            self.__background.put(self.__size, self.__temporary)
 
     def set_background(self, background_image):
-        self.__target = background_image
-        self.__temporary = self.__target.scaled(self.__size, Qt.KeepAspectRatio)
+        self.__background_pending = False
+        self.__background.set_source(background_image)
+        self.__background_size = self.__size
+        self.__temporary = self.__background.get(self.__size, self.__temporary)
         self.update()
 
+    @pyqtSlot()
+    def __refresh_background(self):
+        self.__temporary = self.__background.get(self.__background_size, self.__temporary)
+        self.update()
+
+    @property
+    def all_points(self):
+        """
+        Oturumdaki atışlar (ShotStore); tablo ve istatistikler de aynı depoyu okur.
+        """
+        if self.__shots is None:
+            from modules.common.shot_store import ShotStore
+
+            self.__shots = ShotStore()
+        return self.__shots
+
+    def add_shots(self, bundles, hits=None):
+        self.all_points.extend(bundles, hits)
+        if self.__heatmap is not None:
+            for shot in bundles:
+                self.__heatmap.add(shot[0][0] * self.__scale_width, shot[0][1] * self.__scale_height)
+
+    def clear_shots(self):
+        if self.__shots is not None:
+            self.__shots.clear()
+        self.selected_rows.clear()
+        if self.__heatmap is not None:
+            self.__heatmap.clear()
+
+    @property
+    def __heatmap_layer(self):
+        if self.__heatmap is None:
+            from modules.main.modules.heatmap import Heatmap
+
+            self.__heatmap = Heatmap(self.width(), self.height())
+            for x, y in self.all_points.points():
+                self.__heatmap.add(x * self.__scale_width, y * self.__scale_height)
+        return self.__heatmap
+
     def __setup_ui(self, size):
         font = QtGui.QFont()
         font.setPointSize(16)
@@ -45,21 +114,25 @@ class LabelTarget(QLabel):
         self.setAlignment(QtCore.Qt.AlignCenter)
 
     def wheelEvent(self, event: QtGui.QWheelEvent) -> None:
+        self.__build_background()
+
         scale_value = 25
         size = self.__temporary.size()
+        target = self.__background.size
 
         if event.angleDelta().y() > 0:
             size = QSize(size.width() + scale_value, size.height() + scale_value) if \
-                size.width() + scale_value < self.__target.width() and \
-                size.height() + scale_value < self.__target.height() else \
+                size.width() + scale_value < target.width() and \
+                size.height() + scale_value < target.height() else \
                 QSize(self.__size.width(), self.__size.height())
         elif event.angleDelta().y() < 0:
             size = QSize(size.width() - scale_value, size.height() - scale_value) if \
-                size.width() - scale_value > self.__target.width() // 2 and \
-                size.height() - scale_value > self.__target.height() // 2 else \
+                size.width() - scale_value > target.width() // 2 and \
+                size.height() - scale_value > target.height() // 2 else \
                 QSize(self.__size.width() // 2, self.__size.height() // 2)
 
-        self.__temporary = self.__target.scaled(size.width(), size.height(), Qt.KeepAspectRatio)
+        self.__background_size = size
+        self.__temporary = self.__background.get(size, self.__temporary)
         self.update()
 
     def paintEvent(self, event: QtGui.QPaintEvent) -> None:
@@ -75,15 +148,28 @@ class LabelTarget(QLabel):
                            self.__center.y() - self.__temporary.height() // 2,
                            self.__temporary)
 
-        for order, shot in enumerate(self.all_points) if self.all_mode else \
-                zip(self.selected_rows, [self.all_points[index] for index in self.selected_rows]):
+        # Isı haritasında tüm atışlar tek bir katman olarak çizilir; seçili atışlar üzerinde gösterilir
+        if self.heatmap_mode:
+            painter.drawPixmap(self.rect(), self.__heatmap_layer.pixmap)
+
+        if self.__shots is None:
+            shots = []
+        elif not self.all_mode:
+            shots = zip(self.selected_rows, [self.all_points[index] for index in self.selected_rows])
+        else:
+            shots = [] if self.heatmap_mode else enumerate(self.all_points)
+
+        for order, shot in shots:
             pos = QPoint(int(shot[0][0] * self.__scale_width), int(shot[0][1] * self.__scale_height))
             #pos = QPoint(100,100)
             painter.drawPixmap(QRect(QPoint(int(pos.x() - LabelCameraConstants.SIZE_BULLET_HOLE.width() / 2),
                                             int(pos.y() - LabelCameraConstants.SIZE_BULLET_HOLE.height() / 2)),
                                      LabelCameraConstants.SIZE_BULLET_HOLE), self.__bullet)
             if self.debug_mode:
-                painter.setPen(QPen(QtGui.QColor(240, 240, 160, 240), 4))
+                # Halka rengi atıcıyı gösterir (bir şeritte birden çok lazer rengi)
+                colors = LabelCameraConstants.SHOOTER_COLORS
+                shooter = shot[2] if len(shot) > 2 else 0
+                painter.setPen(QPen(QtGui.QColor(*colors[shooter % len(colors)]), 4))
                 painter.setFont(QFont('Consolas', 24))
 
                 painter.drawEllipse(pos,
@@ -98,6 +184,8 @@ class LabelTarget(QLabel):
     def init(self, size):
         self.__scale_width = self.width() / size['width']
         self.__scale_height = self.height() / size['height']
+        # Ölçek değişti; ısı haritası bir sonraki çizimde yeniden kurulur
+        self.__heatmap = None
 
     def update(self) -> None:
         super(LabelTarget, self).update()
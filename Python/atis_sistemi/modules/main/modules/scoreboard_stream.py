@@ -0,0 +1,97 @@
+import time
+
+from PyQt5.QtCore import QObject, QTimer, QBuffer, QIODevice, Qt, pyqtSlot
+from PyQt5.QtGui import QPixmap
+
+from modules.common.constants import ServiceConstants
+from modules.service import protocol
+from modules.service.server import ShotServer
+
+
+class ScoreboardStream(QObject):
+    """
+    Hedef ekranını skor tablolarına yayınlar.
+
+    Atışlar küçük SHOT mesajları (delta) olarak hemen gönderilir. Hedefin JPEG görüntüsü (KEYFRAME)
+    yalnızca değişiklik varsa belirli aralıklarla, KEYFRAME_SHOTS atışta bir ya da temizleme/arka plan
+    değişiminde kodlanır. Görüntü LabelTarget'ın zaten ürettiği pixmap'ten alınır, ek grab() yapılmaz;
+    her mesaj bir kez kodlanıp bütün izleyicilerle paylaşılır.
+    """
+
+    def __init__(self, label_target, host=ServiceConstants.HOST, port=ServiceConstants.SCOREBOARD_PORT,
+                 parent=None):
+        super().__init__(parent)
+
+        self.__server = ShotServer(host, port, None)
+        self.__server.start()
+
+        self.__pixmap = label_target.grab()
+        label_target.pixmap_change_signal.connect(self.__update_pixmap)
+        self.__label_target = label_target
+
+        self.__sequence = len(label_target.all_points)
+        self.__keyframe_sequence = -1
+        self.__dirty = True
+
+        self.__timer = QTimer(self)
+        self.__timer.setInterval(ServiceConstants.KEYFRAME_INTERVAL_MS)
+        self.__timer.timeout.connect(self.__keyframe_if_dirty)
+        self.__timer.start()
+
+        self.keyframe()
+
+    @property
+    def address(self):
+        return self.__server.address
+
+    @property
+    def viewers(self):
+        return self.__server.subscribers
+
+    @pyqtSlot(QPixmap)
+    def __update_pixmap(self, pixmap):
+        self.__pixmap = pixmap
+        self.__dirty = True
+
+    def init(self, size):
+        self.__server.publish(protocol.MSG_INIT, size['width'], size['height'])
+
+    def publish_shots(self, bundles):
+        now = time.time()
+        for bundle in bundles:
+            self.__sequence += 1
+            self.__server.publish(protocol.MSG_SHOT, self.__sequence, now, int(bundle[0][0]), int(bundle[0][1]),
+                                  bundle[2] if len(bundle) > 2 else 0)
+
+        if self.__sequence - self.__keyframe_sequence >= ServiceConstants.KEYFRAME_SHOTS:
+            self.keyframe()
+
+    def reset(self):
+        """
+        Atışlar temizlendi: sıra numarası sıfırlanır ve izleyiciler yeni görüntüyle baştan kurulur.
+        """
+        self.__sequence = 0
+        self.keyframe()
+
+    def keyframe(self):
+        pixmap = self.__pixmap
+        if pixmap.width() > ServiceConstants.SNAPSHOT_WIDTH:
+            pixmap = pixmap.scaledToWidth(ServiceConstants.SNAPSHOT_WIDTH, Qt.SmoothTransformation)
+
+        buffer = QBuffer()
+        buffer.open(QIODevice.WriteOnly)
+        pixmap.save(buffer, 'JPG', ServiceConstants.SNAPSHOT_QUALITY)
+
+        self.__server.publish(protocol.MSG_KEYFRAME, self.__sequence, pixmap.width(), pixmap.height(),
+                              data=bytes(buffer.data()))
+        self.__keyframe_sequence = self.__sequence
+        self.__dirty = False
+
+    def __keyframe_if_dirty(self):
+        if self.__dirty:
+            self.keyframe()
+
+    def stop(self):
+        self.__timer.stop()
+        self.__label_target.pixmap_change_signal.disconnect(self.__update_pixmap)
+        self.__server.stop()
@@ -1,15 +1,72 @@
 from PyQt5 import QtWidgets
-from PyQt5.QtCore import QRect
-from PyQt5.QtGui import QFont
-from PyQt5.QtWidgets import QTableWidget
+from PyQt5.QtCore import QRect, Qt, QAbstractTableModel, QModelIndex
+from PyQt5.QtGui import QFont, QBrush
+from PyQt5.QtWidgets import QTableView
 
 from modules.common.constants import MainUIConstants, TableShotsConstants
 
 
-class TableShots(QTableWidget):
+class ShotTableModel(QAbstractTableModel):
+    """
+    Atış deposunu (ShotStore) satır kopyalamadan gösteren model; yalnızca görünen hücreler okunur.
+    """
+
+    HEADERS = ('Time', 'Shooter', 'Success')
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        self.__store = None
+        self.__rows = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.__rows
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole:
+            return self.HEADERS[section] if orientation == Qt.Horizontal else str(section + 1)
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= self.__rows:
+            return None
+
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        if index.column() == 0 and role == Qt.DisplayRole:
+            return self.__store[index.row()][1]
+        if index.column() == 1 and role == Qt.DisplayRole:
+            return str(self.__store.shooter(index.row()) + 1)
+        if index.column() == 2 and role == Qt.BackgroundRole:
+            return QBrush(Qt.green if self.__store.hit(index.row()) else Qt.red)
+        return None
+
+    def refresh(self, store):
+        """
+        Depoya eklenen atışları tek bir satır ekleme bildirimiyle gösterir.
+        """
+        self.__store = store
+        if len(store) > self.__rows:
+            self.beginInsertRows(QModelIndex(), self.__rows, len(store) - 1)
+            self.__rows = len(store)
+            self.endInsertRows()
+
+    def clear(self):
+        self.beginResetModel()
+        self.__rows = 0
+        self.endResetModel()
+
+
+class TableShots(QTableView):
     def __init__(self, parent):
         super().__init__(parent=parent)
 
+        self.__model = ShotTableModel(self)
+        self.setModel(self.__model)
+
         self.__setup_ui()
 
     def __setup_ui(self):
@@ -18,20 +75,12 @@ class TableShots(QTableWidget):
 
         self.setGeometry(QRect(TableShotsConstants.INIT_POINT_TABLE_SHOTS, TableShotsConstants.SIZE_TABLE_SHOTS))
         self.setFont(font)
-        self.setColumnCount(2)
-        # self.setColumnCount(4)
-        # self.setHorizontalHeaderItem(0, QtWidgets.QTableWidgetItem('X'))
-        # self.setHorizontalHeaderItem(1, QtWidgets.QTableWidgetItem('Y'))
-        self.setHorizontalHeaderItem(0, QtWidgets.QTableWidgetItem('Time'))
-        self.setHorizontalHeaderItem(1, QtWidgets.QTableWidgetItem('Success'))
-        self.verticalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Stretch)
+        # Satır yükseklikleri sabit: uzun oturumlarda her eklemede bütün satırlar yeniden ölçülmez
+        self.verticalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Fixed)
         self.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Stretch)
 
-    def clear(self) -> None:
-        super().clear()
+    def refresh(self, store):
+        self.__model.refresh(store)
 
-        self.setRowCount(0)
-        # self.setHorizontalHeaderItem(0, QtWidgets.QTableWidgetItem('X'))
-        # self.setHorizontalHeaderItem(1, QtWidgets.QTableWidgetItem('Y'))
-        self.setHorizontalHeaderItem(0, QtWidgets.QTableWidgetItem('Time'))
-        self.setHorizontalHeaderItem(1, QtWidgets.QTableWidgetItem('Success'))
+    def clear(self) -> None:
+        self.__model.clear()
@@ -0,0 +1,93 @@
+import queue
+import threading
+import time
+
+import numpy as np
+
+from modules.common.constants import CalibrationConstants
+from modules.perspective.perspective import find_target_quad
+
+
+class CalibrationWorker:
+    """
+    Canlı frame'ler üzerinde arka plan thread'inde çalışan kalibrasyon iskeleti.
+
+    Kamera döngüsü submit() ile frame verir; thread meşgulse frame atlanır, döngü hiç beklemez.
+    Alt sınıflar _process() ile frame'leri işler, _result() ile sonucu üretir. Sonuç (veya zaman
+    aşımında / iptalde None) callback ile bildirilir; callback bu thread'de çağrılır.
+    """
+
+    def __init__(self, callback, timeout):
+        self.__callback = callback
+        self.__timeout = timeout
+        self.__queue = queue.Queue(maxsize=1)
+
+        self.isRunning = True
+        self.__thread = threading.Thread(target=self.__run, name=type(self).__name__, daemon=True)
+        self.__thread.start()
+
+    def submit(self, frame):
+        try:
+            self.__queue.put_nowait(frame.copy())
+        except queue.Full:
+            pass
+
+    def cancel(self):
+        self.isRunning = False
+
+    def _process(self, frame):
+        """
+        Returns:
+            Yeterli veri toplandıysa True
+        """
+        pass
+
+    def _result(self):
+        pass
+
+    def __run(self):
+        deadline = time.time() + self.__timeout
+        done = False
+
+        while self.isRunning and time.time() < deadline and not done:
+            try:
+                frame = self.__queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            done = self._process(frame)
+
+        self.isRunning = False
+        self.__callback(self._result() if done else None)
+
+
+class AutoCalibration(CalibrationWorker):
+    """
+    Hedef köşelerini canlı frame'lerden bulur ve birkaç frame üzerinden ortalar.
+    """
+
+    def __init__(self, callback, frames=CalibrationConstants.AUTO_FRAMES,
+                 timeout=CalibrationConstants.AUTO_TIMEOUT_S):
+        self.__frames = frames
+        self.__quads = list()
+
+        super().__init__(callback, timeout)
+
+    @staticmethod
+    def average(quads):
+        """
+        Köşeleri medyana göre OUTLIER_DISTANCE'tan uzak olan frame'leri atarak ortalar.
+        """
+        quads = np.float32(quads)
+        median = np.median(quads, axis=0)
+        distances = np.linalg.norm(quads - median, axis=2).max(axis=1)
+        inliers = quads[distances <= CalibrationConstants.OUTLIER_DISTANCE]
+        return (inliers if len(inliers) > 0 else median[np.newaxis]).mean(axis=0)
+
+    def _process(self, frame):
+        quad = find_target_quad(frame)
+        if quad is not None:
+            self.__quads.append(quad)
+        return len(self.__quads) >= self.__frames
+
+    def _result(self):
+        return self.average(self.__quads)
@@ -0,0 +1,56 @@
+import time
+
+import cv2
+import numpy as np
+
+from modules.common.constants import CalibrationConstants
+from modules.perspective.auto_calibration import CalibrationWorker
+
+
+class LensCalibration(CalibrationWorker):
+    """
+    Satranç tahtası görüntülerinden kamera matrisi ve lens distorsiyon katsayılarını hesaplar.
+
+    Farklı açılardan görüntü toplanabilmesi için iki kabul edilen görüntü arasında en az
+    LENS_INTERVAL_S beklenir. Sonuç {'camera_matrix', 'distortion', 'rms'} sözlüğüdür.
+    """
+
+    def __init__(self, callback, frames=CalibrationConstants.LENS_FRAMES,
+                 timeout=CalibrationConstants.LENS_TIMEOUT_S):
+        self.__frames = frames
+        self.__image_points = list()
+        self.__image_size = None
+        self.__last_view = 0
+
+        columns, rows = CalibrationConstants.CHESSBOARD_SIZE
+        self.__object_points = np.zeros((rows * columns, 3), np.float32)
+        self.__object_points[:, :2] = np.mgrid[0:columns, 0:rows].T.reshape(-1, 2)
+
+        super().__init__(callback, timeout)
+
+    def _process(self, frame):
+        if time.time() - self.__last_view < CalibrationConstants.LENS_INTERVAL_S:
+            return False
+
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        found, corners = cv2.findChessboardCorners(gray, CalibrationConstants.CHESSBOARD_SIZE,
+                                                   cv2.CALIB_CB_ADAPTIVE_THRESH + cv2.CALIB_CB_NORMALIZE_IMAGE +
+                                                   cv2.CALIB_CB_FAST_CHECK)
+        if not found:
+            return False
+
+        criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER,
+                    CalibrationConstants.SUBPIX_ITERATIONS, CalibrationConstants.SUBPIX_EPSILON)
+        self.__image_points.append(cv2.cornerSubPix(gray, corners, (11, 11), (-1, -1), criteria))
+        self.__image_size = gray.shape[::-1]
+        self.__last_view = time.time()
+        return len(self.__image_points) >= self.__frames
+
+    def _result(self):
+        rms, camera_matrix, distortion, _, _ = cv2.calibrateCamera(
+            [self.__object_points] * len(self.__image_points), self.__image_points, self.__image_size, None, None)
+        return {
+            'camera_matrix': camera_matrix,
+            'distortion': distortion.ravel(),
+            'rms': rms,
+        }
@@ -1,6 +1,8 @@
 import cv2
 import numpy as np
 
+from modules.common.constants import CalibrationConstants
+
 
 def order_points(points):
     x_sorted = points[np.argsort(points[:, 0]), :]
@@ -20,10 +22,125 @@ class Perspective:
         self.__static_points = np.float32([[0, 0], [width - 1, 0], [width - 1, height - 1], [0, height - 1]])
         self.__matrix = cv2.getPerspectiveTransform(self.__static_points, self.__static_points)
 
+        # Lens kalibrasyonu varsa (kamera matrisi, distorsiyon) ve birleşik remap tabloları
+        self.__intrinsics = None
+        self.__maps = None
+
     def set_matrix(self, points=None):
         if points is None:
             points = self.__static_points
         self.__matrix = cv2.getPerspectiveTransform(order_points(points), self.__static_points)
+        self.__build_maps()
+
+    @property
+    def matrix(self):
+        return self.__matrix
+
+    @property
+    def maps(self):
+        return self.__maps
+
+    def restore(self, matrix, camera_matrix=None, distortion=None, maps=None):
+        """
+        Profilden kaydedilmiş durumu yükler. Remap tabloları verilirse (örn. bellek eşlemeli .npy)
+        yeniden hesaplanmaz.
+        """
+        self.__matrix = np.float64(matrix)
+        self.__intrinsics = None if camera_matrix is None else (np.float64(camera_matrix), np.float64(distortion))
+        if maps is not None and self.__intrinsics is not None:
+            self.__maps = maps
+        else:
+            self.__build_maps()
+
+    def set_intrinsics(self, camera_matrix=None, distortion=None):
+        """
+        Lens distorsiyonu düzeltmesini açar (camera_matrix None ise kapatır).
+        Homografi noktaları distorsiyonu giderilmiş görüntü koordinatlarında olmalıdır.
+        """
+        if camera_matrix is None:
+            self.__intrinsics = None
+        else:
+            self.__intrinsics = (np.float64(camera_matrix), np.float64(distortion))
+        self.__build_maps()
+
+    def undistort_points(self, points):
+        """
+        Ham kamera görüntüsündeki noktaları distorsiyonu giderilmiş koordinatlara çevirir.
+        """
+        if self.__intrinsics is None:
+            return points
+        camera_matrix, distortion = self.__intrinsics
+        return cv2.undistortPoints(np.float32(points).reshape(-1, 1, 2), camera_matrix, distortion,
+                                   P=camera_matrix).reshape(-1, 2)
+
+    def __build_maps(self):
+        if self.__intrinsics is None:
+            self.__maps = None
+            return
+
+        # Çıkış pikseli q için kaynak: distort(K^-1 * H^-1 * q). initUndistortRectifyMap ters dönüşüm
+        # olarak (newCameraMatrix * R)^-1 kullandığından newCameraMatrix = H * K, R = I verilir;
+        # böylece distorsiyon düzeltme ve perspektif tek bir remap tablosunda birleşir
+        camera_matrix, distortion = self.__intrinsics
+        maps = cv2.initUndistortRectifyMap(camera_matrix, distortion, np.eye(3), self.__matrix @ camera_matrix,
+                                           (self.__width, self.__height), cv2.CV_16SC2)
+        self.__maps = maps
 
     def get_wrap(self, frame):
+        maps = self.__maps
+        if maps is not None:
+            return cv2.remap(frame, maps[0], maps[1], cv2.INTER_LINEAR)
         return cv2.warpPerspective(frame, self.__matrix, (self.__width, self.__height))
+
+
+def _aruco_quad(gray):
+    dictionary = cv2.aruco.getPredefinedDictionary(getattr(cv2.aruco, CalibrationConstants.ARUCO_DICTIONARY))
+    if hasattr(cv2.aruco, 'ArucoDetector'):
+        corners, ids, _ = cv2.aruco.ArucoDetector(dictionary).detectMarkers(gray)
+    else:
+        corners, ids, _ = cv2.aruco.detectMarkers(gray, dictionary)
+
+    if ids is None:
+        return None
+    centers = {int(marker_id): marker.reshape(4, 2).mean(axis=0) for marker_id, marker in zip(ids.ravel(), corners)}
+    if not all(marker_id in centers for marker_id in range(4)):
+        return None
+    return np.float32([centers[marker_id] for marker_id in range(4)])
+
+
+def _contour_quad(gray):
+    edges = cv2.Canny(cv2.GaussianBlur(gray, (5, 5), 0), 50, 150)
+    edges = cv2.dilate(edges, None)
+    contours, _ = cv2.findContours(edges, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)
+
+    min_area = CalibrationConstants.MIN_AREA_RATIO * gray.shape[0] * gray.shape[1]
+    for contour in sorted(contours, key=cv2.contourArea, reverse=True):
+        if cv2.contourArea(contour) < min_area:
+            break
+        approx = cv2.approxPolyDP(contour, CalibrationConstants.APPROX_EPSILON * cv2.arcLength(contour, True), True)
+        if len(approx) == 4 and cv2.isContourConvex(approx):
+            return order_points(approx.reshape(4, 2).astype(np.float32))
+    return None
+
+
+def find_target_quad(frame):
+    """
+    Frame içinde hedef dörtgenini bulur: önce ArUco işaretçileri (0-3), yoksa en büyük dışbükey
+    dörtgen kontur.
+    Köşeler alt piksel doğruluğunda iyileştirilir.
+
+    Returns:
+        Sol üst, sağ üst, sağ alt, sol alt sırasında (4, 2) float32 köşeler veya bulunamazsa None
+    """
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+    quad = _aruco_quad(gray) if hasattr(cv2, 'aruco') else None
+    if quad is None:
+        quad = _contour_quad(gray)
+    if quad is None:
+        return None
+
+    criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER,
+                CalibrationConstants.SUBPIX_ITERATIONS, CalibrationConstants.SUBPIX_EPSILON)
+    return cv2.cornerSubPix(gray, quad.reshape(-1, 1, 2), CalibrationConstants.SUBPIX_WINDOW, (-1, -1),
+                            criteria).reshape(4, 2)
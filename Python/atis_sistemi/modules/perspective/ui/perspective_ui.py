@@ -9,6 +9,7 @@ from modules.common.statics import Statics
 
 class PerspectiveUI(QtWidgets.QDialog):
     perspective_change_signal = pyqtSignal(np.ndarray)
+    auto_calibration_signal = pyqtSignal()
 
     def __init__(self):
         super().__init__()
@@ -101,6 +102,11 @@ class PerspectiveUI(QtWidgets.QDialog):
         self.button_clear.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
         self.horizontalLayout_buttons.addWidget(self.button_clear)
 
+        self.button_auto = QtWidgets.QPushButton(self.horizontalLayoutWidget)
+        self.button_auto.setFont(font)
+        self.button_auto.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        self.horizontalLayout_buttons.addWidget(self.button_auto)
+
         self.button_cancel = QtWidgets.QPushButton(self.horizontalLayoutWidget)
         self.button_cancel.setFont(font)
         self.button_cancel.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
@@ -113,6 +119,7 @@ class PerspectiveUI(QtWidgets.QDialog):
         self.horizontalLayout.addLayout(self.horizontalLayout_buttons)
 
         self.button_clear.clicked.connect(self.__clear)
+        self.button_auto.clicked.connect(self.__auto)
         self.button_cancel.clicked.connect(self.__cancel)
         self.button_calibrate.clicked.connect(self.__calibrate)
 
@@ -131,6 +138,7 @@ class PerspectiveUI(QtWidgets.QDialog):
         self.label_point4_text.setText(_translate("Dialog", "Point 4:"))
         self.label_point4.setText(_translate("Dialog", "0, 540"))
         self.button_clear.setText(_translate("Dialog", "Clear"))
+        self.button_auto.setText(_translate("Dialog", "Auto"))
         self.button_cancel.setText(_translate("Dialog", "Close"))
         self.button_calibrate.setText(_translate("Dialog", "Calibrate"))
 
@@ -149,6 +157,26 @@ class PerspectiveUI(QtWidgets.QDialog):
     def __cancel(self):
         self.close()
 
+    def __auto(self):
+        self.button_auto.setEnabled(False)
+        self.label_camera.points.clear()
+        self.auto_calibration_signal.emit()
+
+    def show_calibrated(self, points):
+        """
+        Otomatik kalibrasyon sonucunu (kamera koordinatlarında köşeler veya None) gösterir.
+        """
+        self.button_auto.setEnabled(True)
+
+        if points is None:
+            QMessageBox.about(self, "Warning", "Target could not be found.")
+            return
+
+        labels = [self.label_point1, self.label_point2, self.label_point3, self.label_point4]
+        for label, point in zip(labels, points):
+            label.setText('{}, {}'.format(int(point[0] * self.__scale_width), int(point[1] * self.__scale_height)))
+        self.button_calibrate.setEnabled(False)
+
     def __calibrate(self):
         if len(self.label_camera.points) == 4:
             self.perspective_change_signal.emit(np.float32([[
@@ -0,0 +1,78 @@
+import argparse
+import os
+import socket
+
+from modules.common.constants import ServiceConstants
+from modules.service import protocol
+
+
+class ShotClient:
+    """
+    ShotServer için basit yerel istemci (Unreal / skor tablosu yerine testlerde kullanılır).
+    """
+
+    def __init__(self, host=ServiceConstants.HOST, port=ServiceConstants.PORT, unix_socket_path=None,
+                 topics=protocol.TOPIC_ALL, timeout=None):
+        if unix_socket_path is not None:
+            self.__socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.__socket.connect(unix_socket_path)
+        else:
+            self.__socket = socket.create_connection((host, port))
+        self.__socket.settimeout(timeout)
+        self.__reader = protocol.MessageReader()
+
+        self.subscribe(topics)
+
+    def subscribe(self, topics):
+        self.__socket.sendall(protocol.encode(protocol.MSG_SUBSCRIBE, topics))
+
+    def messages(self):
+        """
+        Sunucudan gelen mesajları (tip, değerler) olarak üretir; bağlantı kapanınca biter.
+
+        Raises:
+            protocol.ProtocolError: Sunucu farklı bir protokol sürümü kullanıyorsa
+        """
+        while True:
+            try:
+                data = self.__socket.recv(4096)
+            except socket.timeout:
+                return
+            if not data:
+                return
+            for msg_type, payload in self.__reader.feed(data):
+                if msg_type in protocol.PAYLOADS:
+                    yield msg_type, protocol.decode(msg_type, payload)
+
+    def close(self):
+        self.__socket.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Print shot events published by the detection service.')
+    parser.add_argument('--host', default=ServiceConstants.HOST)
+    parser.add_argument('--port', type=int, default=ServiceConstants.PORT)
+    parser.add_argument('--unix', default=None)
+    parser.add_argument('--snapshots', default=None, help='directory to save target keyframes as JPEG')
+    args = parser.parse_args()
+
+    client = ShotClient(args.host, args.port, args.unix)
+    try:
+        for msg_type, values in client.messages():
+            if msg_type == protocol.MSG_SHOT:
+                print('Shot #{} by shooter {} at ({}, {}) t={:.3f}'.format(values[0], values[4] + 1, values[2],
+                                                                         values[3], values[1]))
+            elif msg_type == protocol.MSG_INIT:
+                print('Camera {}x{}'.format(*values))
+            elif msg_type == protocol.MSG_STATUS:
+                print('FPS: {:.3f} dropped: {} quality level: {}'.format(*values))
+            elif msg_type == protocol.MSG_KEYFRAME:
+                print('Keyframe after shot #{} ({}x{}, {} bytes)'.format(*values[:3], len(values[3])))
+                if args.snapshots is not None:
+                    os.makedirs(args.snapshots, exist_ok=True)
+                    with open('{}/keyframe{:06d}.jpg'.format(args.snapshots, values[0]), 'wb') as outfile:
+                        outfile.write(values[3])
+    except KeyboardInterrupt:
+        pass
+    finally:
+        client.close()
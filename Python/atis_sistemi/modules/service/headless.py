@@ -0,0 +1,50 @@
+import time
+
+from modules.common.camera_loop import CameraLoop
+from modules.common.constants import CameraConstants
+from modules.service import protocol
+from modules.service.server import ShotServer
+
+
+class HeadlessWork(CameraLoop):
+    """
+    QApplication olmadan çalışan tespit servisi; atışları ShotServer üzerinden yayınlar.
+    """
+
+    def __init__(self, server, camera_id=CameraConstants.CAMERA_ID, camera_fps=CameraConstants.CAMERA_FPS,
+                 camera_width=CameraConstants.CAMERA_WIDTH, camera_height=CameraConstants.CAMERA_HEIGHT):
+        super().__init__(camera_id, camera_fps, camera_width, camera_height)
+
+        self.__server = server
+        self.__sequence = 0
+        self.__status_time = 0
+
+        self.isDetectionRunning = True
+
+    def _on_init(self, size):
+        self.__server.publish(protocol.MSG_INIT, size['width'], size['height'])
+
+    def _on_detected(self, bundle):
+        self.__sequence += 1
+        point = bundle[0]
+        self.__server.publish(protocol.MSG_SHOT, self.__sequence, time.time(), int(point[0]), int(point[1]),
+                              bundle[2])
+
+    def _on_fps(self, fps):
+        # FPS her frame'de hesaplanır, aboneler saniyede bir bilgilendirilir
+        if time.time() - self.__status_time > 1:
+            self.__status_time = time.time()
+            self.__server.publish(protocol.MSG_STATUS, fps, self.__server.dropped, self.governor.level)
+
+
+def run_headless(camera_id, host, port, unix_socket_path=None):
+    server = ShotServer(host, port, unix_socket_path)
+    server.start()
+
+    worker = HeadlessWork(server, camera_id)
+    try:
+        worker.run()
+    except KeyboardInterrupt:
+        worker.isWorkerAlive = False
+    finally:
+        server.stop()
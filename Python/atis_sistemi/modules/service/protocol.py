@@ -0,0 +1,95 @@
+import struct
+
+# Her mesaj: 1 byte tip + 4 byte uzunluk başlığı, ardından payload. Payload sabit boyutludur;
+# VARIABLE tiplerde sabit kısmı değişken uzunluklu veri (örn. JPEG) izler.
+HEADER = struct.Struct('<BI')
+
+# El sıkışma mesajlarının (VERSIONED) ilk byte'ı protokol sürümüdür; alan düzeni değiştiğinde artırılır.
+VERSION = 2
+
+MSG_SUBSCRIBE = 1
+MSG_INIT = 2
+MSG_SHOT = 3
+MSG_STATUS = 4
+MSG_KEYFRAME = 5
+
+TOPIC_SHOTS = 0x01
+TOPIC_STATUS = 0x02
+TOPIC_SNAPSHOTS = 0x04
+TOPIC_ALL = TOPIC_SHOTS | TOPIC_STATUS | TOPIC_SNAPSHOTS
+
+PAYLOADS = {
+    MSG_SUBSCRIBE: struct.Struct('<BB'),     # version, topics
+    MSG_INIT: struct.Struct('<BHH'),         # version, width, height
+    MSG_SHOT: struct.Struct('<IdiiB'),       # seq, timestamp, x, y, shooter
+    MSG_STATUS: struct.Struct('<fIB'),       # fps, dropped, quality level
+    MSG_KEYFRAME: struct.Struct('<BIHH'),    # version, last shot seq, width, height + JPEG
+}
+
+VARIABLE = {MSG_KEYFRAME}
+VERSIONED = {MSG_SUBSCRIBE, MSG_INIT, MSG_KEYFRAME}
+
+TOPICS = {
+    MSG_INIT: TOPIC_ALL,
+    MSG_SHOT: TOPIC_SHOTS,
+    MSG_STATUS: TOPIC_STATUS,
+    MSG_KEYFRAME: TOPIC_SNAPSHOTS,
+}
+
+
+class ProtocolError(ValueError):
+    pass
+
+
+def encode(msg_type, *values, data=b''):
+    """
+    VERSIONED tiplerde sürüm byte'ı otomatik eklenir; values yalnızca diğer alanlardır.
+    """
+    if msg_type in VERSIONED:
+        values = (VERSION,) + values
+    payload = PAYLOADS[msg_type].pack(*values) + data
+    return HEADER.pack(msg_type, len(payload)) + payload
+
+
+def decode(msg_type, payload):
+    """
+    Returns:
+        Sabit alanlar (sürüm byte'ı hariç); VARIABLE tiplerde sonuna değişken uzunluklu veri (bytes) eklenir
+
+    Raises:
+        ProtocolError: Payload boyutu tutmuyorsa veya karşı tarafın protokol sürümü farklıysa
+    """
+    fixed = PAYLOADS[msg_type]
+    if len(payload) < fixed.size or (msg_type not in VARIABLE and len(payload) != fixed.size):
+        raise ProtocolError('message {} has {} bytes, expected {}'.format(msg_type, len(payload), fixed.size))
+
+    values = fixed.unpack_from(payload)
+    if msg_type in VERSIONED:
+        if values[0] != VERSION:
+            raise ProtocolError('protocol version {} is not supported (expected {})'.format(values[0], VERSION))
+        values = values[1:]
+    if msg_type in VARIABLE:
+        values += (payload[fixed.size:],)
+    return values
+
+
+class MessageReader:
+    """
+    Akış halinde gelen byte'ları tam mesajlara böler.
+    """
+
+    def __init__(self):
+        self.__buffer = bytearray()
+
+    def feed(self, data):
+        self.__buffer.extend(data)
+
+        messages = list()
+        while len(self.__buffer) >= HEADER.size:
+            msg_type, length = HEADER.unpack_from(self.__buffer)
+            if len(self.__buffer) < HEADER.size + length:
+                break
+            payload = bytes(self.__buffer[HEADER.size:HEADER.size + length])
+            del self.__buffer[:HEADER.size + length]
+            messages.append((msg_type, payload))
+        return messages
@@ -0,0 +1,212 @@
+import os
+import selectors
+import socket
+import threading
+from collections import deque
+
+from modules.common.constants import ServiceConstants
+from modules.service import protocol
+
+
+class Subscriber:
+    def __init__(self, connection, queue_size):
+        self.connection = connection
+        self.topics = 0
+        self.reader = protocol.MessageReader()
+        self.queue = deque(maxlen=queue_size)
+        self.pending = b''
+        self.dropped = 0
+
+
+class ShotServer:
+    """
+    Atış olaylarını yerel TCP veya Unix soketi üzerinden abonelere yayınlar.
+
+    Her abone için sınırlı bir gönderim kuyruğu tutulur; yavaş abonenin kuyruğu dolarsa
+    en eski mesajlar atılır (dropped sayacı artar), tespit döngüsü asla beklemez.
+
+    Her mesaj bir kez kodlanır ve aynı bytes nesnesi bütün abonelerin kuyruğuna eklenir. Son hedef
+    görüntüsü (KEYFRAME) ve ondan sonraki atışlar (delta) saklanır; sonradan bağlanan skor tablosu
+    önce bunları alır, ardından yalnızca yeni atışları.
+    """
+
+    def __init__(self, host=ServiceConstants.HOST, port=ServiceConstants.PORT,
+                 unix_socket_path=ServiceConstants.UNIX_SOCKET_PATH, queue_size=ServiceConstants.QUEUE_SIZE):
+        self.__queue_size = queue_size
+        self.__unix_socket_path = unix_socket_path
+        self.__selector = selectors.DefaultSelector()
+        self.__subscribers = dict()
+        self.__lock = threading.Lock()
+        self.__latest = dict()
+        self.__deltas = deque(maxlen=queue_size)
+        self.__alive = False
+        self.__thread = None
+
+        if unix_socket_path is not None:
+            if os.path.exists(unix_socket_path):
+                os.remove(unix_socket_path)
+            self.__listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.__listener.bind(unix_socket_path)
+        else:
+            self.__listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.__listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self.__listener.bind((host, port))
+        self.__listener.listen(ServiceConstants.BACKLOG)
+        self.__listener.setblocking(False)
+
+        self.__wake_reader, self.__wake_writer = socket.socketpair()
+        self.__wake_reader.setblocking(False)
+
+        self.__selector.register(self.__listener, selectors.EVENT_READ, self.__accept)
+        self.__selector.register(self.__wake_reader, selectors.EVENT_READ, self.__drain_wake)
+
+    @property
+    def address(self):
+        return self.__listener.getsockname()
+
+    @property
+    def dropped(self):
+        with self.__lock:
+            return sum(subscriber.dropped for subscriber in self.__subscribers.values())
+
+    def start(self):
+        self.__alive = True
+        self.__thread = threading.Thread(target=self.__serve, name='ShotServer', daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        self.__alive = False
+        self.__wake()
+        if self.__thread is not None:
+            self.__thread.join()
+
+        for subscriber in list(self.__subscribers.values()):
+            self.__close(subscriber)
+        self.__selector.close()
+        self.__listener.close()
+        self.__wake_reader.close()
+        self.__wake_writer.close()
+
+        if self.__unix_socket_path is not None and os.path.exists(self.__unix_socket_path):
+            os.remove(self.__unix_socket_path)
+
+    @property
+    def subscribers(self):
+        with self.__lock:
+            return len(self.__subscribers)
+
+    def publish(self, msg_type, *values, data=b''):
+        self.publish_raw(msg_type, protocol.encode(msg_type, *values, data=data))
+
+    def publish_raw(self, msg_type, message):
+        topic = protocol.TOPICS[msg_type]
+
+        with self.__lock:
+            # Yeni abonelere gönderilmek üzere tipinin son mesajı saklanır (örn. INIT)
+            self.__latest[msg_type] = message
+            if msg_type == protocol.MSG_KEYFRAME:
+                self.__deltas.clear()
+            elif msg_type == protocol.MSG_SHOT and protocol.MSG_KEYFRAME in self.__latest:
+                self.__deltas.append(message)
+            for subscriber in self.__subscribers.values():
+                if subscriber.topics & topic:
+                    if len(subscriber.queue) == subscriber.queue.maxlen:
+                        subscriber.dropped += 1
+                    subscriber.queue.append(message)
+        self.__wake()
+
+    def __wake(self):
+        try:
+            self.__wake_writer.send(b'\0')
+        except (BlockingIOError, OSError):
+            pass
+
+    def __drain_wake(self, sock, mask):
+        try:
+            while sock.recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def __accept(self, sock, mask):
+        connection, _ = sock.accept()
+        connection.setblocking(False)
+
+        subscriber = Subscriber(connection, self.__queue_size)
+        with self.__lock:
+            self.__subscribers[connection] = subscriber
+        self.__selector.register(connection, selectors.EVENT_READ, self.__handle)
+
+    def __handle(self, connection, mask):
+        subscriber = self.__subscribers[connection]
+
+        if mask & selectors.EVENT_READ:
+            try:
+                data = connection.recv(4096)
+            except (ConnectionError, OSError):
+                data = b''
+            if not data:
+                self.__close(subscriber)
+                return
+
+            for msg_type, payload in subscriber.reader.feed(data):
+                if msg_type == protocol.MSG_SUBSCRIBE:
+                    # Farklı sürümdeki istemci mesajları yanlış çözeceği için bağlantısı kapatılır
+                    try:
+                        topics, = protocol.decode(msg_type, payload)
+                    except protocol.ProtocolError:
+                        self.__close(subscriber)
+                        return
+                    with self.__lock:
+                        subscriber.topics = topics
+                        if protocol.MSG_INIT in self.__latest:
+                            subscriber.queue.appendleft(self.__latest[protocol.MSG_INIT])
+                        # Hedefin son hali ve ondan sonraki atışlarla izleyici güncel duruma gelir
+                        if topics & protocol.TOPIC_SNAPSHOTS and protocol.MSG_KEYFRAME in self.__latest:
+                            subscriber.queue.append(self.__latest[protocol.MSG_KEYFRAME])
+                            subscriber.queue.extend(self.__deltas)
+
+        if mask & selectors.EVENT_WRITE:
+            self.__flush(subscriber)
+
+    def __flush(self, subscriber):
+        while True:
+            if not subscriber.pending:
+                with self.__lock:
+                    if len(subscriber.queue) == 0:
+                        return
+                    subscriber.pending = subscriber.queue.popleft()
+            try:
+                sent = subscriber.connection.send(subscriber.pending)
+            except BlockingIOError:
+                return
+            except (ConnectionError, OSError):
+                self.__close(subscriber)
+                return
+            subscriber.pending = subscriber.pending[sent:]
+
+    def __close(self, subscriber):
+        with self.__lock:
+            self.__subscribers.pop(subscriber.connection, None)
+        try:
+            self.__selector.unregister(subscriber.connection)
+        except (KeyError, ValueError):
+            pass
+        subscriber.connection.close()
+
+    def __serve(self):
+        while self.__alive:
+            # Gönderilecek verisi olan abonelerin yazma olayını dinle
+            with self.__lock:
+                subscribers = list(self.__subscribers.values())
+            for subscriber in subscribers:
+                events = selectors.EVENT_READ
+                if subscriber.pending or len(subscriber.queue) > 0:
+                    events |= selectors.EVENT_WRITE
+                try:
+                    self.__selector.modify(subscriber.connection, events, self.__handle)
+                except (KeyError, ValueError):
+                    pass
+
+            for key, mask in self.__selector.select(timeout=0.5):
+                key.data(key.fileobj, mask)
@@ -0,0 +1,52 @@
+import threading
+import time
+
+from modules.common.capture import SyntheticCapture
+from modules.common.synthetic import SyntheticShots
+from modules.service import protocol
+from modules.service.client import ShotClient
+from modules.service.headless import HeadlessWork
+from modules.service.server import ShotServer
+
+WIDTH, HEIGHT, FPS = 640, 480, 60
+SECONDS = 3
+SEED = 1234
+
+
+def test_headless_publishes_shots_and_status():
+    server = ShotServer('127.0.0.1', 0, None)
+    server.start()
+    client = ShotClient(port=server.address[1], timeout=1.0)
+
+    shots = SyntheticShots(WIDTH, HEIGHT, FPS, shot_rate=5.0, seed=SEED)
+    worker = HeadlessWork(server, SyntheticCapture(FPS, WIDTH, HEIGHT, shots), FPS, WIDTH, HEIGHT)
+    thread = threading.Thread(target=worker.run, name='HeadlessTest')
+    try:
+        thread.start()
+        time.sleep(SECONDS)
+    finally:
+        worker.isWorkerAlive = False
+        thread.join()
+
+    try:
+        messages = list(client.messages())
+    finally:
+        client.close()
+        server.stop()
+
+    assert messages[0] == (protocol.MSG_INIT, (WIDTH, HEIGHT))
+
+    shot_values = [values for msg_type, values in messages if msg_type == protocol.MSG_SHOT]
+    assert len(shot_values) > 0
+    assert [values[0] for values in shot_values] == list(range(1, len(shot_values) + 1))
+    for _, _, x, y, shooter in shot_values:
+        assert 0 <= x < WIDTH and 0 <= y < HEIGHT
+        assert shooter == 0
+
+    status_values = [values for msg_type, values in messages if msg_type == protocol.MSG_STATUS]
+    assert len(status_values) > 0
+    # İlk durum mesajı ilk frame'de, FPS henüz ölçülmeden yayınlanır
+    assert status_values[-1][0] > 0
+    for fps, dropped, level in status_values:
+        assert dropped == 0
+        assert 0 <= level <= worker.governor.max_level
@@ -0,0 +1,57 @@
+import pytest
+
+from modules.service import protocol
+
+MESSAGES = [
+    (protocol.MSG_SUBSCRIBE, (protocol.TOPIC_ALL,), b''),
+    (protocol.MSG_INIT, (1920, 1080), b''),
+    (protocol.MSG_SHOT, (7, 1234.5, 640, 360, 1), b''),
+    (protocol.MSG_STATUS, (59.5, 3, 2), b''),
+    (protocol.MSG_KEYFRAME, (7, 320, 240), b'\xff\xd8jpeg\xff\xd9'),
+]
+
+
+def test_every_message_type_is_covered():
+    assert {msg_type for msg_type, _, _ in MESSAGES} == set(protocol.PAYLOADS)
+
+
+@pytest.mark.parametrize('msg_type, values, data', MESSAGES)
+def test_encode_decode_round_trip(msg_type, values, data):
+    message = protocol.encode(msg_type, *values, data=data)
+
+    messages = protocol.MessageReader().feed(message)
+    assert [msg_type for msg_type, _ in messages] == [msg_type]
+
+    decoded = protocol.decode(msg_type, messages[0][1])
+    if msg_type in protocol.VARIABLE:
+        assert decoded[:-1] == values
+        assert decoded[-1] == data
+    else:
+        assert decoded == pytest.approx(values)
+
+
+def test_reader_splits_partial_stream():
+    stream = b''.join(protocol.encode(msg_type, *values, data=data) for msg_type, values, data in MESSAGES)
+    reader = protocol.MessageReader()
+
+    messages = list()
+    for i in range(0, len(stream), 3):
+        messages.extend(reader.feed(stream[i:i + 3]))
+    assert [msg_type for msg_type, _ in messages] == [msg_type for msg_type, _, _ in MESSAGES]
+
+
+@pytest.mark.parametrize('msg_type', sorted(protocol.VERSIONED))
+def test_version_mismatch_is_rejected(msg_type):
+    values = {msg_type: values for msg_type, values, _ in MESSAGES}[msg_type]
+    message = bytearray(protocol.encode(msg_type, *values))
+    message[protocol.HEADER.size] = protocol.VERSION + 1
+
+    _, payload = protocol.MessageReader().feed(bytes(message))[0]
+    with pytest.raises(protocol.ProtocolError):
+        protocol.decode(msg_type, payload)
+
+
+def test_wrong_payload_size_is_rejected():
+    # Sürüm byte'ı olmayan eski SUBSCRIBE mesajı
+    with pytest.raises(protocol.ProtocolError):
+        protocol.decode(protocol.MSG_SUBSCRIBE, bytes([protocol.TOPIC_ALL]))
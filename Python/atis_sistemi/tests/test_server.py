@@ -0,0 +1,115 @@
+import socket
+import time
+
+import pytest
+
+from modules.service import protocol
+from modules.service.client import ShotClient
+from modules.service.server import ShotServer
+
+TIMEOUT = 2.0
+QUEUE_SIZE = 8
+
+
+def wait_for(condition, timeout=TIMEOUT):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError('condition not met in {} s'.format(timeout))
+        time.sleep(0.01)
+
+
+def connect(server, topics=protocol.TOPIC_ALL, timeout=0.5):
+    client = ShotClient(port=server.address[1], topics=topics, timeout=timeout)
+    wait_for(lambda: server.subscribers == 1)
+    # Abonelik mesajı sunucu thread'inde işlenene kadar yayınlananlar bu istemciye gitmez
+    time.sleep(0.1)
+    return client
+
+
+@pytest.fixture
+def server():
+    server = ShotServer('127.0.0.1', 0, None, queue_size=QUEUE_SIZE)
+    server.start()
+    yield server
+    server.stop()
+
+
+def test_shot_round_trip(server):
+    client = connect(server)
+    try:
+        server.publish(protocol.MSG_INIT, 640, 480)
+        server.publish(protocol.MSG_SHOT, 1, 1234.5, 100, 200, 1)
+
+        messages = list(client.messages())
+    finally:
+        client.close()
+
+    assert messages == [(protocol.MSG_INIT, (640, 480)), (protocol.MSG_SHOT, (1, 1234.5, 100, 200, 1))]
+
+
+def test_topics_filter_messages(server):
+    client = connect(server, topics=protocol.TOPIC_STATUS)
+    try:
+        server.publish(protocol.MSG_SHOT, 1, 0.0, 1, 2, 0)
+        server.publish(protocol.MSG_STATUS, 60.0, 0, 1)
+
+        messages = list(client.messages())
+    finally:
+        client.close()
+
+    assert [msg_type for msg_type, _ in messages] == [protocol.MSG_STATUS]
+
+
+def test_slow_subscriber_loses_oldest(server):
+    client = connect(server, topics=protocol.TOPIC_SNAPSHOTS)
+    try:
+        # İstemci okumadığı için soket tamponları dolar, ardından sınırlı kuyruk en eskileri atar
+        data = bytes(256 * 1024)
+        published = 64
+        for seq in range(published):
+            server.publish(protocol.MSG_KEYFRAME, seq, 1, 1, data=data)
+        wait_for(lambda: server.dropped > 0)
+
+        received = [values[0] for msg_type, values in client.messages() if msg_type == protocol.MSG_KEYFRAME]
+        dropped = server.dropped
+    finally:
+        client.close()
+
+    assert dropped > 0
+    assert len(received) + dropped == published
+    assert received == sorted(received)
+    # Atılanlar kuyruğun başındakilerdir; en yeni mesajlar eksiksiz gelir
+    assert received[-QUEUE_SIZE:] == list(range(published - QUEUE_SIZE, published))
+
+
+def test_late_subscriber_gets_keyframe_and_deltas(server):
+    server.publish(protocol.MSG_INIT, 640, 480)
+    server.publish(protocol.MSG_SHOT, 1, 0.0, 10, 10, 0)
+    server.publish(protocol.MSG_KEYFRAME, 1, 640, 480, data=b'jpeg')
+    server.publish(protocol.MSG_SHOT, 2, 0.0, 20, 20, 1)
+    server.publish(protocol.MSG_SHOT, 3, 0.0, 30, 30, 0)
+
+    client = connect(server)
+    try:
+        server.publish(protocol.MSG_SHOT, 4, 0.0, 40, 40, 1)
+
+        messages = list(client.messages())
+    finally:
+        client.close()
+
+    assert messages[0] == (protocol.MSG_INIT, (640, 480))
+    assert messages[1] == (protocol.MSG_KEYFRAME, (1, 640, 480, b'jpeg'))
+    assert [values[0] for msg_type, values in messages[2:] if msg_type == protocol.MSG_SHOT] == [2, 3, 4]
+
+
+def test_version_mismatch_closes_connection(server):
+    connection = socket.create_connection(server.address)
+    connection.settimeout(TIMEOUT)
+    try:
+        # Sürüm byte'ı olmayan eski SUBSCRIBE mesajı
+        connection.sendall(protocol.HEADER.pack(protocol.MSG_SUBSCRIBE, 1) + bytes([protocol.TOPIC_ALL]))
+        assert connection.recv(4096) == b''
+    finally:
+        connection.close()
+    wait_for(lambda: server.subscribers == 0)